@@ -0,0 +1,220 @@
+"""
+명령줄 도구 (GUI 없이 일괄 처리)
+
+Usage:
+    python -m app.cli limits formula1.xlsx formula2.xlsx ... [--limits limits.json] [--sheet Table1]
+    python -m app.cli nway rnd.xlsx coa.xlsx filing.xlsx [--output report.xlsx]
+    python -m app.cli history add FORMULA rev1.xlsx rev2.xlsx ... [--label TEXT] [--sheet Table1]
+    python -m app.cli history list [FORMULA]
+    python -m app.cli history diff OLD_ID NEW_ID [--output result.xlsx]
+
+    입력 파일은 .xlsx/.xlsm 외에 .csv/.tsv/.json/.jsonl/.ods도 됩니다. (확장자로 자동 선택)
+
+    공통 옵션 (명령 앞에 지정):
+    --memory-budget MB   예상 메모리가 이 값을 넘는 파일은 스트리밍 모드로 읽기/내보내기
+    --memory-report      단계별 최대 메모리(tracemalloc) 보고서 출력
+"""
+import argparse
+import sys
+from pathlib import Path
+
+
+def _iter_formulas(paths: list[str], sheet_names: list[str]):
+    """(이름, IngredientRow 리스트)를 하나씩 생성합니다. (메모리에 모든 처방을 올리지 않음)"""
+    from app.utils.workbook_cache import load_tables_cached
+
+    for path in paths:
+        for sheet_name, rows in load_tables_cached(path, sheet_names).items():
+            if rows:
+                yield f"{Path(path).name}:{sheet_name}", rows
+
+
+def cmd_limits(args) -> int:
+    """사용한도 초과 일괄 검사. 초과 성분이 하나라도 있으면 종료 코드 1, 사용한도 테이블을 읽지 못하면 2."""
+    from app.utils.limits import load_limit_table, check_formulas_batch
+
+    try:
+        limit_table = load_limit_table(args.limits)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"사용한도 테이블을 읽을 수 없습니다: {e}")
+        return 2
+    results = check_formulas_batch(_iter_formulas(args.files, args.sheet), limit_table)
+
+    violation_count = 0
+    for name, violations in results:
+        if not violations:
+            print(f"[OK]   {name}")
+            continue
+        print(f"[FAIL] {name}")
+        for v in violations:
+            violation_count += 1
+            note = f" ({v.note})" if v.note else ""
+            print(f"       - {v.inci_name}: {v.percent:.6g}% > {v.max_percent:g}% [{v.category}]{note}")
+
+    print(f"\n총 {len(results)}개 처방 / 사용한도 초과 {violation_count}건")
+    return 1 if violation_count else 0
+
+
+def cmd_nway(args) -> int:
+    """N-way 비교 (TableN 시트 전체). 합의와 다른 항목이 있으면 종료 코드 1."""
+    from app.utils.nway import load_sources, compare_sources
+
+    sources = load_sources(args.files)
+    if len(sources) < 2:
+        print("비교할 테이블이 2개 이상 필요합니다.")
+        return 2
+
+    result = compare_sources(sources)
+
+    for source_index, name in enumerate(result.sources):
+        deviations = result.deviations_for(source_index)
+        print(f"[{name}] 차이 {len(deviations)}건")
+        for d in deviations:
+            target = f"{d.rm_name} / {d.inci_name}" if d.inci_name else d.rm_name
+            print(f"       - {d.kind:<7} {target}: {d.value or '-'} (합의: {d.consensus_value or '-'})")
+
+    if args.output:
+        from app.utils.excel_handler import export_nway_report
+        saved = export_nway_report(args.output, result)
+        print(f"\n보고서 저장: {saved}")
+
+    return 1 if result.deviations else 0
+
+
+def cmd_history_add(args) -> int:
+    """엑셀 파일들을 순서대로 리비전으로 기록합니다. (--sheet가 없으면 파일의 모든 테이블)"""
+    from app.utils.workbook_cache import load_tables_cached
+    from app.utils.revision_store import RevisionStore
+
+    with RevisionStore(args.db) as store:
+        for path in args.files:
+            tables = load_tables_cached(path, args.history_sheet)
+            for table_name, rows in tables.items():
+                revision_id = store.add_revision(
+                    args.formula, table_name, rows, label=args.label or Path(path).name, source_path=str(path)
+                )
+                print(f"[{revision_id}] {args.formula} / {table_name} <- {Path(path).name} ({len(rows)}행)")
+    return 0
+
+
+def cmd_history_list(args) -> int:
+    from app.utils.revision_store import RevisionStore
+
+    with RevisionStore(args.db) as store:
+        for info in store.list_revisions(args.formula):
+            base = f"(base {info.parent_id})" if info.parent_id else "(snapshot)"
+            print(f"[{info.id}] {info.formula} / {info.table_name} {info.created_at} "
+                  f"{info.row_count}행 {base} {info.label}")
+    return 0
+
+
+def cmd_history_diff(args) -> int:
+    """두 리비전을 비교합니다. 종료 코드: 0 차이 없음, 1 차이 있음, 2 리비전 없음"""
+    from app.utils.revision_store import RevisionStore
+
+    with RevisionStore(args.db) as store:
+        try:
+            diff_old, diff_new = store.diff_revisions(args.old_id, args.new_id)
+        except KeyError as e:
+            print(f"리비전을 찾을 수 없습니다: {e.args[0]}")
+            return 2
+        print(f"[{args.old_id}] 차이 {len(diff_old)}건 / [{args.new_id}] 차이 {len(diff_new)}건")
+
+        if args.output:
+            from app.utils.excel_handler import export_to_excel
+            saved = export_to_excel(args.output, store.load_revision(args.old_id), store.load_revision(args.new_id))
+            print(f"결과 저장: {saved}")
+
+    return 1 if diff_old or diff_new else 0
+
+
+def cmd_cache(args) -> int:
+    """파싱 캐시 상태 조회 / 비우기"""
+    from app.utils.workbook_cache import get_workbook_cache
+
+    cache = get_workbook_cache()
+    if args.action == "clear":
+        cache.clear()
+        print("캐시를 비웠습니다.")
+        return 0
+
+    totals = cache.totals()
+    print(f"위치: {cache.cache_dir}")
+    print(f"크기: {cache.total_bytes() / 1024 / 1024:.1f} MB / 최대 {cache.max_bytes / 1024 / 1024:.0f} MB")
+    print(f"적중: {totals.hits} / 실패: {totals.misses} / 삭제: {totals.evictions}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Cosmetic Raw Material Checker CLI")
+    parser.add_argument("--memory-budget", type=float, default=None, metavar="MB",
+                        help="메모리 예산 (MB). 기본값: CRMC_MEMORY_BUDGET_MB 또는 512")
+    parser.add_argument("--memory-report", action="store_true", help="단계별 최대 메모리 보고서 출력")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p_limits = subparsers.add_parser("limits", help="사용 제한 원료 한도 초과 일괄 검사")
+    p_limits.add_argument("files", nargs="+", help="검사할 엑셀 파일")
+    p_limits.add_argument("--limits", default=None, help="사용한도 테이블 (JSON/CSV). 기본값: 번들 테이블")
+    p_limits.add_argument("--sheet", action="append", default=None,
+                          help="검사할 시트 이름 (여러 번 지정 가능). 기본값: Table1, Table2")
+    p_limits.set_defaults(func=cmd_limits)
+
+    p_nway = subparsers.add_parser("nway", help="여러 파일/TableN 시트 N-way 비교")
+    p_nway.add_argument("files", nargs="+", help="비교할 엑셀 파일 (각 파일의 TableN 시트를 모두 사용)")
+    p_nway.add_argument("--output", default=None, help="비교 결과 엑셀 저장 경로")
+    p_nway.set_defaults(func=cmd_nway)
+
+    p_cache = subparsers.add_parser("cache", help="엑셀 파싱 캐시 상태 조회 / 비우기")
+    p_cache.add_argument("action", choices=["stats", "clear"])
+    p_cache.set_defaults(func=cmd_cache)
+
+    p_history = subparsers.add_parser("history", help="처방 리비전 이력 저장소")
+    p_history.add_argument("--db", default=None, help="이력 DB 경로. 기본값: 사용자 데이터 폴더")
+    history_sub = p_history.add_subparsers(dest="history_command", required=True)
+
+    p_h_add = history_sub.add_parser("add", help="엑셀 파일을 순서대로 리비전으로 기록")
+    p_h_add.add_argument("formula", help="처방 이름 (리비전 묶음 키)")
+    p_h_add.add_argument("files", nargs="+", help="리비전 엑셀 파일 (오래된 것부터)")
+    p_h_add.add_argument("--label", default=None, help="리비전 설명. 기본값: 파일 이름")
+    p_h_add.add_argument("--sheet", dest="history_sheet", action="append", default=None,
+                         help="기록할 시트 이름 (여러 번 지정 가능). 기본값: 파일의 모든 테이블 (TableN)")
+    p_h_add.set_defaults(func=cmd_history_add)
+
+    p_h_list = history_sub.add_parser("list", help="리비전 목록")
+    p_h_list.add_argument("formula", nargs="?", default=None)
+    p_h_list.set_defaults(func=cmd_history_list)
+
+    p_h_diff = history_sub.add_parser(
+        "diff", help="두 리비전 비교",
+        description="두 리비전을 비교합니다. 종료 코드: 0 차이 없음, 1 차이 있음, 2 리비전 없음"
+    )
+    p_h_diff.add_argument("old_id", type=int)
+    p_h_diff.add_argument("new_id", type=int)
+    p_h_diff.add_argument("--output", default=None, help="비교 결과 엑셀 저장 경로")
+    p_h_diff.set_defaults(func=cmd_history_diff)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "sheet", "") is None:
+        args.sheet = ["Table1", "Table2"]
+
+    from app.utils.memory import set_memory_budget_mb, format_memory_report
+    from app.utils.profiling import profiler
+
+    set_memory_budget_mb(args.memory_budget)
+    if args.memory_report:
+        profiler.enable(True)
+        profiler.enable_memory_tracking(True)
+
+    code = args.func(args)
+    if args.memory_report:
+        print(format_memory_report(profiler.events))
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,17 @@
 # app/main.py
 import sys
-from PyQt5 import QtWidgets
+import time
 
-# Pages
+# 시작 시간 측정 모드 (--startup-profile): 이후의 import 시간부터 기록
+_STARTED_AT = time.perf_counter()
+from app.utils.startup import StartupProfiler
+from app.utils.profiling import profiler, enable_from_environment
+_startup_profiler = StartupProfiler.from_environment(sys.argv, _STARTED_AT)
+
+from PyQt5 import QtWidgets, QtCore
+
+# Pages (원료 검증기 / 텍스트 비교 페이지는 처음 이동할 때 import 및 생성)
 from app.ui.pages.landing_page import LandingPage
-from app.ui.pages.checker_page import CheckerPage
-from app.ui.pages.text_comparator_page import TextComparatorPage
 
 class MainWindow(QtWidgets.QMainWindow):
     def __init__(self):
@@ -21,18 +27,35 @@ class MainWindow(QtWidgets.QMainWindow):
         self.landing_page = LandingPage()
         self.stacked_widget.addWidget(self.landing_page)
 
-        # Page 2: Checker Page
-        self.checker_page = CheckerPage()
-        self.stacked_widget.addWidget(self.checker_page)
-
-        # Page 3: Text Comparator Page
-        self.text_comparator_page = TextComparatorPage()
-        self.stacked_widget.addWidget(self.text_comparator_page)
+        # Page 2, 3: 처음 사용할 때 생성 (checker_page / text_comparator_page 속성)
+        self._checker_page = None
+        self._text_comparator_page = None
 
         # Signal Connections
         self.landing_page.navigate_to.connect(self.on_navigate_to)
-        self.checker_page.navigate_home.connect(self.go_to_home)
-        self.text_comparator_page.navigate_home.connect(self.go_to_home)
+
+    @property
+    def checker_page(self):
+        """원료 검증기 페이지 (openpyxl/Diff 모듈 import를 첫 사용 시점으로 미룸)"""
+        if self._checker_page is None:
+            from app.ui.pages.checker_page import CheckerPage
+
+            self._checker_page = CheckerPage()
+            self.stacked_widget.addWidget(self._checker_page)
+            self._checker_page.navigate_home.connect(self.go_to_home)
+            self._checker_page.label_compare_requested.connect(self.on_label_compare_requested)
+        return self._checker_page
+
+    @property
+    def text_comparator_page(self):
+        """성분 텍스트 비교 페이지"""
+        if self._text_comparator_page is None:
+            from app.ui.pages.text_comparator_page import TextComparatorPage
+
+            self._text_comparator_page = TextComparatorPage()
+            self.stacked_widget.addWidget(self._text_comparator_page)
+            self._text_comparator_page.navigate_home.connect(self.go_to_home)
+        return self._text_comparator_page
 
     def on_navigate_to(self, page_name: str):
         """랜딩 페이지에서의 내비게이션 요청 처리"""
@@ -49,23 +72,73 @@ class MainWindow(QtWidgets.QMainWindow):
         else:
             print(f"Unknown page: {page_name}")
 
+    def on_label_compare_requested(self, composition: list, source: str):
+        """원료 검증기의 최종 조성을 텍스트 비교 페이지로 전달 (1열 전성분 + 함량 비교 기준)"""
+        self.text_comparator_page.set_reference_composition(composition, source)
+        self.stacked_widget.setCurrentWidget(self.text_comparator_page)
+
     def go_to_home(self):
         """홈(랜딩 페이지)으로 복귀"""
         self.stacked_widget.setCurrentWidget(self.landing_page)
 
 
+class _FirstPaintWatcher(QtCore.QObject):
+    """시작 시간 측정 모드: 첫 화면이 그려진 시점을 기록하고 보고서를 출력한 뒤 종료"""
+
+    def __init__(self, profiler: StartupProfiler, app):
+        super().__init__(app)
+        self.profiler = profiler
+        self.app = app
+
+    def eventFilter(self, source, event):
+        if event.type() == QtCore.QEvent.Paint and self.profiler.elapsed_ms("first_paint") is None:
+            self.profiler.mark("first_paint")
+            QtCore.QTimer.singleShot(0, self._finish)
+        return False
+
+    def _finish(self):
+        self.profiler.finish()
+        print(self.profiler.format_report())
+        self.profiler.dump_json()
+        self.app.exit(0 if self.profiler.within_budget() else 1)
+
+
 def main():
+    _startup_profiler.mark("imports")
     app = QtWidgets.QApplication(sys.argv)
     
     # Global Font Setting (Optional polish)
     font = app.font()
     font.setFamily("Arial") 
     app.setFont(font)
+    _startup_profiler.mark("qapplication")
 
     window = MainWindow()
+    _startup_profiler.mark("main_window")
+
+    # 단계별 프로파일링 (--profile): 상태 표시줄 HUD + 로그 + Chrome trace
+    if enable_from_environment(sys.argv):
+        from app.ui.widgets import ProfilerHud
+
+        window.statusBar().addPermanentWidget(ProfilerHud(profiler), 1)
+
+        # 메모리 보고 모드 (--memory-report): 종료 시 단계별 최대 메모리 출력
+        if profiler.memory is not None:
+            from app.utils.memory import format_memory_report
+
+            app.aboutToQuit.connect(lambda: print(format_memory_report(profiler.events)))
+
+    if _startup_profiler.enabled:
+        watcher = _FirstPaintWatcher(_startup_profiler, app)
+        window.landing_page.installEventFilter(watcher)
+
     window.show()
+    _startup_profiler.mark("shown")
     sys.exit(app.exec_())
 
 
 if __name__ == "__main__":
+    # exe에서 병렬 Diff 작업 프로세스가 GUI를 다시 띄우지 않도록
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
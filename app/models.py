@@ -24,6 +24,9 @@ class DiffType(Enum):
     CONTENT_MISMATCH = auto()  # Red Font (Value diff)
     MISSING_ROW = auto()       # Red Background (Row missing)
     MISSING_INCI = auto()      # Red Background (INCI missing)
+    RM_TOTAL_MISMATCH = auto()   # Orange Background (Σ % RM/FP ≠ 100)
+    INCI_TOTAL_MISMATCH = auto() # Orange Background (Σ % INCI/RM ≠ 100 within an RM)
+    LIMIT_EXCEEDED = auto()      # Purple Bold Font (INCI over regulatory concentration limit)
 
 @dataclass
 class DiffItem:
@@ -0,0 +1,112 @@
+import os
+from PyQt5 import QtCore
+
+# 저장 직후 연속으로 발생하는 이벤트를 한 번으로 묶는 대기 시간 (ms)
+DEBOUNCE_MS = 400
+# QFileSystemWatcher를 사용할 수 없을 때의 폴링 간격 (ms)
+POLL_INTERVAL_MS = 1500
+# 읽기 실패 시 다시 시도하는 최대 횟수 (대기 시간은 DEBOUNCE_MS부터 두 배씩)
+MAX_RETRIES = 4
+
+
+class FileWatcher(QtCore.QObject):
+    """
+    파일 하나의 변경을 감시합니다.
+
+    - QFileSystemWatcher 사용, 등록에 실패하면 수정 시각/크기 폴링으로 대체
+    - 엑셀은 임시 파일에 저장 후 이름을 바꾸므로 이벤트 후 경로를 다시 등록
+    - 실제로 (수정 시각, 크기)가 바뀐 경우에만 fileChanged 발생
+    - 읽기 실패 시 retry()로 최대 MAX_RETRIES번까지 간격을 늘려 가며 다시 발생
+    """
+
+    fileChanged = QtCore.pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.path = ""
+        self._signature = None
+        self._retries = 0
+
+        self._watcher = QtCore.QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_fs_event)
+
+        self._debounce = QtCore.QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._check)
+
+        self._poll = QtCore.QTimer(self)
+        self._poll.setInterval(POLL_INTERVAL_MS)
+        self._poll.timeout.connect(self._check)
+
+        self._retry_timer = QtCore.QTimer(self)
+        self._retry_timer.setSingleShot(True)
+        self._retry_timer.timeout.connect(self._check)
+
+    def watch(self, path: str):
+        self.stop()
+        self.path = path
+        self._signature = self._stat(path)
+        if not self._watcher.addPath(path):
+            self._poll.start()
+
+    def stop(self):
+        if self._watcher.files():
+            self._watcher.removePaths(self._watcher.files())
+        self._debounce.stop()
+        self._poll.stop()
+        self._retry_timer.stop()
+        self.path = ""
+        self._signature = None
+        self._retries = 0
+
+    def retry(self) -> bool:
+        """
+        읽기에 실패했을 때(저장 중 등) 잠시 후 다시 fileChanged를 발생시킵니다.
+        최대 횟수를 넘으면 다시 시도하지 않고 False (파일이 다시 바뀌면 처음부터 다시 시도)
+        """
+        if self._retries >= MAX_RETRIES:
+            self._retries = 0
+            self._signature = self._stat(self.path)
+            return False
+        self._signature = None
+        self._retry_timer.start(DEBOUNCE_MS * 2 ** self._retries)
+        self._retries += 1
+        return True
+
+    def reset_retries(self):
+        """다시 읽기에 성공하면 호출"""
+        self._retries = 0
+
+    def is_watching(self) -> bool:
+        return bool(self.path)
+
+    @staticmethod
+    def _stat(path: str):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _on_fs_event(self, _path: str):
+        self._debounce.start()
+
+    def _check(self):
+        if not self.path:
+            return
+
+        signature = self._stat(self.path)
+        if signature is None:
+            # 저장 중(이름 변경 사이)이면 잠시 후 다시 확인
+            self._debounce.start()
+            return
+
+        # 이름 변경으로 감시가 풀렸으면 다시 등록
+        if not self._poll.isActive() and self.path not in self._watcher.files():
+            if not self._watcher.addPath(self.path):
+                self._poll.start()
+
+        if signature != self._signature:
+            self._signature = signature
+            self.fileChanged.emit(self.path)
@@ -4,16 +4,35 @@ from PyQt5 import QtWidgets, QtCore, QtGui
 from PyQt5.QtWidgets import QMessageBox
 
 from app.ui.widgets import MaterialTableWidget, StyledButton
+from app.ui.file_watcher import FileWatcher
 from app.ui.styles import AppStyles
-from app.utils.excel_handler import (
-    download_template_file, 
-    export_to_excel
-)
 from app.utils.table_handler import (
-    make_table,
+    setup_table_header,
+    render_table,
+    patch_table,
     extract_data_from_table
 )
-from app.utils.diff_logic import generate_diff_report
+from app.utils.diff_logic import diff_tables
+from app.utils.validation import validate_mass_balance
+from app.utils.limits import find_limit_violations, limit_diff_report
+from app.utils.nway import load_sources, compare_sources
+from app.utils.workbook_cache import load_tables_cached, get_workbook_cache
+from app.utils.loaders import file_dialog_filter, supported_suffixes
+from app.utils.document_cache import DocumentCache
+from app.utils.diff_index import DiffIndex, TABLE_WIDE_DIFF_TYPES, build_diff_index
+from app.utils.alignment import RowAlignment, build_alignment
+from app.utils.profiling import span
+from app.utils.session import (
+    SessionState,
+    SessionFormatError,
+    SESSION_FILE_FILTER,
+    save_session,
+    load_session
+)
+from app.utils.composition import (
+    roll_up_composition,
+    compare_compositions
+)
 
 class CheckerPage(QtWidgets.QWidget):
     """
@@ -22,10 +41,30 @@ class CheckerPage(QtWidgets.QWidget):
     
     # 페이지 전환 요청 시그널 (부모인 Main에게 전달)
     navigate_home = QtCore.pyqtSignal()
+    # 최종 조성 전성분 리스트를 텍스트 비교 페이지로 전달 요청
+    label_compare_requested = QtCore.pyqtSignal(list, str)  # (최종 조성 CompositionEntry 리스트, 테이블 이름)
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, document_cache_bytes: int | None = None):
         super().__init__(parent)
         self.is_updating = False
+        self.current_file_path = ""
+        # 마지막으로 적용된 테이블별 Diff (세션 저장 시 함께 저장)
+        self.last_diff1 = []
+        self.last_diff2 = []
+        # Diff 행 인덱스 (차이만 보기 / 이전·다음 차이 이동)
+        self.diff_index1 = DiffIndex()
+        self.diff_index2 = DiffIndex()
+        # 이전/다음 차이 이동 대상 테이블 (마지막으로 선택한 테이블)
+        self.nav_table = None
+        # RM 그룹 대응표 (테이블1 행 -> 테이블2 행, 테이블2 행 -> 테이블1 행), Diff마다 갱신
+        self.alignment1 = RowAlignment()
+        self.alignment2 = RowAlignment()
+        # 불러온 엑셀 파일 변경 감시 (감시 모드)
+        self.file_watcher = FileWatcher(self)
+        # 탭으로 열린 비교 문서 (활성 탭 외에는 위젯 없이 압축 형태로 보관)
+        self.documents = DocumentCache(document_cache_bytes)
+        self.active_doc_id = None
+        self._next_doc_id = 1
         self._init_ui()
         self._setup_connections()
         # Custom table setup moved to _init_ui
@@ -62,6 +101,29 @@ class CheckerPage(QtWidgets.QWidget):
         self.downloadResultButton = StyledButton("검증 결과 다운로드")
         self.headerLayout.addWidget(self.downloadResultButton)
 
+        # Final Composition Label -> Text Comparator
+        self.labelCompareButton = StyledButton("전성분 라벨 비교")
+        self.labelCompareMenu = QtWidgets.QMenu(self.labelCompareButton)
+        self.labelCompareTable1Action = self.labelCompareMenu.addAction("테이블 1 최종 조성")
+        self.labelCompareTable2Action = self.labelCompareMenu.addAction("테이블 2 최종 조성")
+        self.labelCompareButton.setMenu(self.labelCompareMenu)
+        self.headerLayout.addWidget(self.labelCompareButton)
+
+        # N-way Comparison (multiple files / TableN sheets)
+        self.nwayButton = StyledButton("N-way 비교")
+        self.headerLayout.addWidget(self.nwayButton)
+
+        # Session Save / Open
+        self.saveSessionButton = StyledButton("세션 저장")
+        self.headerLayout.addWidget(self.saveSessionButton)
+        self.openSessionButton = StyledButton("세션 열기")
+        self.headerLayout.addWidget(self.openSessionButton)
+
+        # Watch Mode (reload changed groups when the xlsx is re-saved)
+        self.watchCheckBox = QtWidgets.QCheckBox("파일 변경 감시")
+        self.watchCheckBox.setToolTip("불러온 엑셀 파일이 저장되면 바뀐 원료만 다시 불러와 비교합니다.")
+        self.headerLayout.addWidget(self.watchCheckBox)
+
         # File Label
         self.fileLabel = QtWidgets.QLabel("템플릿이 로드되지 않았습니다.")
         font = QtGui.QFont("Arial", 8)
@@ -73,6 +135,20 @@ class CheckerPage(QtWidgets.QWidget):
 
         self.verticalLayout.addLayout(self.headerLayout)
 
+        # ----------------------------------------------------------------
+        # Document Tabs (one tab per loaded file / session)
+        # ----------------------------------------------------------------
+        self.documentTabBar = QtWidgets.QTabBar()
+        self.documentTabBar.setTabsClosable(True)
+        self.documentTabBar.setMovable(True)
+        self.documentTabBar.setExpanding(False)
+        self.documentTabBar.setDocumentMode(True)
+        self.documentTabBar.hide()
+        self.verticalLayout.addWidget(self.documentTabBar)
+
+        # 파일 여러 개를 끌어다 놓으면 각각 탭으로 열기
+        self.setAcceptDrops(True)
+
         # ----------------------------------------------------------------
         # Splitter (Table 1 | Table 2)
         # ----------------------------------------------------------------
@@ -103,11 +179,30 @@ class CheckerPage(QtWidgets.QWidget):
         self.verticalLayout.addWidget(self.tableSplitter, 1) # Stretch factor 1
 
         # ----------------------------------------------------------------
-        # Summary Label
+        # Summary Label + Difference Navigation
         # ----------------------------------------------------------------
+        self.footerLayout = QtWidgets.QHBoxLayout()
+        self.footerLayout.setSpacing(AppStyles.HEADER_SPACING)
+
         self.summaryLabel = QtWidgets.QLabel("불일치 0건 / 총 0건")
         self.summaryLabel.setMinimumHeight(20)
-        self.verticalLayout.addWidget(self.summaryLabel)
+        self.footerLayout.addWidget(self.summaryLabel, 1)
+
+        self.diffOnlyCheckBox = QtWidgets.QCheckBox("차이만 보기")
+        self.diffOnlyCheckBox.setToolTip("차이가 있는 원료(RM 그룹)만 표시합니다.")
+        self.footerLayout.addWidget(self.diffOnlyCheckBox)
+
+        self.prevDiffButton = StyledButton("◀ 이전 차이")
+        self.prevDiffButton.setToolTip("Shift+F8")
+        self.footerLayout.addWidget(self.prevDiffButton)
+        self.nextDiffButton = StyledButton("다음 차이 ▶")
+        self.nextDiffButton.setToolTip("F8")
+        self.footerLayout.addWidget(self.nextDiffButton)
+
+        self.diffPositionLabel = QtWidgets.QLabel("")
+        self.footerLayout.addWidget(self.diffPositionLabel)
+
+        self.verticalLayout.addLayout(self.footerLayout)
 
     def _setup_connections(self):
         """기본 시그널 연결"""
@@ -115,6 +210,22 @@ class CheckerPage(QtWidgets.QWidget):
         self.downloadButton.clicked.connect(self.on_download_template)
         self.uploadButton.clicked.connect(self.on_upload_file)
         self.downloadResultButton.clicked.connect(self.on_download_result)
+        self.labelCompareTable1Action.triggered.connect(lambda: self.on_label_compare(self.table1Table))
+        self.labelCompareTable2Action.triggered.connect(lambda: self.on_label_compare(self.table2Table))
+        self.nwayButton.clicked.connect(self.on_nway_compare)
+        self.saveSessionButton.clicked.connect(self.on_save_session)
+        self.openSessionButton.clicked.connect(self.on_open_session)
+        self.watchCheckBox.toggled.connect(self.on_watch_toggled)
+        self.file_watcher.fileChanged.connect(self.on_watched_file_changed)
+        self.documentTabBar.currentChanged.connect(self.on_document_tab_changed)
+        self.documentTabBar.tabCloseRequested.connect(self.on_document_tab_close)
+        self.diffOnlyCheckBox.toggled.connect(self.apply_diff_filter)
+        self.prevDiffButton.clicked.connect(self.on_prev_diff)
+        self.nextDiffButton.clicked.connect(self.on_next_diff)
+        QtWidgets.QShortcut(QtGui.QKeySequence(QtCore.Qt.Key_F8), self, self.on_next_diff)
+        QtWidgets.QShortcut(QtGui.QKeySequence(QtCore.Qt.SHIFT + QtCore.Qt.Key_F8), self, self.on_prev_diff)
+        for table in (self.table1Table, self.table2Table):
+            table.currentCellChanged.connect(lambda row, *_, t=table: self.on_current_cell_changed(t, row))
 
     def go_home(self):
         self.reset_ui()
@@ -122,10 +233,32 @@ class CheckerPage(QtWidgets.QWidget):
 
     def reset_ui(self):
         """Resets the UI state."""
+        self.active_doc_id = None
+        self.documentTabBar.blockSignals(True)
+        while self.documentTabBar.count():
+            self.documentTabBar.removeTab(0)
+        self.documentTabBar.blockSignals(False)
+        self.documentTabBar.hide()
+        self.documents.clear()
+        self._clear_tables()
+
+    def _clear_tables(self):
+        """표시 중인 문서를 비웁니다. (탭은 유지)"""
+        self.table1Table.undo_stack.clear()
+        self.table2Table.undo_stack.clear()
         self.table1Table.setRowCount(0)
         self.table2Table.setRowCount(0)
         self.summaryLabel.setText("불일치 0건 / 총 0건")
         self.fileLabel.setText("템플릿이 로드되지 않았습니다.")
+        self.current_file_path = ""
+        self.last_diff1 = []
+        self.last_diff2 = []
+        self.diff_index1 = DiffIndex()
+        self.diff_index2 = DiffIndex()
+        self.alignment1 = RowAlignment()
+        self.alignment2 = RowAlignment()
+        self.diffPositionLabel.setText("")
+        self.file_watcher.stop()
 
 
     def _setup_table_sync(self):
@@ -145,22 +278,155 @@ class CheckerPage(QtWidgets.QWidget):
         try:
             self.is_updating = True
             
-            data1 = extract_data_from_table(self.table1Table)
-            data2 = extract_data_from_table(self.table2Table)
-            
-            diff1 = generate_diff_report(data1, data2)
-            diff2 = generate_diff_report(data2, data1)
+            with span("extract") as s:
+                data1 = extract_data_from_table(self.table1Table)
+                data2 = extract_data_from_table(self.table2Table)
+                s.set(rows=len(data1) + len(data2))
             
-            self.table1Table.apply_diff_report(diff1)
-            self.table2Table.apply_diff_report(diff2)
+            # 양방향 Diff (테이블 루트 해시가 같으면 즉시 반환, 같은 RM 그룹은 건너뜀)
+            diff1, diff2, fp1, fp2 = diff_tables(data1, data2)
+
+            # 함량 합계 검증 (Σ % RM/FP, RM별 Σ % INCI/RM = 100)
+            # 누락(빨간 배경) 스타일이 우선하도록 먼저 적용
+            with span("validate", rows=len(data1) + len(data2)):
+                balance1 = validate_mass_balance(data1)
+                balance2 = validate_mass_balance(data2)
+
+                # 사용 제한 원료 한도 초과 (완제품 기준)
+                violations1 = find_limit_violations(data1)
+                violations2 = find_limit_violations(data2)
+                limit1 = limit_diff_report(data1, violations1)
+                limit2 = limit_diff_report(data2, violations2)
+
+            # 내용/Diff가 바뀌지 않은 RM 그룹은 다시 스타일링하지 않음
+            self.last_diff1 = balance1 + diff1 + limit1
+            self.last_diff2 = balance2 + diff2 + limit2
+            with span("restyle", diffs=len(self.last_diff1) + len(self.last_diff2)):
+                self.table1Table.apply_diff_report(self.last_diff1, fp1.groups.values())
+                self.table2Table.apply_diff_report(self.last_diff2, fp2.groups.values())
+                self._rebuild_diff_index(data1, data2)
             
+            # 완제품 기준 최종 조성 비교
+            with span("composition"):
+                comp_diffs = compare_compositions(roll_up_composition(data1), roll_up_composition(data2))
+            comp_count = sum(1 for d in comp_diffs if d.status != "MATCH")
+
             # Simple Summary Update
             count = len(diff1) + len(diff2)
-            self.summaryLabel.setText(f"감지된 차이점: {count}건 (스타일링 갱신 완료)")
+            # Σ % RM/FP ≠ 100은 테이블당 한 번만 표시 (그룹마다 칠해진 셀은 세지 않음)
+            balance_count = sum(
+                d.diff_type not in TABLE_WIDE_DIFF_TYPES for d in balance1 + balance2
+            )
+            rm_total_tables = [
+                name for name, balance in (("테이블 1", balance1), ("테이블 2", balance2))
+                if any(d.diff_type in TABLE_WIDE_DIFF_TYPES for d in balance)
+            ]
+            rm_total_text = f" / % RM/FP 합계 ≠ 100: {', '.join(rm_total_tables)}" if rm_total_tables else ""
+            limit_count = len(violations1) + len(violations2)
+            self.summaryLabel.setText(
+                f"감지된 차이점: {count}건 / 합계 오류: {balance_count}건{rm_total_text} / "
+                f"최종 조성 차이: {comp_count}건 / 사용한도 초과: {limit_count}건 (스타일링 갱신 완료)"
+            )
             
         finally:
             self.is_updating = False
 
+    # --------------------------------------------------------------------------
+    # Difference Filter / Navigation (DiffIndex 기반, 위젯 색상 스캔 없음)
+    # --------------------------------------------------------------------------
+
+    def _rebuild_diff_index(self, data1, data2):
+        """테이블 표시 순서의 데이터와 마지막 Diff로 인덱스를 다시 만들고 필터를 적용합니다."""
+        self.diff_index1 = build_diff_index(self.last_diff1, data1)
+        self.diff_index2 = build_diff_index(self.last_diff2, data2)
+        self.alignment1, self.alignment2 = build_alignment(data1, data2)
+        self.diffPositionLabel.setText("")
+        self.apply_diff_filter()
+
+    def apply_diff_filter(self, *_):
+        diff_only = self.diffOnlyCheckBox.isChecked()
+        for table, index in ((self.table1Table, self.diff_index1), (self.table2Table, self.diff_index2)):
+            table.set_visible_ranges(index.diff_group_ranges() if diff_only else None)
+
+    def _nav_target(self):
+        table = self.nav_table or self.table1Table
+        index = self.diff_index1 if table is self.table1Table else self.diff_index2
+        # 선택한 테이블에 차이가 없으면 다른 테이블로 이동
+        if not index:
+            other = self.table2Table if table is self.table1Table else self.table1Table
+            other_index = self.diff_index2 if other is self.table2Table else self.diff_index1
+            if other_index:
+                return other, other_index
+        return table, index
+
+    def on_next_diff(self):
+        table, index = self._nav_target()
+        self._go_to_diff(table, index, index.next_row(table.currentRow()))
+
+    def on_prev_diff(self):
+        table, index = self._nav_target()
+        current = table.currentRow()
+        if current < 0:
+            current = table.rowCount()
+        self._go_to_diff(table, index, index.prev_row(current))
+
+    def _go_to_diff(self, table, index: DiffIndex, row: int | None):
+        if row is None:
+            self.diffPositionLabel.setText("차이 없음")
+            return
+        table.setCurrentCell(row, 0)
+        table.scrollToItem(table.item(row, 0), QtWidgets.QAbstractItemView.PositionAtCenter)
+        table.setFocus()
+        self._sync_counterpart(table, row)
+        name = "테이블 1" if table is self.table1Table else "테이블 2"
+        self.diffPositionLabel.setText(f"{name} 차이 행 {index.position(row)}/{len(index)}")
+
+    # --------------------------------------------------------------------------
+    # RM-Aligned Synchronization (RowAlignment 기반, 이진 탐색)
+    # --------------------------------------------------------------------------
+
+    def _counterpart(self, table):
+        """(상대 테이블, table 행 -> 상대 테이블 행 대응표)"""
+        if table is self.table1Table:
+            return self.table2Table, self.alignment1
+        return self.table1Table, self.alignment2
+
+    def _counterpart_row(self, table, row: int) -> int | None:
+        other, alignment = self._counterpart(table)
+        target = alignment.map_row(row) if row >= 0 else None
+        if target is None or target >= other.rowCount() or other.isRowHidden(target):
+            return None
+        return target
+
+    def on_current_cell_changed(self, table, row: int):
+        self.nav_table = table
+        if not self.is_updating:
+            self._sync_counterpart(table, row)
+
+    def _sync_counterpart(self, table, row: int):
+        """선택한 행과 같은 RM 그룹의 대응 행을 상대 테이블에서 선택하고 가운데로 스크롤합니다."""
+        target = self._counterpart_row(table, row)
+        if target is None:
+            return
+        other, _ = self._counterpart(table)
+        column = max(table.currentColumn(), 0)
+        # 상대 테이블의 선택 변경이 다시 이쪽으로 동기화되지 않도록
+        other.blockSignals(True)
+        try:
+            other.setCurrentCell(target, column)
+        finally:
+            other.blockSignals(False)
+        other.scrollTo(other.model().index(target, column), QtWidgets.QAbstractItemView.PositionAtCenter)
+
+    def _align_scroll(self, table) -> bool:
+        """table 맨 위에 보이는 행과 같은 RM 그룹 위치가 상대 테이블 맨 위에 오도록 스크롤합니다."""
+        target = self._counterpart_row(table, table.rowAt(0))
+        if target is None:
+            return False
+        other, _ = self._counterpart(table)
+        other.scrollTo(other.model().index(target, 2), QtWidgets.QAbstractItemView.PositionAtTop)
+        return True
+
     def eventFilter(self, source, event):
         if event.type() == QtCore.QEvent.Wheel and \
            event.modifiers() == QtCore.Qt.ShiftModifier:
@@ -187,7 +453,9 @@ class CheckerPage(QtWidgets.QWidget):
                 new_val = min(v_bar.maximum(), current_val + step)
             
             v_bar.setValue(new_val)
-            t_bar.setValue(new_val)
+            # 같은 RM 그룹끼리 맞춰 스크롤 (대응표가 없으면 같은 위치로)
+            if not self._align_scroll(my_table):
+                t_bar.setValue(new_val)
             return True
             
         return super().eventFilter(source, event)
@@ -200,6 +468,9 @@ class CheckerPage(QtWidgets.QWidget):
             if not file_path:
                 return
 
+            # openpyxl은 엑셀을 쓸 때 처음 import (시작 속도)
+            from app.utils.excel_handler import download_template_file
+
             saved_path = download_template_file(file_path)
             
             if QMessageBox.question(self, "완료", "템플릿이 저장된 폴더를 여시겠습니까?") == QMessageBox.Yes:
@@ -211,27 +482,197 @@ class CheckerPage(QtWidgets.QWidget):
 
     def on_upload_file(self):
         try:
-            file_path, _ = QtWidgets.QFileDialog.getOpenFileName(
-                self, "Select XLSX File", "", "Excel Files (*.xlsx)"
+            file_paths, _ = QtWidgets.QFileDialog.getOpenFileNames(
+                self, "Select Formula Files", "", file_dialog_filter()
             )
-            if not file_path:
+            if not file_paths:
                 return
-            
-            self.fileLabel.setText(Path(file_path).name)
 
-            self._set_tables_signal_blocked(True)
-            
-            try:
-                make_table(self.table1Table, file_path, "Table1")
-                make_table(self.table2Table, file_path, "Table2")
-                self.on_tables_content_changed()
-            finally:
-                self._set_tables_signal_blocked(False)
+            self.open_documents(file_paths)
 
         except Exception as e:
             print(f"File Upload Error: {e}")
             QMessageBox.critical(self, "에러", "파일 업로드 및 처리 실패")
+
+    def open_documents(self, file_paths: list[str]):
+        """
+        처방(엑셀/CSV/JSON/ODS)·세션 파일들을 각각 새 탭으로 열고 마지막 탭을 표시합니다.
+        테이블이 하나뿐인 파일(CSV, 시트 하나인 공급사 파일 등)은 다음 단일 테이블 파일과
+        짝지어 Table1/Table2로 한 탭에 엽니다. 짝이 없으면 열지 않고 경고합니다.
+        """
+        failed = []
+        last_index = -1
+        pending = None  # 짝을 기다리는 단일 테이블 파일 (경로, 행)
+        for file_path in file_paths:
+            try:
+                tooltip = file_path
+                if file_path.lower().endswith(".crms"):
+                    state = load_session(file_path)
+                    label = Path(file_path).stem
+                else:
+                    # 파싱 캐시 사용 (같은 파일을 다시 불러오면 openpyxl 파싱 생략)
+                    tables = load_tables_cached(file_path, ["Table1", "Table2"])
+                    if tables["Table1"] and not tables["Table2"]:
+                        if pending is None:
+                            pending = (file_path, tables["Table1"])
+                            continue
+                        first_path, first_rows = pending
+                        pending = None
+                        label = f"{Path(first_path).name} ↔ {Path(file_path).name}"
+                        tooltip = f"{first_path}\n{file_path}"
+                        # 두 파일에서 온 문서는 파일 감시 대상이 아님 (source_path 없음)
+                        state = SessionState(
+                            data1=first_rows,
+                            data2=tables["Table1"],
+                            meta={"file_label": label, "source_path": ""},
+                        )
+                    else:
+                        state = SessionState(
+                            data1=tables["Table1"],
+                            data2=tables["Table2"],
+                            meta={"file_label": Path(file_path).name, "source_path": file_path},
+                        )
+                        label = Path(file_path).name
+                last_index = self._add_document(state, label, tooltip)
+            except Exception as e:
+                print(f"Document Open Error: {e}")
+                failed.append(f"{Path(file_path).name}: {e}")
+
+        if pending is not None:
+            failed.append(f"{Path(pending[0]).name}: 테이블이 하나뿐인 파일입니다. 비교할 파일을 함께 선택하세요.")
+
+        # Diff는 탭이 표시될 때 계산 (비활성 문서는 파싱 결과만 보관, 마지막 탭만 표시)
+        if last_index >= 0:
+            self._show_document(last_index)
+
+        stats = get_workbook_cache().stats
+        self.fileLabel.setToolTip(f"{self.current_file_path}\n캐시 적중 {stats.hits}회 / 실패 {stats.misses}회")
+
+        if failed:
+            QMessageBox.warning(self, "경고", "다음 파일을 열지 못했습니다.\n" + "\n".join(failed))
+
+    def _add_document(self, state: SessionState, label: str, tooltip: str) -> int:
+        doc_id = self._next_doc_id
+        self._next_doc_id += 1
+        self.documents.put(doc_id, state)
+
+        # 탭 추가만 하고 표시는 _show_document에서 (여러 파일을 열 때 중간 탭을 그리지 않음)
+        self.documentTabBar.blockSignals(True)
+        index = self.documentTabBar.addTab(label)
+        self.documentTabBar.setTabData(index, doc_id)
+        self.documentTabBar.setTabToolTip(index, tooltip)
+        self.documentTabBar.blockSignals(False)
+        self.documentTabBar.show()
+        return index
+
+    def _show_document(self, index: int):
+        """탭을 선택하고 그 문서를 표시합니다. (첫 탭은 추가될 때 이미 현재 탭이므로 직접 전환)"""
+        self.documentTabBar.blockSignals(True)
+        self.documentTabBar.setCurrentIndex(index)
+        self.documentTabBar.blockSignals(False)
+        self.on_document_tab_changed(index)
+
+    def on_document_tab_changed(self, index: int):
+        """현재 문서를 압축 형태로 보관하고 선택한 탭의 문서만 테이블에 표시합니다."""
+        if index < 0:
+            return
+        doc_id = self.documentTabBar.tabData(index)
+        if doc_id == self.active_doc_id:
+            return
+
+        try:
+            if self.active_doc_id is not None:
+                self.documents.put(self.active_doc_id, self.collect_session_state())
+            self.active_doc_id = doc_id
+            self.restore_session_state(self.documents.get(doc_id))
+        except Exception as e:
+            print(f"Document Switch Error: {e}")
+            QMessageBox.critical(self, "에러", f"문서 전환 중 오류가 발생했습니다.\n{e}")
+
+    def on_document_tab_close(self, index: int):
+        doc_id = self.documentTabBar.tabData(index)
+        if doc_id == self.active_doc_id:
+            # 닫히는 문서는 보관하지 않음
+            self.active_doc_id = None
+        self.documents.remove(doc_id)
+        self.documentTabBar.removeTab(index)
+
+        if self.documentTabBar.count() == 0:
+            self.documentTabBar.hide()
+            self._clear_tables()
+        elif self.active_doc_id is None:
+            self.on_document_tab_changed(self.documentTabBar.currentIndex())
+
+    def dragEnterEvent(self, event):
+        if self._dropped_paths(event.mimeData()):
+            event.acceptProposedAction()
+        else:
+            super().dragEnterEvent(event)
+
+    def dropEvent(self, event):
+        file_paths = self._dropped_paths(event.mimeData())
+        if file_paths:
+            event.acceptProposedAction()
+            self.open_documents(file_paths)
+        else:
+            super().dropEvent(event)
+
+    @staticmethod
+    def _dropped_paths(mime_data) -> list[str]:
+        if not mime_data.hasUrls():
+            return []
+        return [
+            url.toLocalFile() for url in mime_data.urls()
+            if url.isLocalFile() and url.toLocalFile().lower().endswith(supported_suffixes() + (".crms",))
+        ]
     
+    def on_watch_toggled(self, checked: bool):
+        self._update_file_watch()
+
+    def _update_file_watch(self):
+        """감시 모드가 켜져 있고 불러온 파일이 있으면 해당 파일을 감시합니다."""
+        if self.watchCheckBox.isChecked() and self.current_file_path and Path(self.current_file_path).exists():
+            if self.file_watcher.path != self.current_file_path:
+                self.file_watcher.watch(self.current_file_path)
+        else:
+            self.file_watcher.stop()
+
+    def on_watched_file_changed(self, file_path: str):
+        """감시 중인 파일이 저장되면 다시 읽어 바뀐 RM 그룹만 테이블에 반영합니다."""
+        if file_path != self.current_file_path:
+            return
+
+        try:
+            tables = load_tables_cached(file_path, ["Table1", "Table2"])
+        except Exception as e:
+            # 엑셀이 아직 쓰는 중이면 잠시 후 다시 시도 (계속 읽을 수 없으면 상태 표시줄에 알리고 중단)
+            print(f"Watch Reload Error: {e}")
+            if not self.file_watcher.retry():
+                self.summaryLabel.setText(f"{self.summaryLabel.text()} / 파일 변경 반영 실패: {e}")
+            return
+
+        self.file_watcher.reset_retries()
+        changed = 0
+        self._set_tables_signal_blocked(True)
+        try:
+            for table, sheet_name in ((self.table1Table, "Table1"), (self.table2Table, "Table2")):
+                v_scroll = table.verticalScrollBar().value()
+                h_scroll = table.horizontalScrollBar().value()
+                table_changed = patch_table(table, tables[sheet_name])
+                if table_changed:
+                    table.undo_stack.clear()
+                changed += table_changed
+                table.verticalScrollBar().setValue(v_scroll)
+                table.horizontalScrollBar().setValue(h_scroll)
+
+            if changed:
+                self.on_tables_content_changed()
+        finally:
+            self._set_tables_signal_blocked(False)
+
+        if changed:
+            self.summaryLabel.setText(f"{self.summaryLabel.text()} / 파일 변경 반영: 원료 {changed}개")
+
     def on_download_result(self):
         try:
             file_path, _ = QtWidgets.QFileDialog.getSaveFileName(
@@ -243,6 +684,8 @@ class CheckerPage(QtWidgets.QWidget):
             data1 = extract_data_from_table(self.table1Table)
             data2 = extract_data_from_table(self.table2Table)
 
+            from app.utils.excel_handler import export_to_excel
+
             saved_path = export_to_excel(file_path, data1, data2)
 
             if QMessageBox.question(self, "완료", "결과 파일이 저장되었습니다.\n폴더를 여시겠습니까?") == QMessageBox.Yes:
@@ -252,6 +695,149 @@ class CheckerPage(QtWidgets.QWidget):
             print(f"Result Download Error: {e}")
             QMessageBox.critical(self, "에러", f"결과 다운로드 중 오류가 발생했습니다.\n{e}")
 
+    def on_nway_compare(self):
+        """여러 파일(또는 한 파일의 Table1..TableN 시트)을 N-way 비교하고 결과를 엑셀로 저장합니다."""
+        try:
+            file_paths, _ = QtWidgets.QFileDialog.getOpenFileNames(
+                self, "Select Formula Files", "", file_dialog_filter()
+            )
+            if not file_paths:
+                return
+
+            sources = load_sources(file_paths)
+            if len(sources) < 2:
+                QMessageBox.warning(self, "경고", "비교할 테이블(TableN 시트)이 2개 이상 필요합니다.")
+                return
+
+            result = compare_sources(sources)
+
+            save_path, _ = QtWidgets.QFileDialog.getSaveFileName(
+                self, "Save N-way Result", "nway_result.xlsx", "Excel Files (*.xlsx)"
+            )
+            if not save_path:
+                return
+
+            from app.utils.excel_handler import export_nway_report
+
+            saved_path = export_nway_report(save_path, result)
+
+            lines = [f"{name}: 차이 {len(result.deviations_for(i))}건" for i, name in enumerate(result.sources)]
+            message = "\n".join(lines) + "\n\n결과 파일이 저장되었습니다.\n폴더를 여시겠습니까?"
+            if QMessageBox.question(self, "완료", message) == QMessageBox.Yes:
+                os.startfile(saved_path.parent)
+
+        except Exception as e:
+            print(f"N-way Compare Error: {e}")
+            QMessageBox.critical(self, "에러", f"N-way 비교 중 오류가 발생했습니다.\n{e}")
+
+    def on_save_session(self):
+        """두 테이블, 편집 상태, 마지막 Diff를 세션 파일로 저장합니다."""
+        try:
+            file_path, _ = QtWidgets.QFileDialog.getSaveFileName(
+                self, "Save Session", "review.crms", SESSION_FILE_FILTER
+            )
+            if not file_path:
+                return
+
+            save_session(file_path, self.collect_session_state())
+            self.summaryLabel.setText(f"{self.summaryLabel.text()} / 세션 저장: {Path(file_path).name}")
+
+        except Exception as e:
+            print(f"Session Save Error: {e}")
+            QMessageBox.critical(self, "에러", f"세션 저장 중 오류가 발생했습니다.\n{e}")
+
+    def on_open_session(self):
+        """세션 파일을 새 탭으로 열어 검토 상태를 복원합니다. (엑셀 재파싱/재비교 없음)"""
+        try:
+            file_path, _ = QtWidgets.QFileDialog.getOpenFileName(
+                self, "Open Session", "", SESSION_FILE_FILTER
+            )
+            if not file_path:
+                return
+
+            state = load_session(file_path)
+            self._show_document(self._add_document(state, Path(file_path).stem, file_path))
+
+        except SessionFormatError as e:
+            QMessageBox.warning(self, "경고", f"세션 파일을 열 수 없습니다.\n{e}")
+        except Exception as e:
+            print(f"Session Open Error: {e}")
+            QMessageBox.critical(self, "에러", f"세션 열기 중 오류가 발생했습니다.\n{e}")
+
+    def collect_session_state(self) -> SessionState:
+        """현재 검토 상태를 SessionState로 만듭니다."""
+        meta = {
+            "file_label": self.fileLabel.text(),
+            "source_path": self.current_file_path,
+            "summary": self.summaryLabel.text(),
+            "tables": [self._table_view_state(t) for t in (self.table1Table, self.table2Table)],
+        }
+        return SessionState(
+            data1=extract_data_from_table(self.table1Table),
+            data2=extract_data_from_table(self.table2Table),
+            diff1=list(self.last_diff1),
+            diff2=list(self.last_diff2),
+            meta=meta,
+        )
+
+    def restore_session_state(self, state: SessionState):
+        """SessionState를 테이블에 복원합니다. 캐시된 Diff가 있으면 재비교 없이 적용합니다."""
+        meta = state.meta
+        self.fileLabel.setText(meta.get("file_label", ""))
+        self.current_file_path = meta.get("source_path", "")
+        self._update_file_watch()
+
+        self._set_tables_signal_blocked(True)
+        try:
+            for table, data in ((self.table1Table, state.data1), (self.table2Table, state.data2)):
+                setup_table_header(table)
+                render_table(table, data)
+                # 편집 이력은 표시 중인 문서에만 유효
+                table.undo_stack.clear()
+
+            if state.diff1 is not None and state.diff2 is not None:
+                self.last_diff1 = state.diff1
+                self.last_diff2 = state.diff2
+                with span("restyle", diffs=len(state.diff1) + len(state.diff2), cached=True):
+                    self.table1Table.apply_diff_report(state.diff1)
+                    self.table2Table.apply_diff_report(state.diff2)
+                self.summaryLabel.setText(meta.get("summary", ""))
+                # render_table이 state 데이터를 표시 순서로 정렬해 둠
+                self._rebuild_diff_index(state.data1, state.data2)
+            else:
+                self.on_tables_content_changed()
+        finally:
+            self._set_tables_signal_blocked(False)
+
+        # 레이아웃 갱신 후 스크롤/선택 위치 복원
+        view_states = meta.get("tables", [])
+        for table, view_state in zip((self.table1Table, self.table2Table), view_states):
+            QtCore.QTimer.singleShot(0, lambda t=table, v=view_state: self._restore_table_view_state(t, v))
+
+    def _table_view_state(self, table) -> dict:
+        return {
+            "scroll": table.verticalScrollBar().value(),
+            "h_scroll": table.horizontalScrollBar().value(),
+            "current": [table.currentRow(), table.currentColumn()],
+        }
+
+    def _restore_table_view_state(self, table, view_state: dict):
+        row, col = view_state.get("current", [-1, -1])
+        if 0 <= row < table.rowCount() and 0 <= col < table.columnCount():
+            table.setCurrentCell(row, col)
+        table.verticalScrollBar().setValue(view_state.get("scroll", 0))
+        table.horizontalScrollBar().setValue(view_state.get("h_scroll", 0))
+
+    def on_label_compare(self, table):
+        """선택한 테이블의 최종 조성(함량 내림차순 전성분, INCI별 합계)을 텍스트 비교 페이지로 보냅니다."""
+        data = extract_data_from_table(table)
+        composition = roll_up_composition(data)
+        if not composition:
+            QMessageBox.warning(self, "경고", "최종 조성을 계산할 데이터가 없습니다.")
+            return
+        source = "테이블 1" if table is self.table1Table else "테이블 2"
+        self.label_compare_requested.emit(composition, source)
+
     def _set_tables_signal_blocked(self, blocked: bool):
         self.table1Table.blockSignals(blocked)
         self.table2Table.blockSignals(blocked)
@@ -5,9 +5,14 @@ from itertools import zip_longest
 from app.ui.dialogs.text_input_dialog import TextInputDialog
 from app.ui.widgets import StyledButton
 from app.ui.styles import AppColors, AppStyles
-from app.utils.text_parser import parse_ingredients
+from app.utils.text_parser import parse_ingredients, parse_ingredient_percents
 from app.utils.comparator import compare_ingredients
-from app.utils.excel_handler import export_comparison_table
+from app.utils.composition import composition_label, compare_label_percents, LABEL_TOLERANCE
+from app.utils.profiling import span
+
+NAME_HEADERS = ["A열 성분", "B열 성분"]
+PERCENT_HEADERS = ["라벨 성분", "라벨 %", "테이블 % (FP)", "상태"]
+PERCENT_COMPARE_HINT = "원료 검증기의 '전성분 라벨 비교'로 최종 조성을 보내면 사용할 수 있습니다."
 
 class TextComparatorPage(QtWidgets.QWidget):
     # Signal to request navigation to home
@@ -17,6 +22,11 @@ class TextComparatorPage(QtWidgets.QWidget):
         super().__init__(parent)
         self.list1_data = [] # List of strings
         self.list2_data = [] # List of strings
+        # 함량 비교 모드: 원료 검증기 테이블의 최종 조성(INCI별 합계)과 라벨 (성분명, 함량) 비교
+        self.mode = "name"  # "name" | "percent"
+        self.reference_composition = []  # List of CompositionEntry
+        self.reference_source = ""
+        self.percent_entries = []  # List of (name, Decimal | None, comparator)
         self.is_updating = False
         self._init_ui()
         
@@ -54,6 +64,27 @@ class TextComparatorPage(QtWidgets.QWidget):
         self.btnUpload2.clicked.connect(lambda: self.on_upload_click(2))
         layout.addWidget(self.btnUpload2)
         
+        self.btnPercentCompare = StyledButton("함량 비교")
+        self.btnPercentCompare.setEnabled(False)
+        self.btnPercentCompare.setToolTip(PERCENT_COMPARE_HINT)
+        self.btnPercentCompare.clicked.connect(self.on_percent_compare_click)
+        layout.addWidget(self.btnPercentCompare)
+
+        # 허용 오차는 함량 비교 모드에서만 표시
+        self.toleranceLabel = QtWidgets.QLabel("허용 오차")
+        self.toleranceLabel.hide()
+        layout.addWidget(self.toleranceLabel)
+        self.toleranceSpinBox = QtWidgets.QDoubleSpinBox()
+        self.toleranceSpinBox.setDecimals(4)
+        self.toleranceSpinBox.setRange(0.0, 10.0)
+        self.toleranceSpinBox.setSingleStep(0.01)
+        self.toleranceSpinBox.setSuffix(" %p")
+        self.toleranceSpinBox.setValue(LABEL_TOLERANCE)
+        self.toleranceSpinBox.setToolTip("라벨 함량의 표기 자릿수 반올림 범위(68.5 → ±0.05)가 더 크면 그 범위를 사용합니다.")
+        self.toleranceSpinBox.valueChanged.connect(self.on_tolerance_changed)
+        self.toleranceSpinBox.hide()
+        layout.addWidget(self.toleranceSpinBox)
+
         self.btnExport = StyledButton("데이터 추출 (.xlsx)")
         self.btnExport.clicked.connect(self.on_export_click)
         layout.addWidget(self.btnExport)
@@ -67,8 +98,8 @@ class TextComparatorPage(QtWidgets.QWidget):
         
     def _create_table(self) -> QtWidgets.QTableWidget:
         table = QtWidgets.QTableWidget()
-        table.setColumnCount(2)
-        table.setHorizontalHeaderLabels(["A열 성분", "B열 성분"])
+        table.setColumnCount(len(NAME_HEADERS))
+        table.setHorizontalHeaderLabels(NAME_HEADERS)
         table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
         # Allow editing
         table.itemChanged.connect(self.on_item_changed)
@@ -83,8 +114,14 @@ class TextComparatorPage(QtWidgets.QWidget):
         """Resets the UI and internal data to initial state."""
         self.list1_data = []
         self.list2_data = []
+        self.percent_entries = []
+        self.reference_composition = []
+        self.reference_source = ""
+        self.btnPercentCompare.setEnabled(False)
+        self.btnPercentCompare.setToolTip(PERCENT_COMPARE_HINT)
         self.is_updating = True # Block signals while clearing
         self.table.setRowCount(0)
+        self._set_mode("name")
         self.is_updating = False
         self.summaryLabel.setText("데이터를 업로드해주세요.")
             
@@ -92,18 +129,59 @@ class TextComparatorPage(QtWidgets.QWidget):
         dialog = TextInputDialog(f"{col_idx}열 데이터 입력", self)
         if dialog.exec_() == QtWidgets.QDialog.Accepted:
             text = dialog.get_text()
-            ingredients = parse_ingredients(text)
-            
-            if col_idx == 1:
-                self.list1_data = ingredients
-            else:
-                self.list2_data = ingredients
-                
-            self.update_comparison()
+            with span("parse_text", chars=len(text)) as s:
+                ingredients = parse_ingredients(text)
+                s.set(items=len(ingredients))
+            self.set_column_data(col_idx, ingredients)
+
+    def _set_mode(self, mode: str):
+        """성분명 비교(2열) / 함량 비교(4열) 표 구성 전환"""
+        if self.mode == mode and self.table.columnCount():
+            return
+        self.mode = mode
+        self.toleranceLabel.setVisible(mode == "percent")
+        self.toleranceSpinBox.setVisible(mode == "percent")
+        headers = PERCENT_HEADERS if mode == "percent" else NAME_HEADERS
+        self.table.setRowCount(0)
+        self.table.setColumnCount(len(headers))
+        self.table.setHorizontalHeaderLabels(headers)
+
+    def set_reference_composition(self, composition: list, source: str = ""):
+        """
+        원료 검증기 테이블의 최종 조성을 받습니다.
+        1열에 전성분(함량 내림차순)을 표시하고, 함량 비교의 기준으로 사용합니다.
+        """
+        self.reference_composition = list(composition)
+        self.reference_source = source
+        self.btnPercentCompare.setEnabled(bool(self.reference_composition))
+        self.btnPercentCompare.setToolTip(f"{source} 최종 조성과 라벨 함량 비교" if source else "최종 조성과 라벨 함량 비교")
+        self.set_column_data(1, composition_label(self.reference_composition))
+
+    def on_percent_compare_click(self):
+        dialog = TextInputDialog("함량 표기 전성분 입력 (예: Water 68.5%, Glycerin (5%))", self)
+        if dialog.exec_() == QtWidgets.QDialog.Accepted:
+            text = dialog.get_text()
+            with span("parse_text", chars=len(text), percents=True) as s:
+                self.percent_entries = parse_ingredient_percents(text)
+                s.set(items=len(self.percent_entries))
+            self.update_percent_comparison()
+
+    def on_tolerance_changed(self, _value: float):
+        if self.mode == "percent":
+            self.update_percent_comparison()
+
+    def set_column_data(self, col_idx: int, ingredients: list[str]):
+        """지정한 열(1 또는 2)의 성분 리스트를 교체하고 비교를 갱신합니다."""
+        if col_idx == 1:
+            self.list1_data = list(ingredients)
+        else:
+            self.list2_data = list(ingredients)
+
+        self.update_comparison()
             
     def on_item_changed(self, item):
         """Handle user edits in the table."""
-        if self.is_updating:
+        if self.is_updating or self.mode != "name":
             return
             
         row = item.row()
@@ -126,28 +204,32 @@ class TextComparatorPage(QtWidgets.QWidget):
         # Prevent recursion (since setItem triggers itemChanged)
         self.is_updating = True
         try:
+            self._set_mode("name")
+
             # 1. Compare using logic from utils
-            rows = compare_ingredients(self.list1_data, self.list2_data)
+            with span("compare_text", items=len(self.list1_data) + len(self.list2_data)):
+                rows = compare_ingredients(self.list1_data, self.list2_data)
             
             # 2. Render to Table
-            self.table.setRowCount(0)
-            self.table.setRowCount(len(rows))
-            
-            match_count = 0
-            
-            for r_idx, (val1, val2, status) in enumerate(rows):
-                item1 = QtWidgets.QTableWidgetItem(val1)
-                item2 = QtWidgets.QTableWidgetItem(val2)
+            with span("render_text", rows=len(rows)):
+                self.table.setRowCount(0)
+                self.table.setRowCount(len(rows))
+                
+                match_count = 0
                 
-                if status == "MATCH":
-                    match_count += 1
-                else:
-                    # "DIFF" - Highlight both cells
-                    item1.setBackground(AppColors.DIFF_BG_YELLOW)
-                    item2.setBackground(AppColors.DIFF_BG_YELLOW)
+                for r_idx, (val1, val2, status) in enumerate(rows):
+                    item1 = QtWidgets.QTableWidgetItem(val1)
+                    item2 = QtWidgets.QTableWidgetItem(val2)
                     
-                self.table.setItem(r_idx, 0, item1)
-                self.table.setItem(r_idx, 1, item2)
+                    if status == "MATCH":
+                        match_count += 1
+                    else:
+                        # "DIFF" - Highlight both cells
+                        item1.setBackground(AppColors.DIFF_BG_YELLOW)
+                        item2.setBackground(AppColors.DIFF_BG_YELLOW)
+                        
+                    self.table.setItem(r_idx, 0, item1)
+                    self.table.setItem(r_idx, 1, item2)
                 
             # 3. Update Summary
             total = len(rows)
@@ -159,6 +241,41 @@ class TextComparatorPage(QtWidgets.QWidget):
         finally:
             self.is_updating = False
 
+    def update_percent_comparison(self):
+        """라벨 (성분명, 함량)을 기준 최종 조성과 허용 오차 내에서 비교해 표시합니다."""
+        self.is_updating = True
+        try:
+            self._set_mode("percent")
+            tolerance = self.toleranceSpinBox.value()
+            with span("compare_percent", items=len(self.percent_entries)):
+                diffs = compare_label_percents(self.percent_entries, self.reference_composition, tolerance)
+
+            with span("render_text", rows=len(diffs)):
+                self.table.setRowCount(len(diffs))
+                counts = {"MATCH": 0, "DIFF": 0, "MISSING": 0}
+                for r_idx, diff in enumerate(diffs):
+                    counts[diff.status] += 1
+                    values = (
+                        diff.inci_name,
+                        f"{diff.bound}{diff.percent1:g}" if diff.percent1 is not None else "-",
+                        f"{round(diff.percent2, 6):g}" if diff.percent2 is not None else "-",
+                        diff.status,
+                    )
+                    for c_idx, value in enumerate(values):
+                        item = QtWidgets.QTableWidgetItem(value)
+                        item.setFlags(item.flags() & ~QtCore.Qt.ItemIsEditable)
+                        if diff.status == "MISSING" or (diff.status == "DIFF" and c_idx in (1, 2)):
+                            item.setBackground(AppColors.DIFF_BG_YELLOW)
+                        self.table.setItem(r_idx, c_idx, item)
+
+            source = f"{self.reference_source} " if self.reference_source else ""
+            self.summaryLabel.setText(
+                f"{source}최종 조성 비교: 총 {len(diffs)}개 / 일치 {counts['MATCH']}개 / "
+                f"함량 차이 {counts['DIFF']}개 / 누락 {counts['MISSING']}개 (허용 오차 {tolerance:g}%p)"
+            )
+        finally:
+            self.is_updating = False
+
     def on_export_click(self):
         if self.table.rowCount() == 0:
             QtWidgets.QMessageBox.warning(self, "경고", "추출할 데이터가 없습니다.")
@@ -171,6 +288,9 @@ class TextComparatorPage(QtWidgets.QWidget):
             return
             
         try:
+            # openpyxl은 엑셀을 쓸 때 처음 import (시작 속도)
+            from app.utils.excel_handler import export_comparison_table
+
             export_comparison_table(self.table, file_path)
             
             if QtWidgets.QMessageBox.question(self, "완료", "파일이 저장되었습니다.\n열시겠습니까?") == QtWidgets.QMessageBox.Yes:
@@ -8,6 +8,14 @@ class AppColors:
     # Excel / Table Diff Colors
     TEXT_RED = QColor(255, 0, 0)
     BG_RED = QColor(255, 200, 200)
+
+    # Mass Balance (합계 오류) Background (Light Orange)
+    BG_ORANGE = QColor(255, 225, 170)
+    BG_ORANGE_HEX = "FFE1AA"
+
+    # Regulatory Limit Exceeded (Purple Text)
+    TEXT_PURPLE = QColor(128, 0, 160)
+    TEXT_PURPLE_HEX = "8000A0"
     
     WHITE = QColor(255, 255, 255)
     BLACK = QColor(0, 0, 0)
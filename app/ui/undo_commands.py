@@ -0,0 +1,29 @@
+from PyQt5 import QtWidgets
+from app.models import IngredientRow
+
+
+class RowDeltaCommand(QtWidgets.QUndoCommand):
+    """
+    테이블 편집 한 건을 행 단위 델타로 저장하는 Undo 명령
+
+    테이블 전체 스냅샷 대신 바뀐 행(삭제된 행 / 추가된 행)만 저장합니다.
+    테이블은 항상 정렬된 상태이므로 행 위치가 아닌 행 내용으로 델타를 적용합니다.
+    """
+
+    def __init__(self, table, text: str, removed: list[IngredientRow], added: list[IngredientRow],
+                 already_applied: bool = True):
+        super().__init__(text)
+        self.table = table
+        self.removed = removed
+        self.added = added
+        # 편집은 이미 테이블에 반영된 상태로 push되므로 첫 redo()는 건너뜀
+        self._skip_redo = already_applied
+
+    def redo(self):
+        if self._skip_redo:
+            self._skip_redo = False
+            return
+        self.table.apply_row_delta(self.removed, self.added)
+
+    def undo(self):
+        self.table.apply_row_delta(self.added, self.removed)
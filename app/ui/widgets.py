@@ -1,7 +1,12 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
 from PyQt5.QtWidgets import QMessageBox, QTableWidget, QPushButton
-from app.utils.table_handler import re_sort_table
+from app.utils.table_handler import re_sort_table, render_table, patch_table, extract_data_from_table
+from app.utils.row_reader import parse_clipboard_rows
+from app.utils.normalizer import normalize_key
+from app.utils.percent import percents_equal
 from app.ui.styles import AppStyles, AppColors
+from app.ui.undo_commands import RowDeltaCommand
+from app.models import DiffType, IngredientRow
 
 class StyledButton(QPushButton):
     """Standard Button with predefined styles."""
@@ -18,15 +23,23 @@ class MaterialTableWidget(QTableWidget):
     - Validating edits (Prevent duplicate RM names with different percentages)
     - Propagating edits to merged cells
     - Auto-resorting
+    - Bulk paste of rows copied from Excel (one validation, one re-sort)
+    - Undo/redo of edits, splits and pastes (row deltas only)
     """
     
     # Signal emitted when content changes significantly (requires external re-comparison)
     contentChanged = QtCore.pyqtSignal()
 
+    # Item data role storing the last applied (group hash, diff signature) on each RM cell
+    STYLE_KEY_ROLE = QtCore.Qt.UserRole + 1
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.is_updating = False
         self.old_text_value = ""
+
+        # Undo/Redo (each command stores only the changed rows)
+        self.undo_stack = QtWidgets.QUndoStack(self)
         
         # Connect internal signals
         self.itemChanged.connect(self._on_item_changed)
@@ -44,22 +57,159 @@ class MaterialTableWidget(QTableWidget):
         else:
             self.old_text_value = ""
 
+    def edit(self, index, trigger=None, event=None):
+        """Remember the value before editing starts (double click, typing, F2...)."""
+        if trigger is None:
+            return super().edit(index)
+        started = super().edit(index, trigger, event)
+        if started:
+            item = self.item(index.row(), index.column())
+            self.old_text_value = item.text() if item else ""
+        return started
+
     def _show_context_menu(self, pos):
-        """Show context menu for splitting rows."""
+        """Show context menu for splitting rows and pasting rows."""
         item = self.itemAt(pos)
-        if not item:
-            return
-            
+        menu = QtWidgets.QMenu(self)
+
         # Only allow splitting on INCI columns (2, 3) to avoid ambiguity
-        if item.column() not in [2, 3]:
-            return
+        split_action = None
+        if item and item.column() in [2, 3]:
+            split_action = menu.addAction("이 행 분할하기 (Split Row)")
+        paste_action = menu.addAction("복사한 행 붙여넣기 (Paste Rows)")
+        paste_action.setEnabled(bool(QtWidgets.QApplication.clipboard().text()))
+        menu.addSeparator()
+        undo_action = self.undo_stack.createUndoAction(menu, "실행 취소")
+        redo_action = self.undo_stack.createRedoAction(menu, "다시 실행")
+        menu.addAction(undo_action)
+        menu.addAction(redo_action)
 
-        menu = QtWidgets.QMenu(self)
-        split_action = menu.addAction("이 행 분할하기 (Split Row)")
         action = menu.exec_(self.mapToGlobal(pos))
         
-        if action == split_action:
+        if action is not None and action == split_action:
             self.split_row(item.row())
+        elif action == paste_action:
+            self.paste_rows(QtWidgets.QApplication.clipboard().text())
+
+    def keyPressEvent(self, event):
+        """Ctrl+V: paste a block of rows (TSV) as one transaction. Ctrl+Z / Ctrl+Y: undo / redo."""
+        if self.state() != QtWidgets.QAbstractItemView.EditingState:
+            if event.matches(QtGui.QKeySequence.Undo):
+                self.undo_stack.undo()
+                event.accept()
+                return
+            if event.matches(QtGui.QKeySequence.Redo):
+                self.undo_stack.redo()
+                event.accept()
+                return
+
+        if event.matches(QtGui.QKeySequence.Paste) and self.state() != QtWidgets.QAbstractItemView.EditingState:
+            text = QtWidgets.QApplication.clipboard().text()
+            if "\t" in text or "\n" in text.strip():
+                self.paste_rows(text)
+                event.accept()
+                return
+
+            # Single value: edit the current cell through the normal edit path
+            item = self.currentItem()
+            if item and text.strip():
+                self.old_text_value = item.text()
+                item.setText(text.strip())
+                event.accept()
+                return
+
+        super().keyPressEvent(event)
+
+    def paste_rows(self, text: str) -> int:
+        """
+        Parse TSV rows copied from Excel (RM / % RM/FP / INCI / % INCI/RM, merged RM
+        cells filled down) and append them to the table.
+        The whole block is validated first; then one re-sort and one contentChanged.
+        Returns the number of pasted rows.
+        """
+        if self.is_updating:
+            return 0
+
+        rows = parse_clipboard_rows(text)
+        if not rows:
+            QMessageBox.warning(self, "경고", "붙여넣을 행이 없습니다.\n(RM, % RM/FP, INCI, % INCI/RM 순서의 엑셀 영역을 복사하세요.)")
+            return 0
+
+        conflicts = self._find_paste_conflicts(rows)
+        if conflicts:
+            shown = "\n".join(conflicts[:10])
+            more = f"\n... 외 {len(conflicts) - 10}건" if len(conflicts) > 10 else ""
+            QMessageBox.warning(self, "붙여넣기 불가", f"같은 원료의 함량이 서로 다릅니다.\n{shown}{more}")
+            return 0
+
+        try:
+            self.is_updating = True
+            render_table(self, extract_data_from_table(self) + rows)
+            self.undo_stack.push(RowDeltaCommand(self, f"붙여넣기 {len(rows)}행", [], rows))
+            self.contentChanged.emit()
+        finally:
+            self.is_updating = False
+        return len(rows)
+
+    def apply_row_delta(self, removed: list[IngredientRow], added: list[IngredientRow]):
+        """
+        Remove `removed` rows (matched by content) and add `added` rows, then patch
+        only the changed RM groups (no full re-render) and notify once.
+        """
+        if self.is_updating:
+            return
+
+        try:
+            self.is_updating = True
+            pending = {}
+            for row in removed:
+                key = (row.rm_name, row.rm_percent, row.inci_name, row.inci_percent)
+                pending[key] = pending.get(key, 0) + 1
+
+            data = []
+            for row in extract_data_from_table(self):
+                key = (row.rm_name, row.rm_percent, row.inci_name, row.inci_percent)
+                if pending.get(key, 0) > 0:
+                    pending[key] -= 1
+                    continue
+                data.append(row)
+            data.extend(IngredientRow(r.rm_name, r.rm_percent, r.inci_name, r.inci_percent) for r in added)
+
+            patch_table(self, data)
+            self.contentChanged.emit()
+        finally:
+            self.is_updating = False
+
+    def _row_data(self, row) -> IngredientRow:
+        values = []
+        for col in range(4):
+            item = self.item(row, col)
+            values.append(item.text() if item else "")
+        return IngredientRow(*values)
+
+    def _find_paste_conflicts(self, rows) -> list[str]:
+        """Check RM % consistency of the pasted block against itself and the table (single pass each)."""
+        known = {}
+        for r in range(self.rowCount()):
+            rm_item = self.item(r, 0)
+            if rm_item is None:
+                continue
+            pct_item = self.item(r, 1)
+            known.setdefault(normalize_key(rm_item.text()), (rm_item.text(), pct_item.text().strip() if pct_item else ""))
+
+        conflicts = []
+        reported = set()
+        for row in rows:
+            key = normalize_key(row.rm_name)
+            pct = row.rm_percent.strip()
+            if key not in known:
+                known[key] = (row.rm_name, pct)
+                continue
+            name, other_pct = known[key]
+            if key not in reported and not percents_equal(other_pct, pct):
+                reported.add(key)
+                conflicts.append(f"'{name}': {other_pct}% / {pct}%")
+        return conflicts
 
     def split_row(self, row):
         """Slits the selected row into a new RM group."""
@@ -70,10 +220,12 @@ class MaterialTableWidget(QTableWidget):
             self.is_updating = True
             rm_item = self.item(row, 0)
             if rm_item:
+                old_row = self._row_data(row)
                 original_name = rm_item.text()
                 # Create new name: "Original (1)"
                 new_name = f"{original_name} (1)"
                 rm_item.setText(new_name)
+                self.undo_stack.push(RowDeltaCommand(self, "행 분할", [old_row], [self._row_data(row)]))
             
             # Re-sort immediately to reflect structure change
             re_sort_table(self)
@@ -102,6 +254,7 @@ class MaterialTableWidget(QTableWidget):
             # 2. Duplicate Check (RM Name conflict with different percentages)
             if item.column() == 0:
                 current_rm_name = new_text
+                current_rm_key = normalize_key(new_text)
                 # Get current row's percentage
                 pct_item = self.item(item.row(), 1)
                 current_rm_pct = pct_item.text().strip() if pct_item else ""
@@ -112,11 +265,11 @@ class MaterialTableWidget(QTableWidget):
                         continue
                     
                     other_rm = self.item(r, 0)
-                    if other_rm and other_rm.text().strip() == current_rm_name:
+                    if other_rm and normalize_key(other_rm.text()) == current_rm_key:
                         other_pct_item = self.item(r, 1)
                         other_pct = other_pct_item.text().strip() if other_pct_item else ""
                         
-                        if other_pct != current_rm_pct:
+                        if not percents_equal(other_pct, current_rm_pct):
                             QMessageBox.warning(
                                 self, 
                                 "값 변경 불가", 
@@ -129,6 +282,18 @@ class MaterialTableWidget(QTableWidget):
             # 3. Propagate Changes to Merged Cells
             self._propagate_merged_cell_change(item)
 
+            # Record the edit as a row delta (edited row, or the whole merged span for RM cells)
+            row, col = item.row(), item.column()
+            span = self.rowSpan(row, col) if col in [0, 1] else 1
+            new_rows = [self._row_data(r) for r in range(row, row + span)]
+            old_rows = []
+            for new_row in new_rows:
+                values = [new_row.rm_name, new_row.rm_percent, new_row.inci_name, new_row.inci_percent]
+                values[col] = self.old_text_value
+                old_rows.append(IngredientRow(*values))
+            if old_rows != new_rows:
+                self.undo_stack.push(RowDeltaCommand(self, "셀 편집", old_rows, new_rows))
+
             # 4. Re-sort
             re_sort_table(self)
             
@@ -155,43 +320,160 @@ class MaterialTableWidget(QTableWidget):
                 if target:
                     target.setText(new_text)
 
+    def set_visible_ranges(self, ranges):
+        """
+        Show only the given [start, end) row ranges (None: show all rows).
+        Only rows whose hidden state actually changes are touched.
+        """
+        mask = None
+        if ranges is not None:
+            mask = bytearray(self.rowCount())
+            for start, end in ranges:
+                mask[start:end] = b"\x01" * (end - start)
+
+        self.setUpdatesEnabled(False)
+        try:
+            for r in range(self.rowCount()):
+                hidden = mask is not None and not mask[r]
+                if self.isRowHidden(r) != hidden:
+                    self.setRowHidden(r, hidden)
+        finally:
+            self.setUpdatesEnabled(True)
+
     def reset_styles(self):
         """Reset all cell styles to default (White bg, Black text)."""
+        self._reset_rows(range(self.rowCount()))
+
+    def _reset_rows(self, rows):
+        """Reset cell styles of the given rows."""
         white_brush = QtGui.QBrush(AppColors.WHITE)
         black_brush = QtGui.QBrush(AppColors.BLACK)
         
-        for r in range(self.rowCount()):
+        for r in rows:
             for c in range(self.columnCount()):
                 item = self.item(r, c)
                 if item:
                     item.setBackground(white_brush)
                     item.setForeground(black_brush)
+                    if item.font().bold():
+                        font = item.font()
+                        font.setBold(False)
+                        item.setFont(font)
 
-    def apply_diff_report(self, diff_items):
-        """Apply styling based on diff report."""
-        from PyQt5 import QtGui
-        from app.models import DiffType
-        
-        red_brush = QtGui.QBrush(AppColors.TEXT_RED)
-        bg_red_brush = QtGui.QBrush(AppColors.BG_RED)
-        
+    def apply_diff_report(self, diff_items, groups=None):
+        """
+        Apply styling based on diff report.
+
+        If `groups` (GroupFingerprint list) is given, each RM group remembers the
+        (content hash, diff signature) it was last styled with on its RM cell.
+        Groups whose key is unchanged are skipped entirely.
+        """
         # Block signals to prevent itemChanged recursion
         was_blocked = self.signalsBlocked()
         self.blockSignals(True)
         
         try:
-            self.reset_styles()
-            
+            if groups is None:
+                self.reset_styles()
+                self._style_items(diff_items)
+                return
+
+            diffs_by_row = {}
             for diff in diff_items:
-                item = self.item(diff.row, diff.col)
-                if not item:
+                diffs_by_row.setdefault(diff.row, []).append(diff)
+
+            for group in groups:
+                rows = group.rows
+                anchor = self.item(rows[0], 0)
+                group_diffs = [d for r in rows for d in diffs_by_row.get(r, ())]
+                signature = tuple((d.row - rows[0], d.col, d.diff_type.value) for d in group_diffs)
+                style_key = (group.digest, signature)
+
+                # 내용과 Diff가 지난번 스타일링과 동일 -> 건너뜀
+                if anchor is not None and anchor.data(self.STYLE_KEY_ROLE) == style_key:
                     continue
-                    
-                if diff.diff_type == DiffType.CONTENT_MISMATCH:
-                    item.setForeground(red_brush)
-                elif diff.diff_type in (DiffType.MISSING_ROW, DiffType.MISSING_INCI):
-                    item.setBackground(bg_red_brush)
+
+                self._reset_rows(rows)
+                self._style_items(group_diffs)
+                if anchor is not None:
+                    anchor.setData(self.STYLE_KEY_ROLE, style_key)
                     
         finally:
             self.blockSignals(was_blocked)
 
+    def _style_items(self, diff_items):
+        """Apply diff styles to cells (no reset)."""
+        red_brush = QtGui.QBrush(AppColors.TEXT_RED)
+        bg_red_brush = QtGui.QBrush(AppColors.BG_RED)
+        bg_orange_brush = QtGui.QBrush(AppColors.BG_ORANGE)
+        purple_brush = QtGui.QBrush(AppColors.TEXT_PURPLE)
+
+        for diff in diff_items:
+            item = self.item(diff.row, diff.col)
+            if not item:
+                continue
+                
+            if diff.diff_type == DiffType.CONTENT_MISMATCH:
+                item.setForeground(red_brush)
+            elif diff.diff_type in (DiffType.MISSING_ROW, DiffType.MISSING_INCI):
+                item.setBackground(bg_red_brush)
+            elif diff.diff_type in (DiffType.RM_TOTAL_MISMATCH, DiffType.INCI_TOTAL_MISMATCH):
+                item.setBackground(bg_orange_brush)
+            elif diff.diff_type == DiffType.LIMIT_EXCEEDED:
+                item.setForeground(purple_brush)
+                font = item.font()
+                font.setBold(True)
+                item.setFont(font)
+
+
+class ProfilerHud(QtWidgets.QWidget):
+    """
+    Status-bar HUD showing the most recent profiling spans,
+    with a button to export the recorded spans as Chrome trace JSON.
+    """
+
+    MAX_SPANS = 6
+
+    # Listener may be called from any thread; deliver through a queued signal
+    spanRecorded = QtCore.pyqtSignal(str, float, dict)
+
+    def __init__(self, profiler, parent=None):
+        super().__init__(parent)
+        self.profiler = profiler
+        self._recent = []
+
+        layout = QtWidgets.QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.label = QtWidgets.QLabel("Profiling ON")
+        layout.addWidget(self.label)
+        self.traceButton = QtWidgets.QPushButton("Trace 저장")
+        layout.addWidget(self.traceButton)
+
+        self.spanRecorded.connect(self._on_span, QtCore.Qt.QueuedConnection)
+        self.traceButton.clicked.connect(self.on_export_trace)
+        listener = self.spanRecorded.emit
+        profiler.listeners.append(listener)
+        self.destroyed.connect(lambda *_: listener in profiler.listeners and profiler.listeners.remove(listener))
+
+    def _on_span(self, name, seconds, fields):
+        text = f"{name} {seconds * 1000:.0f}ms"
+        rows = fields.get("rows")
+        if rows is not None:
+            text += f" ({rows:,}행)"
+        peak_kb = fields.get("peak_kb")
+        if peak_kb is not None:
+            text += f" peak {peak_kb / 1024:.1f}MB"
+        self._recent = (self._recent + [text])[-self.MAX_SPANS:]
+        self.label.setText(" · ".join(self._recent))
+
+    def on_export_trace(self):
+        file_path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Save Chrome Trace", "trace.json", "Trace JSON (*.json)"
+        )
+        if not file_path:
+            return
+        try:
+            self.profiler.export_chrome_trace(file_path)
+        except Exception as e:
+            print(f"Trace Export Error: {e}")
+            QMessageBox.critical(self, "에러", f"Trace 저장 중 오류가 발생했습니다.\n{e}")
@@ -0,0 +1,104 @@
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from app.models import IngredientRow
+from app.utils.normalizer import normalize_key
+
+# 상대 테이블에 같은 RM 그룹이 없음
+NO_MATCH = 0xFFFFFFFF
+
+
+@dataclass
+class RowAlignment:
+    """
+    한 테이블의 RM 그룹 행 범위 -> 상대 테이블의 같은 RM 그룹 행 범위 대응표 (Diff마다 한 번 계산)
+
+    starts / ends: 이 테이블의 RM 그룹 [start, end) (정렬)
+    match_starts / match_ends: 상대 테이블의 같은 RM 그룹 범위 (없으면 NO_MATCH)
+    fallback_rows: 대응 그룹이 없을 때 사용할 상대 테이블 행 (가장 가까운 앞쪽, 없으면 뒤쪽 대응 그룹의 경계)
+    """
+    starts: array = field(default_factory=lambda: array("I"))
+    ends: array = field(default_factory=lambda: array("I"))
+    match_starts: array = field(default_factory=lambda: array("I"))
+    match_ends: array = field(default_factory=lambda: array("I"))
+    fallback_rows: array = field(default_factory=lambda: array("I"))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def _group_of(self, row: int) -> int:
+        return bisect_right(self.starts, row) - 1
+
+    def counterpart_range(self, row: int) -> tuple[int, int] | None:
+        """row가 속한 RM 그룹과 같은 상대 테이블 그룹의 [start, end) (없으면 None)"""
+        idx = self._group_of(row)
+        if idx < 0 or row >= self.ends[idx] or self.match_starts[idx] == NO_MATCH:
+            return None
+        return self.match_starts[idx], self.match_ends[idx]
+
+    def map_row(self, row: int) -> int | None:
+        """
+        row에 대응하는 상대 테이블 행
+        - 같은 RM 그룹이 있으면 그룹 안의 같은 위치 (상대 그룹이 짧으면 마지막 행)
+        - 없으면 가장 가까운 앞쪽(없으면 뒤쪽) 대응 그룹의 경계 행
+        """
+        if not self.starts:
+            return None
+        idx = max(self._group_of(row), 0)
+
+        if self.match_starts[idx] != NO_MATCH:
+            start, end = self.match_starts[idx], self.match_ends[idx]
+            return min(start + max(row - self.starts[idx], 0), end - 1)
+
+        fallback = self.fallback_rows[idx]
+        return None if fallback == NO_MATCH else fallback
+
+
+def _group_ranges(data: list[IngredientRow]) -> list[tuple[str, int, int]]:
+    """연속된 같은 RM(정규화 키) 행 범위 목록 (키, start, end)"""
+    ranges = []
+    start = 0
+    for i in range(1, len(data) + 1):
+        if i == len(data) or normalize_key(data[i].rm_name) != normalize_key(data[start].rm_name):
+            ranges.append((normalize_key(data[start].rm_name), start, i))
+            start = i
+    return ranges
+
+
+def _build(ranges: list[tuple[str, int, int]], other_ranges: list[tuple[str, int, int]]) -> RowAlignment:
+    # 상대 테이블에 같은 RM이 여러 번 나뉘어 있으면 첫 범위에 맞춤
+    other_first: dict[str, tuple[int, int]] = {}
+    for key, start, end in other_ranges:
+        other_first.setdefault(key, (start, end))
+
+    alignment = RowAlignment()
+    for key, start, end in ranges:
+        alignment.starts.append(start)
+        alignment.ends.append(end)
+        match = other_first.get(key)
+        alignment.match_starts.append(match[0] if match else NO_MATCH)
+        alignment.match_ends.append(match[1] if match else NO_MATCH)
+
+    # 대응 그룹이 없는 그룹의 대체 행 (앞쪽 -> 뒤쪽 순으로 한 번씩 훑어 계산)
+    count = len(alignment.starts)
+    alignment.fallback_rows = array("I", [NO_MATCH]) * count
+    last = NO_MATCH
+    for idx in range(count):
+        if alignment.match_starts[idx] != NO_MATCH:
+            last = alignment.match_ends[idx] - 1
+        else:
+            alignment.fallback_rows[idx] = last
+    last = NO_MATCH
+    for idx in range(count - 1, -1, -1):
+        if alignment.match_starts[idx] != NO_MATCH:
+            last = alignment.match_starts[idx]
+        elif alignment.fallback_rows[idx] == NO_MATCH:
+            alignment.fallback_rows[idx] = last
+    return alignment
+
+
+def build_alignment(data1: list[IngredientRow], data2: list[IngredientRow]) -> tuple[RowAlignment, RowAlignment]:
+    """두 테이블(표시 순서)의 RM 그룹 대응표를 만듭니다. Returns: (1 -> 2, 2 -> 1)"""
+    ranges1 = _group_ranges(data1)
+    ranges2 = _group_ranges(data2)
+    return _build(ranges1, ranges2), _build(ranges2, ranges1)
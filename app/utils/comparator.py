@@ -1,5 +1,6 @@
 from typing import List, Tuple
 from itertools import zip_longest
+from app.utils.inci_dictionary import canonical_inci_key
 
 # (Original_Text_A, Original_Text_B, Status)
 # Status: "MATCH", "DIFF"
@@ -11,7 +12,7 @@ def compare_ingredients(list1: List[str], list2: List[str]) -> List[ComparisonRo
     
     Logic:
     1. 두 리스트를 순서대로 나란히 배치 (zip_longest)
-    2. 소문자 변환 및 공백 제거 후 단순 비교 (==)
+    2. 표준 INCI명 변환(동의어/한글명/CAS No.) 및 소문자 변환 후 단순 비교 (==)
     3. 다르면 DIFF, 같으면 MATCH 반환
     """
     
@@ -22,8 +23,8 @@ def compare_ingredients(list1: List[str], list2: List[str]) -> List[ComparisonRo
         val1 = item1 if item1 else ""
         val2 = item2 if item2 else ""
         
-        norm1 = val1.strip().lower()
-        norm2 = val2.strip().lower()
+        norm1 = canonical_inci_key(val1)
+        norm2 = canonical_inci_key(val2)
         
         if norm1 == norm2:
             status = "MATCH"
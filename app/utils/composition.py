@@ -0,0 +1,177 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from app.models import IngredientRow
+from app.utils.inci_dictionary import canonical_inci, canonical_inci_key
+from app.utils.percent import parse_percent_column
+
+# 최종 조성 비교 허용 오차 (%p). 함량 문자열 비교용 app.utils.percent.DEFAULT_TOLERANCE와 별개
+COMPOSITION_TOLERANCE = 0.001
+
+_HUNDRED = Decimal(100)
+
+
+@dataclass
+class CompositionEntry:
+    """완제품(FP) 기준 INCI 함량 한 줄"""
+    inci_name: str  # 표준 INCI명 (표시용)
+    percent: float  # % INCI/FP
+
+
+@dataclass
+class CompositionDiff:
+    """두 최종 조성의 INCI별 비교 결과"""
+    inci_name: str
+    percent1: float | None  # None: 1번 조성에 없음
+    percent2: float | None  # None: 2번 조성에 없음
+    status: str             # "MATCH", "DIFF", "MISSING"
+    bound: str = ""         # 라벨 비교: percent1이 상한/하한 표기일 때의 비교 기호 ("<", "≤", ">", "≥")
+
+
+def roll_up_composition(data_list: list[IngredientRow]) -> list[CompositionEntry]:
+    """
+    RM -> INCI 테이블을 완제품 기준 INCI 조성으로 합산합니다.
+
+    Logic:
+    1. % RM/FP, % INCI/RM 컬럼을 한 번에 Decimal 배열로 변환 (합계 검증과 같은 값)
+    2. 표준 INCI 키로 그룹 코드를 부여(factorize)한 뒤 그룹별로 % RM/FP × % INCI/RM / 100 을 Decimal로 합산
+    3. 함량 내림차순 정렬 (동률은 처음 등장한 순서), 결과 함량만 float로 변환
+    """
+    rm_values = parse_percent_column(row.rm_percent for row in data_list)
+    inci_values = parse_percent_column(row.inci_percent for row in data_list)
+
+    group_index: dict[str, int] = {}
+    group_names: list[str] = []
+    totals: list[Decimal] = []
+
+    for row, rm_pct, inci_pct in zip(data_list, rm_values, inci_values):
+        if not row.inci_name or rm_pct is None or inci_pct is None:
+            continue
+
+        key = canonical_inci_key(row.inci_name)
+        code = group_index.get(key)
+        if code is None:
+            code = len(group_names)
+            group_index[key] = code
+            group_names.append(canonical_inci(row.inci_name))
+            totals.append(Decimal(0))
+
+        totals[code] += rm_pct * inci_pct / _HUNDRED
+
+    order = sorted(range(len(group_names)), key=lambda i: -totals[i])
+    return [CompositionEntry(group_names[i], float(totals[i])) for i in order]
+
+
+def composition_label(entries: list[CompositionEntry]) -> list[str]:
+    """함량 내림차순 전성분 표기 리스트 (TextComparatorPage 입력 형식)"""
+    return [entry.inci_name for entry in entries]
+
+
+def compare_compositions(
+    comp1: list[CompositionEntry],
+    comp2: list[CompositionEntry],
+    tolerance: float = COMPOSITION_TOLERANCE,
+) -> list[CompositionDiff]:
+    """
+    두 최종 조성을 표준 INCI 키 기준으로 비교합니다.
+    - 함량 차이가 tolerance 이하이면 MATCH, 초과하면 DIFF
+    - 한쪽에만 있으면 MISSING
+    결과는 1번 조성 순서, 이어서 2번 조성에만 있는 성분 순서입니다.
+    """
+    index2 = {canonical_inci_key(e.inci_name): e for e in comp2}
+    seen: set[str] = set()
+    results: list[CompositionDiff] = []
+
+    for entry in comp1:
+        key = canonical_inci_key(entry.inci_name)
+        seen.add(key)
+        other = index2.get(key)
+        if other is None:
+            results.append(CompositionDiff(entry.inci_name, entry.percent, None, "MISSING"))
+        elif abs(entry.percent - other.percent) <= tolerance:
+            results.append(CompositionDiff(entry.inci_name, entry.percent, other.percent, "MATCH"))
+        else:
+            results.append(CompositionDiff(entry.inci_name, entry.percent, other.percent, "DIFF"))
+
+    for key, entry in index2.items():
+        if key not in seen:
+            results.append(CompositionDiff(entry.inci_name, None, entry.percent, "MISSING"))
+
+    return results
+
+
+# 라벨 함량 비교 기본 허용 오차 (%p)
+LABEL_TOLERANCE = 0.01
+
+# float 비교 여유 (68.5 - 68.45 = 0.04999... 등)
+_FLOAT_EPSILON = 1e-9
+
+
+def label_rounding(percent: Decimal) -> float:
+    """라벨 함량 표기 자릿수의 반올림 범위 (68.5 -> 0.05, 5 -> 0.5, 0.001 -> 0.0005)"""
+    exponent = percent.as_tuple().exponent
+    return 0.5 * 10.0 ** min(exponent, 0)
+
+
+# 라벨 비교 기호: 상한 / 하한 ("~"는 표기값과 같이 비교)
+UPPER_BOUNDS = ("<", "≤")
+LOWER_BOUNDS = (">", "≥")
+
+
+def compare_label_percents(
+    label: list[tuple[str, Decimal | None, str]],
+    composition: list[CompositionEntry],
+    tolerance: float = LABEL_TOLERANCE,
+) -> list[CompositionDiff]:
+    """
+    함량이 표기된 라벨 (성분명, 함량, 비교 기호)을 테이블 최종 조성(INCI별 합계)과 비교합니다.
+    - 라벨에 같은 INCI가 여러 번 있으면 합산
+    - 표기값: 함량 차이가 max(tolerance, 표기 자릿수의 반올림 범위) 이하이면 MATCH, 초과하면 DIFF
+    - "<", "≤" (상한): 테이블 함량이 라벨 함량 + 허용 범위 이하이면 MATCH
+      ">", "≥" (하한): 테이블 함량이 라벨 함량 - 허용 범위 이상이면 MATCH
+      (허용 오차 안에서는 "<"와 "≤"를 구분하지 않음, 합산한 항목에 상한과 하한이 섞이면 이름만 확인)
+    - 라벨에 함량이 없는 성분은 이름만 확인 (테이블에 있으면 MATCH)
+    - 한쪽에만 있으면 MISSING
+    결과는 라벨 순서, 이어서 테이블에만 있는 성분 순서입니다. (percent1: 라벨, percent2: 테이블)
+    """
+    index = {canonical_inci_key(e.inci_name): e for e in composition}
+
+    # 표준 INCI 키 -> [라벨 표기, 함량 합계, 반올림 범위 합계, 상한/하한 비교 기호 집합]
+    merged: dict[str, list] = {}
+    for name, percent, comparator in label:
+        key = canonical_inci_key(name)
+        entry = merged.setdefault(key, [name, None, 0.0, set()])
+        if percent is None:
+            continue
+        entry[1] = percent if entry[1] is None else entry[1] + percent
+        if comparator in UPPER_BOUNDS or comparator in LOWER_BOUNDS:
+            entry[3].add(comparator)
+        else:
+            entry[2] += label_rounding(percent)
+
+    results: list[CompositionDiff] = []
+    for key, (name, percent, rounding, bounds) in merged.items():
+        label_percent = float(percent) if percent is not None else None
+        upper = any(b in UPPER_BOUNDS for b in bounds)
+        lower = any(b in LOWER_BOUNDS for b in bounds)
+        bound = min(bounds) if upper != lower else ""
+        other = index.get(key)
+        if other is None:
+            results.append(CompositionDiff(name, label_percent, None, "MISSING", bound))
+            continue
+
+        margin = max(tolerance, rounding) + _FLOAT_EPSILON
+        if label_percent is None or (upper and lower):
+            matched = True
+        elif upper:
+            matched = other.percent <= label_percent + margin
+        elif lower:
+            matched = other.percent >= label_percent - margin
+        else:
+            matched = abs(label_percent - other.percent) <= margin
+        results.append(CompositionDiff(name, label_percent, other.percent, "MATCH" if matched else "DIFF", bound))
+
+    for key, entry in index.items():
+        if key not in merged:
+            results.append(CompositionDiff(entry.inci_name, None, entry.percent, "MISSING"))
+
+    return results
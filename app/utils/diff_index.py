@@ -0,0 +1,84 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from app.models import DiffItem, DiffType, IngredientRow
+from app.utils.normalizer import normalize_key
+
+# 테이블 전체에 대한 표시 (Σ % RM/FP ≠ 100은 모든 RM 그룹 첫 행에 칠해짐)
+# 차이만 보기/차이 이동 대상에서 제외 (합계 오류는 요약 표시줄에 한 번만 표시)
+TABLE_WIDE_DIFF_TYPES = (DiffType.RM_TOTAL_MISMATCH,)
+
+
+@dataclass
+class DiffIndex:
+    """
+    Diff 리포트와 함께 보관하는 행 인덱스 (위젯 색상을 다시 읽지 않고 탐색/필터)
+
+    rows: 차이가 있는 행 번호 (정렬, 중복 없음)
+    group_starts / group_ends: 테이블의 RM 그룹 행 범위 [start, end) (정렬)
+    """
+    rows: array = field(default_factory=lambda: array("I"))
+    group_starts: array = field(default_factory=lambda: array("I"))
+    group_ends: array = field(default_factory=lambda: array("I"))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def next_row(self, current: int) -> int | None:
+        """current 다음 차이 행 (마지막이면 처음으로)"""
+        if not self.rows:
+            return None
+        idx = bisect_right(self.rows, current)
+        return self.rows[idx] if idx < len(self.rows) else self.rows[0]
+
+    def prev_row(self, current: int) -> int | None:
+        """current 이전 차이 행 (처음이면 마지막으로)"""
+        if not self.rows:
+            return None
+        idx = bisect_left(self.rows, current) - 1
+        return self.rows[idx] if idx >= 0 else self.rows[-1]
+
+    def position(self, row: int) -> int:
+        """row가 몇 번째 차이 행인지 (1부터, 차이 행이 아니면 0)"""
+        idx = bisect_left(self.rows, row)
+        return idx + 1 if idx < len(self.rows) and self.rows[idx] == row else 0
+
+    def group_range(self, row: int) -> tuple[int, int]:
+        """row가 속한 RM 그룹의 [start, end) 범위"""
+        idx = bisect_right(self.group_starts, row) - 1
+        if idx < 0:
+            return row, row + 1
+        return self.group_starts[idx], self.group_ends[idx]
+
+    def diff_group_ranges(self) -> list[tuple[int, int]]:
+        """차이가 있는 RM 그룹의 행 범위 목록 (정렬)"""
+        ranges = []
+        last_start = -1
+        for row in self.rows:
+            start, end = self.group_range(row)
+            if start != last_start:
+                ranges.append((start, end))
+                last_start = start
+        return ranges
+
+
+def build_diff_index(diff_items: list[DiffItem], data: list[IngredientRow]) -> DiffIndex:
+    """
+    Diff 리포트와 테이블 데이터(표시 순서)로 DiffIndex를 만듭니다.
+    RM 그룹은 연속된 같은 RM(정규화 키 기준) 행입니다.
+    테이블 전체에 대한 표시(TABLE_WIDE_DIFF_TYPES)는 차이 행에 넣지 않습니다.
+    """
+    index = DiffIndex()
+    index.rows = array("I", sorted({d.row for d in diff_items if d.diff_type not in TABLE_WIDE_DIFF_TYPES}))
+
+    prev_key = None
+    for i, row in enumerate(data):
+        key = normalize_key(row.rm_name)
+        if i == 0 or key != prev_key:
+            if i:
+                index.group_ends.append(i)
+            index.group_starts.append(i)
+            prev_key = key
+    if data:
+        index.group_ends.append(len(data))
+    return index
@@ -1,15 +1,77 @@
 from app.models import DiffType, DiffItem, IngredientRow
+from app.utils.inci_dictionary import canonical_inci_key
+from app.utils.normalizer import normalize_key
+from app.utils.percent import DEFAULT_TOLERANCE, parse_percent, percent_values_equal
+from app.utils.fingerprint import GroupFingerprint, TableFingerprint, hash_group, root_hash
+from app.utils.profiling import span
 
-def generate_diff_report(source_data: list[IngredientRow], ref_data: list[IngredientRow]) -> list[DiffItem]:
+def generate_diff_report(source_data: list[IngredientRow], ref_data: list[IngredientRow],
+                         tolerance=DEFAULT_TOLERANCE) -> list[DiffItem]:
     """
     Source(내꺼) 기준으로 Ref(상대방)와 비교하여 스타일링(Diff) 정보를 생성합니다.
+    함량은 숫자로 비교합니다. ('5' == '5.0', 차이가 tolerance 이하이면 동일)
     """
-    diffs = []
-    
     # 데이터 구조화
     struct_source = _parse_structured_data_from_list(source_data)
     struct_ref = _parse_structured_data_from_list(ref_data)
 
+    # 테이블 루트 해시가 같으면 비교할 필요 없음
+    if _struct_root(struct_source) == _struct_root(struct_ref):
+        return []
+
+    return _diff_structs(struct_source, struct_ref, tolerance)
+
+def diff_tables(data1: list[IngredientRow], data2: list[IngredientRow], tolerance=DEFAULT_TOLERANCE,
+                parallel: bool | None = None):
+    """
+    양방향 Diff를 한 번에 생성합니다. (각 테이블은 한 번만 구조화)
+    parallel이 None이면 크기에 따라 자동 선택 (대용량은 RM 해시 파티션별 다중 프로세스 Diff)
+    Returns: (diff1, diff2, fingerprint1, fingerprint2)
+    """
+    from app.utils.parallel_diff import should_diff_in_parallel, parallel_diff_tables
+
+    if parallel is None:
+        parallel = should_diff_in_parallel(len(data1) + len(data2))
+    if parallel:
+        with span("diff", rows=len(data1) + len(data2), parallel=True) as s:
+            diff1, diff2, fp1, fp2 = parallel_diff_tables(data1, data2, tolerance)
+            s.set(diffs=len(diff1) + len(diff2))
+        return diff1, diff2, fp1, fp2
+
+    with span("diff", rows=len(data1) + len(data2)) as s:
+        struct1 = _parse_structured_data_from_list(data1)
+        struct2 = _parse_structured_data_from_list(data2)
+        fp1 = _struct_fingerprint(struct1)
+        fp2 = _struct_fingerprint(struct2)
+
+        # 루트 해시 동일 -> 변경 없음 (O(1) 판정)
+        if fp1.same_as(fp2):
+            s.set(diffs=0, unchanged=True)
+            return [], [], fp1, fp2
+
+        diff1 = _diff_structs(struct1, struct2, tolerance)
+        diff2 = _diff_structs(struct2, struct1, tolerance)
+        s.set(diffs=len(diff1) + len(diff2))
+    return diff1, diff2, fp1, fp2
+
+def fingerprint_table(data_list: list[IngredientRow]) -> TableFingerprint:
+    """테이블의 RM 그룹별 해시와 루트 해시를 계산합니다."""
+    return _struct_fingerprint(_parse_structured_data_from_list(data_list))
+
+def _struct_root(struct) -> bytes:
+    return root_hash((rm_name, rm_info["hash"]) for rm_name, rm_info in struct.items())
+
+def _struct_fingerprint(struct) -> TableFingerprint:
+    groups = {
+        rm_name: GroupFingerprint(rm_name, tuple(rm_info["rows"]), rm_info["hash"])
+        for rm_name, rm_info in struct.items()
+    }
+    return TableFingerprint(_struct_root(struct), groups)
+
+def _diff_structs(struct_source, struct_ref, tolerance) -> list[DiffItem]:
+    """구조화된 두 테이블을 비교합니다. 해시가 같은 RM 그룹은 건너뜁니다."""
+    diffs = []
+
     # 비교 루프
     for rm_name, rm_info in struct_source.items():
         # Case 1.3: 내 RM이 상대방에게 아예 없음 -> 전체 행 배경 빨강
@@ -21,8 +83,13 @@ def generate_diff_report(source_data: list[IngredientRow], ref_data: list[Ingred
 
         ref_rm = struct_ref[rm_name]
 
+        # 그룹 내용이 동일 -> 차이 없음
+        if rm_info["hash"] == ref_rm["hash"]:
+            continue
+
         # Case 1.1: RM 함량이 다름 -> 첫 번째 행의 % 컬럼 글자 빨강
-        if rm_info["percent"] != ref_rm["percent"]:
+        if not percent_values_equal(rm_info["percent_value"], ref_rm["percent_value"],
+                                    rm_info["percent"], ref_rm["percent"], tolerance):
             first_row = rm_info["rows"][0]
             diffs.append(DiffItem(first_row, 1, DiffType.CONTENT_MISMATCH))
             
@@ -37,7 +104,8 @@ def generate_diff_report(source_data: list[IngredientRow], ref_data: list[Ingred
             
             # Case 1.2: INCI 함량이 다름 -> 글자 빨강
             ref_inci = ref_rm["incis"][inci_name]
-            if inci_info["percent"] != ref_inci["percent"]:
+            if not percent_values_equal(inci_info["percent_value"], ref_inci["percent_value"],
+                                        inci_info["percent"], ref_inci["percent"], tolerance):
                 diffs.append(DiffItem(inci_info["row"], 3, DiffType.CONTENT_MISMATCH))
                 
     return diffs
@@ -46,11 +114,13 @@ def _parse_structured_data_from_list(data_list: list[IngredientRow]):
     """IngredientRow 리스트를 딕셔너리 구조로 변환"""
     data = {}
     for i, row in enumerate(data_list):
-        rm_name = row.rm_name
+        # 공백/전각/대시 변형, 대소문자 차이를 무시하는 정규화 키
+        rm_name = normalize_key(row.rm_name)
         
         if rm_name not in data:
             data[rm_name] = {
                 "percent": row.rm_percent,
+                "percent_value": parse_percent(row.rm_percent),
                 "rows": [], # Row Index
                 "incis": {}
             }
@@ -58,10 +128,15 @@ def _parse_structured_data_from_list(data_list: list[IngredientRow]):
         data[rm_name]["rows"].append(i)
         
         if row.inci_name:
-            # 대소문자 무시 비교를 위해 Key를 소문자로 변환
-            inci_key = row.inci_name.strip().lower()
+            # 동의어/한글명/CAS No.를 표준 INCI명으로 통일 + 대소문자 무시
+            inci_key = canonical_inci_key(row.inci_name)
             data[rm_name]["incis"][inci_key] = {
                 "percent": row.inci_percent,
+                "percent_value": parse_percent(row.inci_percent),
                 "row": i
             }
+
+    # RM 그룹별 내용 해시 (Merkle leaf)
+    for rm_name, rm_info in data.items():
+        rm_info["hash"] = hash_group(rm_name, rm_info["percent_value"], rm_info["percent"], rm_info["incis"])
     return data
@@ -0,0 +1,100 @@
+import os
+import shutil
+import tempfile
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+from app.utils.session import SessionState, encode_session, decode_session
+
+DOCUMENT_CACHE_ENV = "CRMC_DOCUMENT_CACHE_MB"
+
+# 비활성 문서를 메모리에 유지하는 최대 크기 (초과 시 오래 사용하지 않은 문서부터 디스크로 내림)
+DEFAULT_DOCUMENT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def document_cache_bytes() -> int:
+    """비활성 문서 메모리 한도: CRMC_DOCUMENT_CACHE_MB 환경 변수 > 기본값"""
+    try:
+        return int(float(os.environ[DOCUMENT_CACHE_ENV]) * 1024 * 1024)
+    except (KeyError, ValueError):
+        return DEFAULT_DOCUMENT_CACHE_BYTES
+
+
+class DocumentCache:
+    """
+    탭으로 열린 비교 문서(SessionState)를 위젯 없이 보관하는 LRU 캐시
+
+    - 메모리에는 세션 바이너리(문자열 테이블 + 인덱스 배열 + Diff 버퍼, 압축)로만 보관
+    - 총 크기가 max_bytes를 넘으면 오래 사용하지 않은 문서를 임시 폴더의 세션 파일로 내림
+    - get() 시 디스크에 있으면 다시 메모리로 올림
+    - 임시 폴더는 clear() 또는 캐시가 사라질 때(앱 종료 포함) 삭제
+    - max_bytes가 None이면 document_cache_bytes() (CRMC_DOCUMENT_CACHE_MB)
+    """
+
+    def __init__(self, max_bytes: int | None = None):
+        self.max_bytes = document_cache_bytes() if max_bytes is None else max_bytes
+        self._memory: OrderedDict[int, bytes] = OrderedDict()
+        self._spilled: dict[int, Path] = {}
+        self._spill_dir: Path | None = None
+        self._spill_cleanup: weakref.finalize | None = None
+
+    def __contains__(self, doc_id: int) -> bool:
+        return doc_id in self._memory or doc_id in self._spilled
+
+    def put(self, doc_id: int, state: SessionState):
+        self._discard_spilled(doc_id)
+        self._memory[doc_id] = encode_session(state)
+        self._memory.move_to_end(doc_id)
+        self._evict()
+
+    def get(self, doc_id: int) -> SessionState:
+        data = self._memory.get(doc_id)
+        if data is None:
+            path = self._spilled.pop(doc_id)  # 없는 문서면 KeyError
+            data = path.read_bytes()
+            path.unlink(missing_ok=True)
+            self._memory[doc_id] = data
+            self._evict(keep=doc_id)
+        self._memory.move_to_end(doc_id)
+        return decode_session(data)
+
+    def remove(self, doc_id: int):
+        self._memory.pop(doc_id, None)
+        self._discard_spilled(doc_id)
+
+    def clear(self):
+        self._memory.clear()
+        self._spilled.clear()
+        if self._spill_cleanup is not None:
+            self._spill_cleanup()
+            self._spill_cleanup = None
+            self._spill_dir = None
+
+    def memory_bytes(self) -> int:
+        return sum(len(data) for data in self._memory.values())
+
+    def spilled_count(self) -> int:
+        return len(self._spilled)
+
+    def _discard_spilled(self, doc_id: int):
+        path = self._spilled.pop(doc_id, None)
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+    def _evict(self, keep: int | None = None):
+        total = self.memory_bytes()
+        for doc_id in list(self._memory):
+            if total <= self.max_bytes:
+                break
+            if doc_id == keep:
+                continue
+            data = self._memory.pop(doc_id)
+            total -= len(data)
+
+            if self._spill_dir is None:
+                self._spill_dir = Path(tempfile.mkdtemp(prefix="crm_documents_"))
+                # weakref.finalize는 프로세스 종료 시(atexit)에도 실행됨
+                self._spill_cleanup = weakref.finalize(self, shutil.rmtree, self._spill_dir, True)
+            path = self._spill_dir / f"{doc_id}.crms"
+            path.write_bytes(data)
+            self._spilled[doc_id] = path
@@ -3,7 +3,18 @@ from pathlib import Path
 from openpyxl.styles import Font, PatternFill, Alignment
 from app.models import IngredientRow, DiffType
 from app.ui.styles import AppColors
-from app.utils.diff_logic import generate_diff_report
+from app.utils.diff_logic import diff_tables
+from app.utils.composition import roll_up_composition, compare_compositions
+from app.utils.validation import validate_mass_balance
+from app.utils.limits import find_limit_violations, limit_diff_report
+from app.utils.row_reader import rows_from_values
+from app.utils.profiling import span, profiled
+from app.utils.memory import should_stream_load, should_stream_export
+from app.utils.normalizer import normalize_key
+from app.utils.header_detection import (
+    ColumnMapping, TEMPLATE_MAPPING, SNIFF_ROWS, detect_header, mapped_values, resolve_sources,
+    workbook_signature, get_mapping_cache
+)
 
 FIXED_HEADER = ("RM", "% RM/FP", "INCI", "% INCI/RM")
 
@@ -29,59 +40,176 @@ def download_template_file(output_path: str | Path = "다운로드/output.xlsx")
 
 def load_data_from_excel(file_path: str, sheet_name: str) -> list[IngredientRow]:
     """엑셀 파일에서 원시 데이터를 읽어 IngredientRow 리스트로 변환합니다."""
-    wb = load_workbook(file_path, data_only=True)
-    if sheet_name not in wb.sheetnames:
-        return []
-        
-    sheet = wb[sheet_name]
-    raw_data = []
-    
-    # Fill-down을 위한 변수
-    current_rm = ""
-    current_rm_pct = ""
-
-    # 2행(헤더 다음)부터 읽기
-    for row in sheet.iter_rows(min_row=2, values_only=True):
-        # 안전한 접근 (인덱스 초과 방지)
-        rm_val = str(row[0]) if len(row) > 0 and row[0] is not None else None
-        rm_pct = str(row[1]) if len(row) > 1 and row[1] is not None else ""
-        inci = str(row[2]) if len(row) > 2 and row[2] is not None else ""
-        inci_pct = str(row[3]) if len(row) > 3 and row[3] is not None else ""
-
-        # 새 RM이 나오면 업데이트, 없으면 이전 RM 사용 (Fill-down 로직)
-        if rm_val:
-            current_rm = rm_val
-            current_rm_pct = rm_pct
-        
-        # 유효한 RM 그룹 내에 있다면 데이터 추가
-        if current_rm:
-            raw_data.append(IngredientRow(
-                rm_name=current_rm,
-                rm_percent=current_rm_pct,
-                inci_name=inci,
-                inci_percent=inci_pct
-            ))
-            
-    return raw_data
+    return load_tables_from_excel(file_path, [sheet_name])[sheet_name]
+
+
+def load_tables_from_excel(file_path: str, sheet_names: list[str] | None = None) -> dict[str, list[IngredientRow]]:
+    """
+    엑셀 파일을 한 번만 열어 여러 시트를 읽습니다.
+    sheet_names가 None이면 TableN 형식의 모든 시트를 번호 순으로 읽습니다.
+    TableN 시트가 없는 파일(공급사 양식)은 헤더가 감지된 시트를 순서대로 Table1, Table2...로 읽습니다.
+    메모리 예산을 넘을 것으로 예상되는 파일은 읽기 전용(스트리밍) 모드로 엽니다.
+    """
+    streaming = should_stream_load(file_path)
+    with span("parse", file=Path(file_path).name, streaming=streaming) as s:
+        wb = load_workbook(file_path, data_only=True, read_only=streaming)
+        try:
+            sources = resolve_sources(wb.sheetnames, _sheet_layout(wb), sheet_names)
+            tables = {
+                name: _read_sheet_rows(wb[source[0]], streaming, source[1]) if source else []
+                for name, source in sources.items()
+            }
+        finally:
+            if streaming:
+                # 읽기 전용 모드는 파일 핸들을 열어 둔 채로 유지함
+                wb.close()
+        s.set(rows=sum(len(rows) for rows in tables.values()))
+    return tables
+
+
+def _sheet_layout(wb) -> dict[str, ColumnMapping]:
+    """
+    시트별 헤더 위치/열 매핑 (헤더가 감지된 시트만)
+    같은 시트 구성의 파일에서 학습한 매핑이 있으면 감지를 건너뜁니다.
+    (매핑된 시트는 헤더 행만 확인, 헤더가 없던 시트는 이름 목록이 같은지만 확인)
+    """
+    signature = workbook_signature(wb.sheetnames, [wb[name].max_column or 0 for name in wb.sheetnames])
+    try:
+        cache = get_mapping_cache()
+    except OSError as e:
+        print(f"Header Mapping Cache Error: {e}")
+        cache = None
+
+    with span("detect", sheets=len(wb.sheetnames)) as s:
+        for layout, headerless in cache.layouts(signature) if cache else []:
+            if headerless == [name for name in wb.sheetnames if name not in layout] and all(
+                name in wb.sheetnames and mapping.matches_header(_row_values(wb[name], mapping.header_row))
+                for name, mapping in layout.items()
+            ):
+                s.set(cached=True)
+                return layout
+
+        layout = {}
+        headerless = []
+        for name in wb.sheetnames:
+            mapping = detect_header(wb[name].iter_rows(max_row=SNIFF_ROWS, values_only=True))
+            if mapping is not None:
+                layout[name] = mapping
+            else:
+                headerless.append(name)
+        s.set(cached=False)
+        if cache and layout:
+            cache.remember(signature, layout, headerless)
+    return layout
+
+
+def _row_values(sheet, row: int) -> tuple:
+    return next(sheet.iter_rows(min_row=row, max_row=row, values_only=True), ())
+
+
+def _read_sheet_rows(sheet, read_only: bool = False, mapping: ColumnMapping = TEMPLATE_MAPPING) -> list[IngredientRow]:
+    """시트의 헤더 다음 행부터 읽어 IngredientRow 리스트로 변환합니다. (병합된 RM은 Fill-down)"""
+    if read_only:
+        values = _read_only_values(sheet, mapping.data_row)
+    else:
+        values = sheet.iter_rows(min_row=mapping.data_row, values_only=True)
+    return rows_from_values(mapped_values(values, mapping))
+
+
+def _read_only_values(sheet, min_row: int = 2):
+    """
+    읽기 전용 시트의 값 행을 일반 모드와 같은 범위로 생성합니다.
+    셀이 없는 <row> 요소는 일반 모드에서 행으로 잡히지 않으므로, 끝부분의 빈 행은
+    병합 범위에 포함된 경우(일반 모드의 MergedCell)만 남깁니다.
+    """
+    from openpyxl.cell.read_only import EMPTY_CELL
+
+    last_row = min_row - 1
+    pending = 0
+    for row_idx, row in enumerate(sheet.iter_rows(min_row=min_row), start=min_row):
+        if all(cell is EMPTY_CELL for cell in row):
+            pending += 1
+            continue
+        for _ in range(pending):
+            yield ()
+        pending = 0
+        last_row = row_idx
+        yield tuple(cell.value for cell in row)
+
+    if pending:
+        for _ in range(max(0, _max_merged_row(sheet) - last_row)):
+            yield ()
+
+
+def _max_merged_row(sheet) -> int:
+    """병합 범위 중 가장 아래 행 (읽기 전용 모드는 병합 정보를 읽지 않으므로 시트 XML에서 직접 확인)"""
+    from xml.etree.ElementTree import iterparse
+    from openpyxl.utils.cell import range_boundaries
 
+    max_row = 0
+    with sheet._get_source() as source:
+        for _, element in iterparse(source):
+            if element.tag.endswith("}mergeCell"):
+                max_row = max(max_row, range_boundaries(element.get("ref"))[3])
+            element.clear()
+    return max_row
+
+@profiled("export")
 def export_to_excel(output_path: str, data1: list[IngredientRow], data2: list[IngredientRow]):
     """
     두 테이블의 데이터를 엑셀로 내보냅니다.
     - 숫자 변환 (String -> Float)
     - 셀 병합 (RM 단위)
     - 스타일 적용 (Diff Report 기반)
+    - 메모리 예산을 넘을 것으로 예상되면 스트리밍(write-only) 모드로 저장 (결과 동일)
     """
     
     # 스타일 정의
     RED_FONT = Font(color="FF0000")
     RED_BG_FILL = PatternFill(start_color="FFC8C8", end_color="FFC8C8", fill_type="solid")
+    ORANGE_BG_FILL = PatternFill(start_color=AppColors.BG_ORANGE_HEX, end_color=AppColors.BG_ORANGE_HEX, fill_type="solid")
+    PURPLE_BOLD_FONT = Font(color=AppColors.TEXT_PURPLE_HEX, bold=True)
     CENTER_ALIGN = Alignment(horizontal='center', vertical='center')
 
-    wb = Workbook()
+    streaming = should_stream_export(len(data1) + len(data2))
+    wb = Workbook(write_only=streaming)
 
     # Diff Report 생성 (스타일 적용을 위해)
-    diff1 = generate_diff_report(data1, data2)
-    diff2 = generate_diff_report(data2, data1)
+    # 합계 검증 결과를 먼저 두어 누락(빨간 배경) 스타일이 우선하도록 함
+    cmp1, cmp2, _, _ = diff_tables(data1, data2)
+    diff1 = validate_mass_balance(data1) + cmp1
+    diff2 = validate_mass_balance(data2) + cmp2
+
+    # 사용한도 초과 성분 (INCI 셀 보라색 굵은 글씨)
+    violations1 = find_limit_violations(data1)
+    violations2 = find_limit_violations(data2)
+    diff1 += limit_diff_report(data1, violations1)
+    diff2 += limit_diff_report(data2, violations2)
+
+    def _diff_style(diff_type):
+        """Diff 종류별 (font, fill). 해당 없는 항목은 None"""
+        if diff_type == DiffType.CONTENT_MISMATCH:
+            return RED_FONT, None
+        if diff_type in (DiffType.MISSING_ROW, DiffType.MISSING_INCI):
+            return None, RED_BG_FILL
+        if diff_type in (DiffType.RM_TOTAL_MISMATCH, DiffType.INCI_TOTAL_MISMATCH):
+            return None, ORANGE_BG_FILL
+        if diff_type == DiffType.LIMIT_EXCEEDED:
+            return PURPLE_BOLD_FONT, None
+        return None, None
+
+    def _make_cell(ws, value, font=None, fill=None, align=True):
+        """append()용 셀 (일반/write-only 시트 공용)"""
+        from openpyxl.cell import WriteOnlyCell
+
+        cell = WriteOnlyCell(ws, value=value)
+        if align:
+            cell.alignment = CENTER_ALIGN
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        return cell
 
     # -------------------------------------------------------------
     # Helper: 시트 작성 및 스타일링
@@ -123,7 +251,7 @@ def export_to_excel(output_path: str, data1: list[IngredientRow], data2: list[In
             if not data:
                 continue
                 
-            prev_rm = data[0].rm_name
+            prev_key = normalize_key(data[0].rm_name)
 
             for i, item in enumerate(data):
                 row_idx = i + 2
@@ -134,15 +262,16 @@ def export_to_excel(output_path: str, data1: list[IngredientRow], data2: list[In
                 ws.cell(row=row_idx, column=start_col + 2, value=item.inci_name).alignment = CENTER_ALIGN
                 ws.cell(row=row_idx, column=start_col + 3, value=_try_float(item.inci_percent)).alignment = CENTER_ALIGN
 
-                # 병합 로직 (RM 이름 기준)
-                if item.rm_name != prev_rm:
+                # 병합 로직 (RM 정규화 키 기준, 화면 테이블/Diff와 같음)
+                key = normalize_key(item.rm_name)
+                if key != prev_key:
                     # 이전 그룹 병합 (행 개수가 1개 이상일 때만)
                     if row_idx - 1 > merge_start_row:
                         ws.merge_cells(start_row=merge_start_row, start_column=start_col, end_row=row_idx-1, end_column=start_col)     # RM
                         ws.merge_cells(start_row=merge_start_row, start_column=start_col+1, end_row=row_idx-1, end_column=start_col+1) # % RM
                     
                     # 상태 업데이트
-                    prev_rm = item.rm_name
+                    prev_key = key
                     merge_start_row = row_idx
             
             # 마지막 그룹 병합
@@ -161,27 +290,223 @@ def export_to_excel(output_path: str, data1: list[IngredientRow], data2: list[In
                 
                 cell = ws.cell(row=target_row, column=target_col)
                 
-                if diff.diff_type == DiffType.CONTENT_MISMATCH:
-                    cell.font = RED_FONT
-                elif diff.diff_type in (DiffType.MISSING_ROW, DiffType.MISSING_INCI):
-                    cell.fill = RED_BG_FILL
+                font, fill = _diff_style(diff.diff_type)
+                if font is not None:
+                    cell.font = font
+                if fill is not None:
+                    cell.fill = fill
+
+    # -------------------------------------------------------------
+    # Helper: 시트 작성 (스트리밍) - 행 순서대로 한 번만 쓰고, 병합 범위는 마지막에 한 번에 등록
+    # -------------------------------------------------------------
+    def _stream_sheet(ws, dataset_list, diff_reports_list, start_col_list):
+        from openpyxl.utils import get_column_letter
+        from openpyxl.worksheet.cell_range import CellRange, MultiCellRange
+
+        # 컬럼 너비는 행을 쓰기 전에 설정해야 함
+        for start_col in start_col_list:
+            for offset, width in enumerate((50, 15, 50, 15)):
+                ws.column_dimensions[get_column_letter(start_col + offset)].width = width
+
+        # (행, 열) -> [font, fill] (일반 모드와 같이 나중 Diff가 우선)
+        styles = {}
+        for dataset_idx, diffs in enumerate(diff_reports_list):
+            start_col = start_col_list[dataset_idx]
+            for diff in diffs:
+                style = styles.setdefault((diff.row + 2, diff.col + start_col), [None, None])
+                font, fill = _diff_style(diff.diff_type)
+                style[0] = font or style[0]
+                style[1] = fill or style[1]
+
+        ws.append([_make_cell(ws, header, font=Font(bold=True)) for _ in dataset_list for header in FIXED_HEADER])
+
+        # 병합될 RM 그룹의 첫 행 (같은 RM 정규화 키가 2행 이상 이어지는 구간)
+        group_starts = []
+        ranges = []
+        for data, start_col in zip(dataset_list, start_col_list):
+            keys = [normalize_key(item.rm_name) for item in data]
+            starts = set()
+            group_start = 0
+            for i in range(1, len(data) + 1):
+                if i == len(data) or keys[i] != keys[group_start]:
+                    if i - group_start > 1:
+                        for col in (start_col, start_col + 1):
+                            ranges.append(CellRange(min_col=col, min_row=group_start + 2, max_col=col, max_row=i + 1))
+                    starts.add(group_start)
+                    group_start = i
+            group_starts.append(starts)
+
+        max_rows = max((len(d) for d in dataset_list), default=0)
+        for i in range(max_rows):
+            row_idx = i + 2
+            cells = []
+            for dataset_idx, data in enumerate(dataset_list):
+                start_col = start_col_list[dataset_idx]
+                if i < len(data):
+                    item = data[i]
+                    values = (item.rm_name, _try_float(item.rm_percent), item.inci_name, _try_float(item.inci_percent))
+                    merged_below = i not in group_starts[dataset_idx]
+                else:
+                    values = (None, None, None, None)
+                    merged_below = False
+
+                for offset, value in enumerate(values):
+                    font, fill = styles.get((row_idx, start_col + offset), (None, None))
+                    if i >= len(data) or (merged_below and offset < 2):
+                        # 병합 범위 안쪽 셀 / 데이터가 없는 셀: 값 없이 Diff 스타일만
+                        cells.append(_make_cell(ws, None, font, fill, align=False) if font or fill else None)
+                    else:
+                        cells.append(_make_cell(ws, value, font, fill))
+            ws.append(cells)
+
+        ws.merged_cells = MultiCellRange(ranges)
+
+    # -------------------------------------------------------------
+    # Helper: 최종 조성(INCI/FP) 비교 시트 작성
+    # -------------------------------------------------------------
+    def _write_composition_sheet(ws, comp_diffs):
+        ws.column_dimensions['A'].width = 50
+        ws.column_dimensions['B'].width = 20
+        ws.column_dimensions['C'].width = 20
+        ws.column_dimensions['D'].width = 12
+
+        headers = ("INCI", "% INCI/FP (Table1)", "% INCI/FP (Table2)", "Status")
+        ws.append([_make_cell(ws, header, font=Font(bold=True)) for header in headers])
+
+        for diff in comp_diffs:
+            values = (
+                diff.inci_name,
+                round(diff.percent1, 6) if diff.percent1 is not None else "",
+                round(diff.percent2, 6) if diff.percent2 is not None else "",
+                diff.status,
+            )
+            cells = []
+            for col_idx, value in enumerate(values, start=1):
+                font = RED_FONT if diff.status == "DIFF" and col_idx in (2, 3) else None
+                fill = RED_BG_FILL if diff.status == "MISSING" else None
+                cells.append(_make_cell(ws, value, font, fill))
+            ws.append(cells)
+
+    # -------------------------------------------------------------
+    # Helper: 사용한도 초과 목록 시트 작성
+    # -------------------------------------------------------------
+    def _write_limit_sheet(ws, violations_by_table):
+        for col_letter, width in zip("ABCDEF", (10, 50, 15, 15, 15, 50)):
+            ws.column_dimensions[col_letter].width = width
+
+        headers = ("Table", "INCI", "% INCI/FP", "Limit %", "Category", "Note")
+        ws.append([_make_cell(ws, header, font=Font(bold=True)) for header in headers])
+
+        for table_name, violations in violations_by_table:
+            for v in violations:
+                values = (table_name, v.inci_name, round(v.percent, 6), v.max_percent, v.category, v.note)
+                ws.append([
+                    _make_cell(ws, value, PURPLE_BOLD_FONT if col_idx == 3 else None)
+                    for col_idx, value in enumerate(values, start=1)
+                ])
 
     # -------------------------------------------------------------
     # Sheet 생성 및 실행
     # -------------------------------------------------------------
     
+    write_sheet = _stream_sheet if streaming else _write_sheet
+
     # Sheet 1: Result (Combined)
-    ws_combined = wb.active
-    ws_combined.title = "Result"
-    _write_sheet(ws_combined, [data1, data2], [diff1, diff2], [1, 5])
+    if streaming:
+        ws_combined = wb.create_sheet(title="Result")
+    else:
+        ws_combined = wb.active
+        ws_combined.title = "Result"
+    write_sheet(ws_combined, [data1, data2], [diff1, diff2], [1, 5])
     
     # Sheet 2: Table1
     ws_t1 = wb.create_sheet(title="Table1")
-    _write_sheet(ws_t1, [data1], [diff1], [1])
+    write_sheet(ws_t1, [data1], [diff1], [1])
     
     # Sheet 3: Table2
     ws_t2 = wb.create_sheet(title="Table2")
-    _write_sheet(ws_t2, [data2], [diff2], [1])
+    write_sheet(ws_t2, [data2], [diff2], [1])
+
+    # Sheet 4: Composition (완제품 기준 INCI 조성 비교)
+    ws_comp = wb.create_sheet(title="Composition")
+    comp_diffs = compare_compositions(roll_up_composition(data1), roll_up_composition(data2))
+    _write_composition_sheet(ws_comp, comp_diffs)
+
+    # Sheet 5: Limit Check (사용한도 초과 성분)
+    ws_limit = wb.create_sheet(title="Limit Check")
+    _write_limit_sheet(ws_limit, [("Table1", violations1), ("Table2", violations2)])
+
+    wb.save(output_path)
+    return Path(output_path)
+
+
+@profiled("export_nway")
+def export_nway_report(output_path: str, result) -> Path:
+    """
+    N-way 비교 결과(NWayResult)를 엑셀로 내보냅니다.
+    - Consensus: 공유 인덱스 전체 + 소스별 함량 (누락: 빨간 배경, 함량 차이: 빨간 글씨, 단독 항목: 주황 배경)
+    - Deviations: 소스별 차이 목록
+    """
+    from openpyxl.utils import get_column_letter
+    from app.utils.nway import DEVIATION_MISSING, DEVIATION_EXTRA, DEVIATION_VALUE
+
+    RED_FONT = Font(color="FF0000")
+    RED_BG_FILL = PatternFill(start_color="FFC8C8", end_color="FFC8C8", fill_type="solid")
+    ORANGE_BG_FILL = PatternFill(start_color=AppColors.BG_ORANGE_HEX, end_color=AppColors.BG_ORANGE_HEX, fill_type="solid")
+    CENTER_ALIGN = Alignment(horizontal='center', vertical='center')
+    BOLD_FONT = Font(bold=True)
+
+    wb = Workbook()
+
+    # Sheet 1: Consensus
+    ws = wb.active
+    ws.title = "Consensus"
+    headers = ["RM", "INCI", "Consensus %", *result.sources]
+    for col_idx, header in enumerate(headers, start=1):
+        cell = ws.cell(row=1, column=col_idx, value=header)
+        cell.alignment = CENTER_ALIGN
+        cell.font = BOLD_FONT
+        ws.column_dimensions[get_column_letter(col_idx)].width = 50 if col_idx <= 2 else 15
+
+    deviation_map = {}
+    for d in result.deviations:
+        deviation_map[(d.rm_name, d.inci_name, d.source_index)] = d.kind
+
+    for i, entry in enumerate(result.entries):
+        row_idx = i + 2
+        consensus = _try_float(entry.consensus_value) if entry.consensus_present else ""
+        ws.cell(row=row_idx, column=1, value=entry.rm_name).alignment = CENTER_ALIGN
+        ws.cell(row=row_idx, column=2, value=entry.inci_name).alignment = CENTER_ALIGN
+        ws.cell(row=row_idx, column=3, value=consensus).alignment = CENTER_ALIGN
+
+        for source_index in range(len(result.sources)):
+            cell = ws.cell(row=row_idx, column=4 + source_index,
+                           value=_try_float(entry.values.get(source_index, "")))
+            cell.alignment = CENTER_ALIGN
+
+            kind = deviation_map.get((entry.rm_name, entry.inci_name, source_index))
+            if kind == DEVIATION_MISSING:
+                cell.fill = RED_BG_FILL
+            elif kind == DEVIATION_VALUE:
+                cell.font = RED_FONT
+            elif kind == DEVIATION_EXTRA:
+                cell.fill = ORANGE_BG_FILL
+
+    # Sheet 2: Deviations
+    ws_dev = wb.create_sheet(title="Deviations")
+    dev_headers = ("Source", "RM", "INCI", "Type", "Value", "Consensus")
+    for col_idx, header in enumerate(dev_headers, start=1):
+        cell = ws_dev.cell(row=1, column=col_idx, value=header)
+        cell.alignment = CENTER_ALIGN
+        cell.font = BOLD_FONT
+    for col_letter, width in zip("ABCDEF", (25, 50, 50, 12, 15, 15)):
+        ws_dev.column_dimensions[col_letter].width = width
+
+    for i, d in enumerate(result.deviations):
+        values = (result.sources[d.source_index], d.rm_name, d.inci_name, d.kind,
+                  _try_float(d.value), _try_float(d.consensus_value))
+        for col_idx, value in enumerate(values, start=1):
+            ws_dev.cell(row=i + 2, column=col_idx, value=value).alignment = CENTER_ALIGN
 
     wb.save(output_path)
     return Path(output_path)
@@ -197,6 +522,7 @@ def _try_float(value: str):
         return value
 
 
+@profiled("export_comparison")
 def export_comparison_table(table, file_path: str):
     """
     QTableWidget의 내용을 엑셀로 내보냅니다.
@@ -207,8 +533,11 @@ def export_comparison_table(table, file_path: str):
     ws = wb.active
     ws.title = "Comparison Result"
     
-    # Headers
-    headers = ["A열 성분", "B열 성분"]
+    # Headers (성분명 비교 2열 / 함량 비교 4열)
+    headers = [
+        table.horizontalHeaderItem(c).text() if table.horizontalHeaderItem(c) else ""
+        for c in range(table.columnCount())
+    ]
     for col, header in enumerate(headers, 1):
         ws.cell(row=1, column=col, value=header)
     
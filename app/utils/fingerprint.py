@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from hashlib import blake2b
+from app.utils.normalizer import normalize_text
+
+DIGEST_SIZE = 16
+
+
+@dataclass(frozen=True)
+class GroupFingerprint:
+    """RM 그룹 한 개의 내용 해시와 테이블 내 행 위치"""
+    rm_key: str
+    rows: tuple[int, ...]
+    digest: bytes
+
+
+@dataclass(frozen=True)
+class TableFingerprint:
+    """테이블 전체 해시(정렬된 그룹 해시의 루트)와 그룹별 해시"""
+    root: bytes
+    groups: dict[str, GroupFingerprint]
+
+    def same_as(self, other: "TableFingerprint | None") -> bool:
+        return other is not None and self.root == other.root
+
+
+def _percent_token(value: Decimal | None, raw: str) -> str:
+    """비교 기준과 동일하게 숫자는 값으로, 숫자가 아니면 정규화 문자열로 표현"""
+    if value is not None:
+        return f"n:{value}"
+    return f"s:{normalize_text(raw)}"
+
+
+def hash_group(rm_key: str, rm_percent: Decimal | None, rm_percent_raw: str, incis: dict) -> bytes:
+    """
+    RM 그룹 내용 해시.
+    incis: inci_key -> {"percent": 원본 문자열, "percent_value": Decimal | None, ...}
+    INCI는 키 순으로 정렬하여 행 순서와 무관하게 같은 내용이면 같은 해시가 나옵니다.
+    """
+    h = blake2b(digest_size=DIGEST_SIZE)
+    h.update(rm_key.encode("utf-8"))
+    h.update(b"\x1f")
+    h.update(_percent_token(rm_percent, rm_percent_raw).encode("utf-8"))
+    for inci_key in sorted(incis):
+        info = incis[inci_key]
+        h.update(b"\x1e")
+        h.update(inci_key.encode("utf-8"))
+        h.update(b"\x1f")
+        h.update(_percent_token(info["percent_value"], info["percent"]).encode("utf-8"))
+    return h.digest()
+
+
+def root_hash(groups) -> bytes:
+    """(rm_key, digest) 목록을 RM 키 순으로 정렬하여 루트 해시를 계산합니다."""
+    h = blake2b(digest_size=DIGEST_SIZE)
+    for rm_key, digest in sorted(groups):
+        h.update(rm_key.encode("utf-8"))
+        h.update(b"\x1f")
+        h.update(digest)
+    return h.digest()
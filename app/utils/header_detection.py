@@ -0,0 +1,286 @@
+import json
+import os
+import re
+from dataclasses import dataclass
+from hashlib import blake2b
+from pathlib import Path
+from typing import Iterable, Sequence
+from app.utils.normalizer import normalize_key
+from app.utils.resources import user_data_dir
+
+MAPPING_CACHE_FILE_NAME = "header_mappings.json"
+
+# 헤더 행을 찾을 때 살펴보는 시트 앞부분 행 수
+SNIFF_ROWS = 20
+
+# 같은 시그니처(시트 구성)에 보관하는 레이아웃 수 / 시그니처 수
+MAX_LAYOUTS_PER_SIGNATURE = 8
+MAX_SIGNATURES = 512
+
+RM, RM_PERCENT, INCI, INCI_PERCENT = range(4)
+MISSING = -1
+
+# 필드별 헤더 동의어 (_header_key로 정규화한 값)
+FIELD_SYNONYMS = {
+    RM: ("rm", "rmname", "rawmaterial", "rawmaterialname", "tradename", "material", "원료", "원료명", "원료이름", "상품명"),
+    RM_PERCENT: ("%rm/fp", "rm%", "%rm", "rm/fp%", "rmpercent", "rmconc%", "원료함량", "원료함량%", "배합비", "배합비%", "배합량"),
+    INCI: ("inci", "inciname", "ingredient", "ingredientname", "성분", "성분명", "전성분", "전성분명", "inci명"),
+    INCI_PERCENT: ("%inci/rm", "inci%", "%inci", "inci/rm%", "incipercent", "성분함량", "성분함량%", "조성비", "조성비%"),
+}
+# 어느 함량인지 알 수 없는 헤더: INCI 열 앞이면 % RM/FP, 뒤면 % INCI/RM
+GENERIC_PERCENT = ("%", "conc%", "conc", "concentration", "concentration%", "content", "content%",
+                   "percent", "percentage", "wt%", "w/w%", "함량", "함량%", "비율", "비율%")
+
+# 템플릿 시트 이름 (Table1, Table2, ...)
+TABLE_SHEET_PATTERN = re.compile(r"^Table(\d+)$")
+
+# 합계 행 (공급사 시트 마지막의 "Total 100" 등)
+TOTAL_KEYS = ("total", "sum", "합계", "총계")
+
+_HEADER_KEY_RE = re.compile(r"[\s.\-_()\[\]:]+")
+
+
+def _header_key(value) -> str:
+    """'Conc. %' -> 'conc%', 'INCI Name' -> 'inciname', '% INCI/RM' -> '%inci/rm'"""
+    if not isinstance(value, str):
+        return ""
+    return _HEADER_KEY_RE.sub("", normalize_key(value))
+
+
+_FIELD_OF = {key: field for field, keys in FIELD_SYNONYMS.items() for key in keys}
+_TEMPLATE_KEYS = ("rm", "%rm/fp", "inci", "%inci/rm")
+
+
+@dataclass(frozen=True)
+class ColumnMapping:
+    """
+    시트의 헤더 위치와 네 필드(RM, % RM/FP, INCI, % INCI/RM)의 열 번호(0부터, 없으면 MISSING)
+
+    header: 매핑된 열의 헤더 원문 (캐시된 매핑이 여전히 맞는지 확인할 때 사용)
+    RM 열이 없는 시트(INCI 목록)는 INCI 하나를 원료 하나(INCI/RM 100%)로 읽습니다.
+    """
+    header_row: int = 1  # 1부터
+    columns: tuple[int, int, int, int] = (0, 1, 2, 3)
+    header: tuple[str, ...] = ()
+
+    @property
+    def is_template(self) -> bool:
+        """템플릿 양식 그대로 (기존 불러오기와 같이 값 행을 그대로 사용)"""
+        return (
+            self.header_row == 1 and self.columns == (0, 1, 2, 3)
+            and tuple(_header_key(text) for text in self.header) == _TEMPLATE_KEYS
+        )
+
+    @property
+    def data_row(self) -> int:
+        return self.header_row + 1
+
+    def to_dict(self) -> dict:
+        return {"header_row": self.header_row, "columns": list(self.columns), "header": list(self.header)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ColumnMapping":
+        return cls(int(data["header_row"]), tuple(data["columns"]), tuple(data.get("header", ())))
+
+    def matches_header(self, row: Sequence) -> bool:
+        """row(헤더 행 값)가 이 매핑을 학습할 때의 헤더와 같은지"""
+        cells = [row[c] if 0 <= c < len(row) else None for c in self.columns if c != MISSING]
+        return tuple(_header_key(cell) for cell in cells) == tuple(_header_key(text) for text in self.header)
+
+
+TEMPLATE_MAPPING = ColumnMapping(1, (0, 1, 2, 3), ("RM", "% RM/FP", "INCI", "% INCI/RM"))
+
+
+def _map_header_row(row: Sequence) -> tuple[int, int, int, int] | None:
+    """한 행을 헤더로 보고 필드별 열 번호를 찾습니다. 헤더로 볼 수 없으면 None"""
+    columns = [MISSING] * 4
+    generic = []
+    for col, value in enumerate(row):
+        key = _header_key(value)
+        if not key:
+            continue
+        field = _FIELD_OF.get(key)
+        if field is not None:
+            if columns[field] == MISSING:
+                columns[field] = col
+        elif key in GENERIC_PERCENT:
+            generic.append(col)
+
+    if columns[INCI] == MISSING:
+        return None
+    for col in generic:
+        field = RM_PERCENT if col < columns[INCI] and columns[RM] != MISSING else INCI_PERCENT
+        if columns[field] == MISSING:
+            columns[field] = col
+
+    # INCI 외에 최소 한 필드 (제목 행의 '성분' 한 칸 등은 헤더가 아님)
+    # RM 열이 없으면 INCI 함량 열이 있어야 읽을 수 있음
+    if sum(c != MISSING for c in columns) < 2:
+        return None
+    if columns[RM] == MISSING and columns[INCI_PERCENT] == MISSING:
+        return None
+    return tuple(columns)
+
+
+def detect_header(rows: Iterable[Sequence], max_rows: int = SNIFF_ROWS) -> ColumnMapping | None:
+    """
+    시트 앞부분 행들에서 헤더 행을 찾아 ColumnMapping을 만듭니다.
+    매핑되는 필드가 가장 많은 행(같으면 위쪽)을 헤더로 봅니다. 없으면 None
+    """
+    best = None
+    best_count = 0
+    for row_idx, row in enumerate(rows, start=1):
+        if row_idx > max_rows:
+            break
+        row = tuple(row)
+        if row_idx == 1 and tuple(_header_key(v) for v in row[:4]) == _TEMPLATE_KEYS:
+            return TEMPLATE_MAPPING
+        columns = _map_header_row(row)
+        if columns is None:
+            continue
+        count = sum(c != MISSING for c in columns)
+        if count > best_count:
+            header = tuple("" if row[c] is None else str(row[c]) for c in columns if c != MISSING)
+            best = ColumnMapping(row_idx, columns, header)
+            best_count = count
+            if count == 4:
+                break
+    return best
+
+
+def _is_total(value) -> bool:
+    return _header_key(value) in TOTAL_KEYS if isinstance(value, str) else False
+
+
+def mapped_values(rows: Iterable[Sequence], mapping: ColumnMapping) -> Iterable[Sequence]:
+    """
+    데이터 행(헤더 다음 행부터)을 (RM, % RM/FP, INCI, % INCI/RM) 순서의 값 행으로 바꿉니다.
+    템플릿 배치는 그대로 통과시킵니다. (rows_from_values로 Fill-down)
+    """
+    if mapping.is_template:
+        yield from rows
+        return
+
+    rm_col = mapping.columns[RM]
+    for row in rows:
+        values = tuple(row[c] if 0 <= c < len(row) else None for c in mapping.columns)
+        if rm_col == MISSING:
+            # INCI 목록: INCI 하나 = 원료 하나 (원료 함량 = INCI 함량, INCI/RM 100%)
+            inci, inci_pct = values[INCI], values[INCI_PERCENT]
+            if inci is None or str(inci).strip() == "" or _is_total(inci):
+                continue
+            yield inci, inci_pct, inci, 100
+            continue
+        if _is_total(values[RM]) or (values[RM] is None and _is_total(values[INCI])):
+            continue
+        yield values
+
+
+def table_sheet_names(sheet_names: list[str]) -> list[str]:
+    """TableN 형식의 시트 이름을 번호 순으로"""
+    matched = [name for name in sheet_names if TABLE_SHEET_PATTERN.match(name)]
+    return sorted(matched, key=lambda name: int(TABLE_SHEET_PATTERN.match(name).group(1)))
+
+
+def resolve_sources(available: list[str], layout: dict[str, ColumnMapping],
+                    sheet_names: list[str] | None) -> dict[str, tuple[str, ColumnMapping] | None]:
+    """
+    요청한 시트 이름 -> (읽을 시트 이름, ColumnMapping). 읽을 시트가 없으면 None
+    - available: 파일의 시트 이름 (파일 순서), layout: 헤더가 감지된 시트의 매핑
+    - 요청한 이름의 시트가 있으면 그 시트 (헤더를 찾지 못하면 템플릿 배치)
+    - TableN 시트가 하나도 없으면 헤더가 감지된 시트를 순서대로 TableN에 대응
+    - sheet_names가 None이면 TableN 시트 전체 (없으면 감지된 시트 수만큼 Table1..TableN)
+    """
+    template_names = table_sheet_names(available)
+    detected = [name for name in available if name in layout and not TABLE_SHEET_PATTERN.match(name)]
+    if sheet_names is None:
+        sheet_names = template_names or [f"Table{i}" for i in range(1, len(detected) + 1)]
+
+    sources = {}
+    for name in sheet_names:
+        match = TABLE_SHEET_PATTERN.match(name)
+        if name in available:
+            sources[name] = (name, layout.get(name, TEMPLATE_MAPPING))
+        elif not template_names and match and 0 < int(match.group(1)) <= len(detected):
+            source = detected[int(match.group(1)) - 1]
+            sources[name] = (source, layout[source])
+        else:
+            sources[name] = None
+    return sources
+
+
+# ----------------------------------------------------------------------
+# 학습된 매핑 캐시 (시트 구성별)
+# ----------------------------------------------------------------------
+def workbook_signature(sheet_names: list[str], widths: Sequence[int] = ()) -> str:
+    """
+    공급사 파일 시그니처: 시트 수, 시트 이름, 시트별 열 수 (같은 양식의 다른 파일도 같은 값)
+    행 수는 파일마다 다르므로 넣지 않습니다.
+    """
+    parts = [str(len(sheet_names)), *sheet_names, *map(str, widths)]
+    return blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class HeaderMappingCache:
+    """
+    시그니처 -> 학습된 레이아웃 목록 (최근 사용 순)
+    레이아웃: {"mappings": {시트 이름: ColumnMapping}, "headerless": [헤더가 없던 시트 이름]}
+
+    같은 시그니처라도 헤더가 다를 수 있으므로(예: 'Sheet1'만 있는 파일) 사용 전에
+    각 시트의 헤더 행만 읽어 학습할 때의 헤더와 같은지 확인합니다.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path else user_data_dir() / MAPPING_CACHE_FILE_NAME
+        self._data = self._read()
+
+    def _read(self) -> dict:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if isinstance(data, dict):
+                return data
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _write(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(self._data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def layouts(self, signature: str) -> list[tuple[dict[str, ColumnMapping], list[str]]]:
+        """학습된 (매핑, 헤더가 없던 시트 이름 목록) 목록 (최근 사용 순, 읽을 수 없는 항목은 건너뜀)"""
+        layouts = []
+        for entry in self._data.get(signature, []):
+            try:
+                mappings = {name: ColumnMapping.from_dict(m) for name, m in entry["mappings"].items()}
+                layouts.append((mappings, list(entry["headerless"])))
+            except (KeyError, TypeError, ValueError, AttributeError):
+                continue
+        return layouts
+
+    def remember(self, signature: str, layout: dict[str, ColumnMapping], headerless: list[str]):
+        encoded = {
+            "mappings": {name: mapping.to_dict() for name, mapping in layout.items()},
+            "headerless": list(headerless),
+        }
+        entries = [e for e in self._data.pop(signature, []) if e != encoded]
+        self._data[signature] = [encoded] + entries[:MAX_LAYOUTS_PER_SIGNATURE - 1]
+        # 오래된 시그니처부터 삭제 (dict는 삽입 순서 유지)
+        for old in list(self._data)[:-MAX_SIGNATURES]:
+            del self._data[old]
+        try:
+            self._write()
+        except OSError as e:
+            print(f"Header Mapping Cache Error: {e}")
+
+
+_default_cache: HeaderMappingCache | None = None
+
+
+def get_mapping_cache() -> HeaderMappingCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = HeaderMappingCache()
+    return _default_cache
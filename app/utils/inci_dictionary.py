@@ -0,0 +1,104 @@
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from app.utils.normalizer import normalize_key, normalize_text
+from app.utils.resources import data_path
+
+DICTIONARY_FILE_NAME = "inci_dictionary.tsv"
+
+
+class InciDictionary:
+    """
+    동의어/한글명/CAS No. -> 표준 INCI명 사전.
+
+    조회 키는 정렬된 리스트(keys)로, 대상 표준명은 인덱스 배열(targets)로 보관하여
+    이진 탐색(O(log n))으로 조회합니다.
+    """
+
+    def __init__(self, keys: list[str], targets: array, canonical_names: list[str]):
+        self._keys = keys
+        self._targets = targets
+        self._canonical_names = canonical_names
+
+    def __len__(self):
+        return len(self._keys)
+
+    def lookup(self, name: str) -> str | None:
+        """사전에 등록된 이름이면 표준 INCI명을, 아니면 None을 반환합니다."""
+        if not name:
+            return None
+        key = normalize_key(name)
+        idx = bisect_left(self._keys, key)
+        if idx < len(self._keys) and self._keys[idx] == key:
+            return self._canonical_names[self._targets[idx]]
+        return None
+
+    def canonicalize(self, name: str) -> str:
+        """표준 INCI명으로 변환합니다. 사전에 없으면 정규화된 입력값을 반환합니다."""
+        canonical = self.lookup(name)
+        if canonical is not None:
+            return canonical
+        return normalize_text(name)
+
+
+def load_inci_dictionary(path: str | Path | None = None) -> InciDictionary:
+    """
+    TSV 사전 파일을 읽어 InciDictionary를 생성합니다.
+
+    Format: <표준 INCI명>\t<동의어1>|<동의어2>|...  ('#'으로 시작하는 줄은 주석)
+    같은 키가 여러 표준명에 등록된 경우 먼저 나온 항목이 우선합니다.
+    """
+    dictionary_path = Path(path) if path else data_path(DICTIONARY_FILE_NAME)
+
+    canonical_names: list[str] = []
+    entries: dict[str, int] = {}
+
+    with open(dictionary_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+
+            canonical, _, aliases = line.partition("\t")
+            canonical = canonical.strip()
+            if not canonical:
+                continue
+
+            target = len(canonical_names)
+            canonical_names.append(canonical)
+
+            for alias in [canonical, *aliases.split("|")]:
+                key = normalize_key(alias)
+                if key and key not in entries:
+                    entries[key] = target
+
+    keys = sorted(entries)
+    targets = array("H", (entries[k] for k in keys))
+    return InciDictionary(keys, targets, canonical_names)
+
+
+# 지연 로딩: 최초 조회 시점에 한 번만 파일을 읽습니다. (앱 시작 속도에 영향 없음)
+_default_dictionary: InciDictionary | None = None
+
+
+def get_inci_dictionary() -> InciDictionary:
+    """기본 번들 사전을 반환합니다. (최초 호출 시 로드)"""
+    global _default_dictionary
+    if _default_dictionary is None:
+        try:
+            _default_dictionary = load_inci_dictionary()
+        except OSError as e:
+            # 사전 파일이 없어도 비교 기능 자체는 동작해야 함
+            print(f"INCI Dictionary Load Error: {e}")
+            _default_dictionary = InciDictionary([], array("H"), [])
+    return _default_dictionary
+
+
+def canonical_inci(name: str) -> str:
+    """성분명을 표준 INCI명으로 변환합니다. (표시용)"""
+    return get_inci_dictionary().canonicalize(name)
+
+
+def canonical_inci_key(name: str) -> str:
+    """비교/인덱싱용 키: 표준 INCI명의 정규화 키"""
+    return normalize_key(canonical_inci(name))
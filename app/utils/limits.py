@@ -0,0 +1,158 @@
+import csv
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from app.models import DiffType, DiffItem, IngredientRow
+from app.utils.composition import roll_up_composition
+from app.utils.inci_dictionary import canonical_inci, canonical_inci_key
+from app.utils.resources import data_path
+
+LIMITS_FILE_NAME = "concentration_limits.json"
+
+# 부동소수점 합산 오차로 인한 오탐 방지 (%p)
+LIMIT_EPSILON = 1e-9
+
+
+@dataclass(frozen=True)
+class ConcentrationLimit:
+    """사용 제한 원료 한 건 (완제품 기준 최대 함량)"""
+    inci_name: str
+    max_percent: float
+    category: str = ""
+    note: str = ""
+
+
+@dataclass
+class LimitViolation:
+    """사용한도 초과 성분"""
+    inci_name: str
+    percent: float      # 완제품 기준 계산 함량
+    max_percent: float
+    category: str
+    note: str
+
+
+class LimitTable:
+    """표준 INCI 키로 인덱싱된 사용한도 테이블"""
+
+    def __init__(self, limits: list[ConcentrationLimit]):
+        self._limits: dict[str, ConcentrationLimit] = {}
+        for limit in limits:
+            # 같은 성분이 여러 번 등록되면 가장 엄격한 한도를 사용
+            key = canonical_inci_key(limit.inci_name)
+            current = self._limits.get(key)
+            if current is None or limit.max_percent < current.max_percent:
+                self._limits[key] = limit
+
+    def __len__(self):
+        return len(self._limits)
+
+    def get(self, inci_key: str) -> ConcentrationLimit | None:
+        return self._limits.get(inci_key)
+
+
+def _read_limits_json(path: Path) -> list[ConcentrationLimit]:
+    with open(path, encoding="utf-8") as f:
+        payload = json.load(f)
+
+    records = payload.get("limits", []) if isinstance(payload, dict) else payload
+    return [
+        ConcentrationLimit(
+            inci_name=canonical_inci(str(rec["inci"])),
+            max_percent=float(rec["max_percent"]),
+            category=str(rec.get("category", "")),
+            note=str(rec.get("note", "")),
+        )
+        for rec in records
+    ]
+
+
+def _read_limits_csv(path: Path) -> list[ConcentrationLimit]:
+    """CSV 헤더: inci, max_percent[, category, note]"""
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return [
+            ConcentrationLimit(
+                inci_name=canonical_inci(rec["inci"]),
+                max_percent=float(rec["max_percent"]),
+                category=rec.get("category") or "",
+                note=rec.get("note") or "",
+            )
+            for rec in csv.DictReader(f)
+            if rec.get("inci")
+        ]
+
+
+@lru_cache(maxsize=8)
+def _load_limit_table_cached(path_str: str, mtime_ns: int, size: int) -> LimitTable:
+    """파일 경로 + 수정 시각 + 크기를 키로 전처리 결과를 캐시합니다."""
+    path = Path(path_str)
+    if path.suffix.lower() == ".csv":
+        limits = _read_limits_csv(path)
+    else:
+        limits = _read_limits_json(path)
+    return LimitTable(limits)
+
+
+def load_limit_table(path: str | Path | None = None) -> LimitTable:
+    """
+    사용한도 테이블(JSON/CSV)을 읽어 LimitTable을 반환합니다.
+    파일이 바뀌지 않았다면 캐시된 테이블을 재사용합니다.
+    """
+    limits_path = Path(path) if path else data_path(LIMITS_FILE_NAME)
+    stat = limits_path.stat()
+    return _load_limit_table_cached(str(limits_path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+def get_default_limit_table() -> LimitTable:
+    """번들 사용한도 테이블을 반환합니다. 파일을 읽을 수 없으면 빈 테이블을 반환합니다."""
+    try:
+        return load_limit_table()
+    except (OSError, ValueError, KeyError) as e:
+        # 사용한도 파일이 없어도 비교 기능 자체는 동작해야 함
+        print(f"Limit Table Load Error: {e}")
+        return LimitTable([])
+
+
+def find_limit_violations(data_list: list[IngredientRow],
+                          limit_table: LimitTable | None = None) -> list[LimitViolation]:
+    """완제품 기준 INCI 함량을 계산하여 사용한도를 초과한 성분을 찾습니다."""
+    if limit_table is None:
+        limit_table = get_default_limit_table()
+
+    violations = []
+    for entry in roll_up_composition(data_list):
+        limit = limit_table.get(canonical_inci_key(entry.inci_name))
+        if limit and entry.percent > limit.max_percent + LIMIT_EPSILON:
+            violations.append(LimitViolation(
+                inci_name=entry.inci_name,
+                percent=entry.percent,
+                max_percent=limit.max_percent,
+                category=limit.category,
+                note=limit.note,
+            ))
+    return violations
+
+
+def limit_diff_report(data_list: list[IngredientRow], violations: list[LimitViolation]) -> list[DiffItem]:
+    """사용한도 초과 성분이 포함된 모든 행의 INCI 셀에 LIMIT_EXCEEDED 스타일을 지정합니다."""
+    if not violations:
+        return []
+
+    exceeded = {canonical_inci_key(v.inci_name) for v in violations}
+    return [
+        DiffItem(i, 2, DiffType.LIMIT_EXCEEDED)
+        for i, row in enumerate(data_list)
+        if row.inci_name and canonical_inci_key(row.inci_name) in exceeded
+    ]
+
+
+def check_formulas_batch(formulas, limit_table: LimitTable | None = None) -> list[tuple[str, list[LimitViolation]]]:
+    """
+    여러 처방을 한 번에 검사합니다.
+    formulas: (이름, IngredientRow 리스트) 의 iterable
+    사용한도 테이블은 한 번만 로드하여 모든 처방에 재사용합니다.
+    """
+    if limit_table is None:
+        limit_table = get_default_limit_table()
+    return [(name, find_limit_violations(rows, limit_table)) for name, rows in formulas]
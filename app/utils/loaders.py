@@ -0,0 +1,270 @@
+import csv
+import json
+from itertools import chain, islice
+from pathlib import Path
+from typing import Callable, Sequence
+from app.models import IngredientRow
+from app.utils.header_detection import (
+    TEMPLATE_MAPPING, SNIFF_ROWS, detect_header, mapped_values, resolve_sources
+)
+from app.utils.row_reader import rows_from_values
+from app.utils.profiling import span
+
+# 확장자 -> loader(file_path, sheet_names) -> {시트명: IngredientRow 리스트}
+LOADERS: dict[str, Callable[[str, list[str] | None], dict[str, list[IngredientRow]]]] = {}
+
+# 시트가 하나뿐인 형식(CSV/TSV)의 테이블 이름
+SINGLE_TABLE_NAME = "Table1"
+
+# CSV 인코딩 (Excel의 "CSV UTF-8" -> BOM, 한글 Windows의 "CSV" -> CP949)
+CSV_ENCODINGS = ("utf-8-sig", "cp949")
+
+# JSONL 행에서 테이블 이름을 나타내는 키
+JSONL_TABLE_KEYS = ("table", "sheet")
+
+
+def register_loader(*suffixes: str):
+    """확장자별 불러오기 함수를 등록합니다. (데코레이터)"""
+    def decorator(func):
+        for suffix in suffixes:
+            LOADERS[suffix.lower()] = func
+        return func
+    return decorator
+
+
+def supported_suffixes() -> tuple[str, ...]:
+    return tuple(LOADERS)
+
+
+def file_dialog_filter() -> str:
+    patterns = " ".join(f"*{suffix}" for suffix in LOADERS)
+    return f"Formula Files ({patterns});;Excel Files (*.xlsx *.xlsm);;CSV Files (*.csv *.tsv);;All Files (*)"
+
+
+def loader_for(file_path: str | Path):
+    suffix = Path(file_path).suffix.lower()
+    try:
+        return LOADERS[suffix]
+    except KeyError:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {suffix or Path(file_path).name}") from None
+
+
+def load_tables(file_path: str, sheet_names: list[str] | None = None) -> dict[str, list[IngredientRow]]:
+    """
+    파일 형식(확장자)에 맞는 백엔드로 여러 테이블을 읽습니다.
+    모든 백엔드는 같은 규칙(헤더 감지, RM Fill-down)으로 IngredientRow를 만듭니다.
+    sheet_names가 None이면 파일의 모든 테이블(TableN)을 읽습니다.
+    """
+    return loader_for(file_path)(str(file_path), sheet_names)
+
+
+def _tables_from_sheets(sheets: dict[str, list[Sequence]], sheet_names: list[str] | None) -> dict[str, list[IngredientRow]]:
+    """메모리에 읽은 시트 값 행들(헤더 포함)을 엑셀 불러오기와 같은 규칙으로 변환합니다."""
+    layout = {}
+    for name, rows in sheets.items():
+        mapping = detect_header(rows)
+        if mapping is not None:
+            layout[name] = mapping
+
+    tables = {}
+    for name, source in resolve_sources(list(sheets), layout, sheet_names).items():
+        if source is None:
+            tables[name] = []
+            continue
+        sheet, mapping = source
+        tables[name] = rows_from_values(mapped_values(islice(sheets[sheet], mapping.header_row, None), mapping))
+    return tables
+
+
+def _single_table(rows: list[IngredientRow], sheet_names: list[str] | None) -> dict[str, list[IngredientRow]]:
+    return {name: rows if name == SINGLE_TABLE_NAME else [] for name in sheet_names or [SINGLE_TABLE_NAME]}
+
+
+# ----------------------------------------------------------------------
+# Excel (openpyxl)
+# ----------------------------------------------------------------------
+@register_loader(".xlsx", ".xlsm")
+def _load_excel(file_path: str, sheet_names: list[str] | None) -> dict[str, list[IngredientRow]]:
+    from app.utils.excel_handler import load_tables_from_excel
+
+    return load_tables_from_excel(file_path, sheet_names)
+
+
+# ----------------------------------------------------------------------
+# CSV / TSV (csv 모듈, 한 줄씩 스트리밍)
+# ----------------------------------------------------------------------
+def _load_delimited(file_path: str, sheet_names: list[str] | None, delimiter: str) -> dict[str, list[IngredientRow]]:
+    """파일 하나 = 테이블 하나(Table1). 앞부분에서 헤더를 감지하고 나머지 줄은 읽는 대로 변환합니다."""
+    with span("parse", file=Path(file_path).name, format="csv") as s:
+        for encoding in CSV_ENCODINGS:
+            try:
+                with open(file_path, newline="", encoding=encoding) as f:
+                    reader = csv.reader(f, delimiter=delimiter)
+                    head = list(islice(reader, SNIFF_ROWS))
+                    mapping = detect_header(head) or TEMPLATE_MAPPING
+                    rows = rows_from_values(mapped_values(chain(head[mapping.header_row:], reader), mapping))
+                break
+            except UnicodeDecodeError:
+                if encoding == CSV_ENCODINGS[-1]:
+                    raise
+        s.set(rows=len(rows), encoding=encoding)
+    return _single_table(rows, sheet_names)
+
+
+@register_loader(".csv")
+def _load_csv(file_path: str, sheet_names: list[str] | None) -> dict[str, list[IngredientRow]]:
+    return _load_delimited(file_path, sheet_names, ",")
+
+
+@register_loader(".tsv", ".tab")
+def _load_tsv(file_path: str, sheet_names: list[str] | None) -> dict[str, list[IngredientRow]]:
+    return _load_delimited(file_path, sheet_names, "\t")
+
+
+# ----------------------------------------------------------------------
+# JSON / JSONL
+# ----------------------------------------------------------------------
+def _json_rows(records: list) -> list[Sequence]:
+    """
+    JSON 레코드 목록 -> 값 행 목록 (헤더 포함)
+    - 객체: 키가 헤더 ({"rm": ..., "rm_percent": ..., "inci": ..., "inci_percent": ...} 등)
+    - 배열: 시트와 같이 첫 행이 헤더
+    """
+    if not records or not isinstance(records[0], dict):
+        return records
+
+    keys = {}
+    for record in records:
+        if not isinstance(record, dict):
+            raise ValueError("JSON 테이블에 객체와 배열이 섞여 있습니다.")
+        keys.update(dict.fromkeys(record))
+    header = tuple(keys)
+    return [header] + [tuple(record.get(key) for key in header) for record in records]
+
+
+@register_loader(".json")
+def _load_json(file_path: str, sheet_names: list[str] | None) -> dict[str, list[IngredientRow]]:
+    """{"Table1": [...], "Table2": [...]} 또는 [...] (Table1)"""
+    with span("parse", file=Path(file_path).name, format="json") as s:
+        with open(file_path, encoding="utf-8-sig") as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            data = {SINGLE_TABLE_NAME: data}
+        if not isinstance(data, dict) or not all(isinstance(v, list) for v in data.values()):
+            raise ValueError("JSON 형식이 올바르지 않습니다. {\"Table1\": [...]} 또는 [...] 형식이어야 합니다.")
+        tables = _tables_from_sheets({str(name): _json_rows(records) for name, records in data.items()}, sheet_names)
+        s.set(rows=sum(len(rows) for rows in tables.values()))
+    return tables
+
+
+@register_loader(".jsonl", ".ndjson")
+def _load_jsonl(file_path: str, sheet_names: list[str] | None) -> dict[str, list[IngredientRow]]:
+    """한 줄에 레코드 하나. "table" 키가 있으면 테이블별로 나눔 (없으면 Table1)"""
+    with span("parse", file=Path(file_path).name, format="jsonl") as s:
+        records: dict[str, list] = {}
+        with open(file_path, encoding="utf-8-sig") as f:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"JSONL {line_no}행을 읽을 수 없습니다: {e}") from None
+                table = SINGLE_TABLE_NAME
+                if isinstance(record, dict):
+                    for key in JSONL_TABLE_KEYS:
+                        if key in record:
+                            table = str(record.pop(key))
+                            break
+                records.setdefault(table, []).append(record)
+        tables = _tables_from_sheets({name: _json_rows(rows) for name, rows in records.items()}, sheet_names)
+        s.set(rows=sum(len(rows) for rows in tables.values()))
+    return tables
+
+
+# ----------------------------------------------------------------------
+# ODS (OpenDocument, 표준 라이브러리로 content.xml을 스트리밍 파싱)
+# ----------------------------------------------------------------------
+_ODS_TABLE = "{urn:oasis:names:tc:opendocument:xmlns:table:1.0}"
+_ODS_OFFICE = "{urn:oasis:names:tc:opendocument:xmlns:office:1.0}"
+_ODS_TEXT = "{urn:oasis:names:tc:opendocument:xmlns:text:1.0}"
+_ODS_NUMERIC_TYPES = ("float", "percentage", "currency")
+_ODS_VALUE_ATTRS = {"boolean": "boolean-value", "date": "date-value", "time": "time-value"}
+
+
+def _ods_number(text: str):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _ods_cell_value(cell):
+    value_type = cell.get(_ODS_OFFICE + "value-type")
+    if value_type in _ODS_NUMERIC_TYPES:
+        return _ods_number(cell.get(_ODS_OFFICE + "value"))
+    if value_type in _ODS_VALUE_ATTRS:
+        return cell.get(_ODS_OFFICE + _ODS_VALUE_ATTRS[value_type])
+    paragraphs = ["".join(p.itertext()) for p in cell.iter(_ODS_TEXT + "p")]
+    return "\n".join(paragraphs) if paragraphs else None
+
+
+def read_ods_values(file_path: str) -> dict[str, list[tuple]]:
+    """
+    ODS 파일의 시트별 값 행 (1행부터). 병합으로 가려진 셀은 빈 값(None)
+    시트 끝까지 채우는 빈 행/열 반복(number-rows/columns-repeated)은 뒤에 값이 있을 때만 펼칩니다.
+    (병합 범위 안의 행은 값이 없어도 남김 - 엑셀 일반 모드의 MergedCell과 같음)
+    """
+    from xml.etree.ElementTree import iterparse
+    from zipfile import ZipFile
+
+    cell_tags = (_ODS_TABLE + "table-cell", _ODS_TABLE + "covered-table-cell")
+    sheets: dict[str, list[tuple]] = {}
+    rows: list[tuple] = []
+    row: list = []
+    covered = False
+    pending_rows = pending_cells = 0
+
+    with ZipFile(file_path) as archive, archive.open("content.xml") as source:
+        for event, element in iterparse(source, events=("start", "end")):
+            tag = element.tag
+            if event == "start":
+                if tag == _ODS_TABLE + "table":
+                    rows = sheets.setdefault(element.get(_ODS_TABLE + "name"), [])
+                    pending_rows = 0
+                continue
+
+            if tag in cell_tags:
+                repeat = int(element.get(_ODS_TABLE + "number-columns-repeated", 1))
+                value = _ods_cell_value(element) if tag == cell_tags[0] else None
+                covered = covered or tag == cell_tags[1]
+                if value is None:
+                    pending_cells += repeat
+                else:
+                    row.extend([None] * pending_cells)
+                    row.extend([value] * repeat)
+                    pending_cells = 0
+                element.clear()
+            elif tag == _ODS_TABLE + "table-row":
+                repeat = int(element.get(_ODS_TABLE + "number-rows-repeated", 1))
+                if row or covered:
+                    rows.extend([()] * pending_rows)
+                    rows.extend([tuple(row)] * repeat)
+                    pending_rows = 0
+                else:
+                    pending_rows += repeat
+                row = []
+                covered = False
+                pending_cells = 0
+                element.clear()
+            elif tag == _ODS_TABLE + "table":
+                element.clear()
+    return sheets
+
+
+@register_loader(".ods")
+def _load_ods(file_path: str, sheet_names: list[str] | None) -> dict[str, list[IngredientRow]]:
+    with span("parse", file=Path(file_path).name, format="ods") as s:
+        tables = _tables_from_sheets(read_ods_values(file_path), sheet_names)
+        s.set(rows=sum(len(rows) for rows in tables.values()))
+    return tables
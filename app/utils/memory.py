@@ -0,0 +1,142 @@
+import os
+import tracemalloc
+from pathlib import Path
+
+MEMORY_REPORT_ARG = "--memory-report"
+MEMORY_REPORT_ENV = "CRMC_MEMORY_REPORT"
+MEMORY_BUDGET_ENV = "CRMC_MEMORY_BUDGET_MB"
+
+# 한 번의 불러오기/내보내기에 허용하는 예상 메모리 (초과 예상 시 스트리밍 모드)
+DEFAULT_MEMORY_BUDGET_MB = 512
+
+# 예측 계수 (openpyxl 3.1, tracemalloc 측정값 기준)
+# - 일반 모드 불러오기: xlsx 파일 크기의 약 FULL_LOAD_FACTOR배 (압축 해제 + 셀 객체, 읽기 전용 모드는 약 12배)
+# - 내보내기: 입력 행 하나당 약 EXPORT_BYTES_PER_ROW 바이트 (Result/Table 시트 셀 + 스타일)
+FULL_LOAD_FACTOR = 60
+EXPORT_BYTES_PER_ROW = 3600
+
+
+class MemoryTracker:
+    """
+    tracemalloc으로 단계(span)별 최대 메모리를 측정합니다.
+
+    - push(): 단계 시작, pop(): (최대 증가량, 남은 증가량) 바이트
+    - 단계가 중첩되어도 안쪽 단계의 최대값을 바깥 단계에 반영
+    - tracemalloc의 최대값은 프로세스 전체 기준이므로 다른 스레드의 할당도 포함됩니다.
+    """
+
+    def __init__(self):
+        self._stack: list[list[int]] = []  # [시작 시 사용량, 지금까지의 최대 사용량]
+        self._started_here = False
+
+    @property
+    def active(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_here = True
+
+    def stop(self):
+        self._stack.clear()
+        if self._started_here:
+            tracemalloc.stop()
+            self._started_here = False
+
+    def push(self):
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            # reset_peak() 전까지의 최대값을 바깥 단계에 보존
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        self._stack.append([current, current])
+
+    def pop(self) -> tuple[int, int]:
+        current, peak = tracemalloc.get_traced_memory()
+        if not self._stack:
+            return 0, 0
+        start, child_peak = self._stack.pop()
+        peak = max(peak, child_peak)
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        return peak - start, current - start
+
+
+def memory_report(events) -> list[dict]:
+    """
+    프로파일러 구간(events)을 단계 이름별로 모아 최대 메모리 순으로 정리합니다.
+    peak_kb가 기록된 구간(메모리 보고 모드)만 대상입니다.
+    """
+    stages: dict[str, dict] = {}
+    for name, start, end, _tid, fields in events:
+        peak = fields.get("peak_kb")
+        if peak is None:
+            continue
+        stage = stages.setdefault(name, {"stage": name, "count": 0, "peak_kb": 0, "retained_kb": 0, "rows": 0})
+        stage["count"] += 1
+        stage["peak_kb"] = max(stage["peak_kb"], peak)
+        stage["retained_kb"] += fields.get("retained_kb", 0)
+        stage["rows"] = max(stage["rows"], fields.get("rows", 0) or 0)
+    return sorted(stages.values(), key=lambda s: s["peak_kb"], reverse=True)
+
+
+def format_memory_report(events) -> str:
+    lines = ["[Memory Report] 단계별 최대 메모리 (tracemalloc)"]
+    lines.append(f"  {'stage':<20} {'count':>5} {'peak MB':>9} {'retained MB':>12} {'rows':>9}")
+    for stage in memory_report(events):
+        lines.append(
+            f"  {stage['stage']:<20} {stage['count']:>5} {stage['peak_kb'] / 1024:>9.1f} "
+            f"{stage['retained_kb'] / 1024:>12.1f} {stage['rows']:>9,}"
+        )
+    lines.append(f"  memory budget: {memory_budget_bytes() / 1024 / 1024:.0f} MB")
+    return "\n".join(lines)
+
+
+# ----------------------------------------------------------------------
+# 메모리 예산 / 스트리밍 모드 선택
+# ----------------------------------------------------------------------
+_budget_override: int | None = None
+
+
+def set_memory_budget_mb(megabytes: float | None):
+    """메모리 예산을 지정합니다. None이면 환경 변수/기본값을 사용합니다."""
+    global _budget_override
+    _budget_override = None if megabytes is None else int(megabytes * 1024 * 1024)
+
+
+def memory_budget_bytes() -> int:
+    """예산 우선순위: set_memory_budget_mb() > CRMC_MEMORY_BUDGET_MB > 기본값"""
+    if _budget_override is not None:
+        return _budget_override
+    try:
+        megabytes = float(os.environ.get(MEMORY_BUDGET_ENV, DEFAULT_MEMORY_BUDGET_MB))
+    except ValueError:
+        megabytes = DEFAULT_MEMORY_BUDGET_MB
+    return int(megabytes * 1024 * 1024)
+
+
+def predict_load_bytes(file_path: str | Path) -> int:
+    """일반 모드(openpyxl 전체 로드)로 파일을 열 때 필요한 예상 메모리"""
+    try:
+        return os.path.getsize(file_path) * FULL_LOAD_FACTOR
+    except OSError:
+        return 0
+
+
+def predict_export_bytes(row_count: int) -> int:
+    """일반 모드로 비교 결과를 내보낼 때 필요한 예상 메모리 (row_count: 두 테이블 행 수 합계)"""
+    return row_count * EXPORT_BYTES_PER_ROW
+
+
+def should_stream_load(file_path: str | Path) -> bool:
+    return predict_load_bytes(file_path) > memory_budget_bytes()
+
+
+def should_stream_export(row_count: int) -> bool:
+    return predict_export_bytes(row_count) > memory_budget_bytes()
+
+
+def memory_report_requested(argv: list[str]) -> bool:
+    """--memory-report 인자 또는 CRMC_MEMORY_REPORT=1 환경 변수"""
+    return MEMORY_REPORT_ARG in argv or os.environ.get(MEMORY_REPORT_ENV) == "1"
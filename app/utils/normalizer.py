@@ -0,0 +1,53 @@
+import re
+import unicodedata
+from functools import lru_cache
+
+# 세션 동안 보관할 최대 고유 문자열 수 (LRU)
+NORMALIZE_CACHE_SIZE = 65536
+
+# NFKC로 통일되지 않는 대시/하이픈 변형 -> '-'
+_DASH_TABLE = str.maketrans({
+    "\u2010": "-",  # HYPHEN
+    "\u2011": "-",  # NON-BREAKING HYPHEN
+    "\u2012": "-",  # FIGURE DASH
+    "\u2013": "-",  # EN DASH
+    "\u2014": "-",  # EM DASH
+    "\u2015": "-",  # HORIZONTAL BAR
+    "\u2212": "-",  # MINUS SIGN
+    "\u200b": "",   # ZERO WIDTH SPACE
+    "\u200c": "",   # ZERO WIDTH NON-JOINER
+    "\u200d": "",   # ZERO WIDTH JOINER
+    "\u2060": "",   # WORD JOINER
+    "\ufeff": "",   # BOM / ZERO WIDTH NO-BREAK SPACE
+})
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_text(text: str) -> str:
+    """
+    표시/저장용 정규화.
+
+    1. NFKC (전각 문자 -> 반각, NBSP/전각 공백 -> 일반 공백 등)
+    2. 대시 변형 통일 및 폭 없는 문자 제거
+    3. 연속 공백을 하나로, 앞뒤 공백 제거
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", text).translate(_DASH_TABLE)
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_key(text: str) -> str:
+    """비교/정렬/인덱싱용 키: normalize_text + 대소문자 무시(casefold)"""
+    if not text:
+        return ""
+    return normalize_text(text).casefold()
+
+
+def clear_normalize_cache():
+    """정규화 캐시를 비웁니다."""
+    normalize_text.cache_clear()
+    normalize_key.cache_clear()
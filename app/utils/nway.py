@@ -0,0 +1,178 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from app.models import IngredientRow
+from app.utils.inci_dictionary import canonical_inci_key
+from app.utils.normalizer import normalize_key
+from app.utils.percent import DEFAULT_TOLERANCE, parse_percent, percent_values_equal
+
+# Deviation 종류
+DEVIATION_MISSING = "MISSING"  # 합의(과반)에는 있으나 이 소스에 없음
+DEVIATION_EXTRA = "EXTRA"      # 합의에는 없으나 이 소스에만 있음
+DEVIATION_VALUE = "VALUE"      # 함량이 합의 값과 다름
+
+
+@dataclass
+class FormulaSource:
+    """N-way 비교 대상 한 개 (파일의 TableN 시트 한 개)"""
+    name: str
+    rows: list[IngredientRow]
+
+
+@dataclass
+class NWayEntry:
+    """
+    공유 인덱스의 한 항목.
+    inci_name이 빈 문자열이면 RM 레벨(% RM/FP), 아니면 INCI 레벨(% INCI/RM) 항목입니다.
+    """
+    rm_name: str
+    inci_name: str
+    presence: int = 0  # 소스별 포함 여부 비트마스크 (bit i = sources[i])
+    values: dict[int, str] = field(default_factory=dict)  # source index -> 원본 함량 문자열
+    consensus_present: bool = False
+    consensus_value: str = ""
+
+    def is_present(self, source_index: int) -> bool:
+        return bool(self.presence >> source_index & 1)
+
+
+@dataclass
+class NWayDeviation:
+    """합의(consensus)와 다른 소스별 항목"""
+    source_index: int
+    rm_name: str
+    inci_name: str
+    kind: str
+    value: str
+    consensus_value: str
+
+
+@dataclass
+class NWayResult:
+    sources: list[str]
+    entries: list[NWayEntry]
+    deviations: list[NWayDeviation]
+    # 소스별 차이 목록 (결과를 만들 때 한 번만 나눔, 보고서에서 소스마다 다시 훑지 않음)
+    _by_source: dict[int, list[NWayDeviation]] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        for d in self.deviations:
+            self._by_source.setdefault(d.source_index, []).append(d)
+
+    def deviations_for(self, source_index: int) -> list[NWayDeviation]:
+        return self._by_source.get(source_index, [])
+
+
+def load_sources(paths: list[str]) -> list[FormulaSource]:
+    """
+    파일들의 TableN 시트(CSV 등 테이블이 하나인 형식은 Table1)를 모두 읽어 비교 대상 리스트를 만듭니다.
+    파일이 한 개면 시트 이름을, 여러 개면 '파일명:시트명'을 소스 이름으로 사용합니다.
+    """
+    from app.utils.workbook_cache import load_tables_cached
+
+    sources = []
+    for path in paths:
+        tables = load_tables_cached(path)
+        for sheet_name, rows in tables.items():
+            name = sheet_name if len(paths) == 1 else f"{Path(path).name}:{sheet_name}"
+            sources.append(FormulaSource(name, rows))
+    return sources
+
+
+def build_shared_index(sources: list[FormulaSource]) -> list[NWayEntry]:
+    """
+    모든 소스의 행을 한 번씩만 순회하여 (RM, INCI) 공유 인덱스를 만듭니다. (총 행 수에 선형)
+    항목 순서는 처음 등장한 순서입니다.
+    """
+    index: dict[tuple[str, str], NWayEntry] = {}
+    entries: list[NWayEntry] = []
+
+    def _entry(key, rm_name, inci_name) -> NWayEntry:
+        entry = index.get(key)
+        if entry is None:
+            entry = NWayEntry(rm_name, inci_name)
+            index[key] = entry
+            entries.append(entry)
+        return entry
+
+    for source_index, source in enumerate(sources):
+        bit = 1 << source_index
+        for row in source.rows:
+            rm_key = normalize_key(row.rm_name)
+
+            rm_entry = _entry((rm_key, ""), row.rm_name, "")
+            if not rm_entry.presence & bit:
+                rm_entry.presence |= bit
+                rm_entry.values[source_index] = row.rm_percent
+
+            if row.inci_name:
+                inci_entry = _entry((rm_key, canonical_inci_key(row.inci_name)), row.rm_name, row.inci_name)
+                inci_entry.presence |= bit
+                inci_entry.values[source_index] = row.inci_percent
+
+    return entries
+
+
+def _consensus_value(values: dict[int, str]) -> str:
+    """가장 많은 소스가 가진 함량 값 (동률이면 앞선 소스 우선)"""
+    counts = Counter()
+    first_raw = {}
+    for raw in values.values():
+        number = parse_percent(raw)
+        key = number if number is not None else normalize_key(raw)
+        counts[key] += 1
+        first_raw.setdefault(key, raw)
+    best_key, _ = max(counts.items(), key=lambda kv: kv[1])
+    return first_raw[best_key]
+
+
+def _iter_bits(mask: int):
+    """비트마스크에서 켜진 비트의 인덱스를 순서대로 반환합니다."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def compare_sources(sources: list[FormulaSource], tolerance: Decimal = DEFAULT_TOLERANCE) -> NWayResult:
+    """
+    N개 소스를 공유 인덱스 기준으로 비교합니다.
+
+    Logic:
+    1. 공유 인덱스 생성 (소스별 포함 비트마스크 + 함량)
+    2. 과반수 소스에 있으면 합의 항목, 합의 함량은 최빈값
+    3. 소스별로 합의와 다른 항목(MISSING / EXTRA / VALUE)을 Deviation으로 기록
+    비용은 총 행 수 + Deviation 수에 비례합니다. (소스 쌍별 비교 없음)
+    """
+    source_count = len(sources)
+    full_mask = (1 << source_count) - 1
+    entries = build_shared_index(sources)
+    deviations: list[NWayDeviation] = []
+
+    for entry in entries:
+        entry.consensus_present = entry.presence.bit_count() * 2 > source_count
+        entry.consensus_value = _consensus_value(entry.values) if entry.values else ""
+
+        if not entry.consensus_present:
+            for source_index, value in entry.values.items():
+                deviations.append(NWayDeviation(
+                    source_index, entry.rm_name, entry.inci_name, DEVIATION_EXTRA, value, ""
+                ))
+            continue
+
+        # 비트마스크 여집합으로 누락 소스만 순회
+        for source_index in _iter_bits(full_mask & ~entry.presence):
+            deviations.append(NWayDeviation(
+                source_index, entry.rm_name, entry.inci_name, DEVIATION_MISSING, "", entry.consensus_value
+            ))
+
+        consensus_number = parse_percent(entry.consensus_value)
+        for source_index, value in entry.values.items():
+            if not percent_values_equal(parse_percent(value), consensus_number,
+                                        value, entry.consensus_value, tolerance):
+                deviations.append(NWayDeviation(
+                    source_index, entry.rm_name, entry.inci_name, DEVIATION_VALUE, value, entry.consensus_value
+                ))
+
+    return NWayResult([s.name for s in sources], entries, deviations)
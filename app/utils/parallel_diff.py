@@ -0,0 +1,154 @@
+import atexit
+import multiprocessing
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from zlib import crc32
+from app.models import DiffItem, IngredientRow
+from app.utils.fingerprint import GroupFingerprint, TableFingerprint, root_hash
+from app.utils.normalizer import normalize_key
+from app.utils.row_codec import pack_rows, unpack_rows, pack_diffs, unpack_diffs
+
+# 두 테이블 행 수 합계가 이 값 미만이면 직렬 Diff (프로세스 간 전송 비용이 더 큼)
+PARALLEL_DIFF_MIN_ROWS = 50000
+PARALLEL_DIFF_ENV = "CRMC_PARALLEL_DIFF"  # "0": 항상 직렬, "1": 크기와 무관하게 병렬
+
+# 작업 프로세스당 파티션 수 (그룹 크기 편차에 따른 부하 불균형 완화)
+PARTITIONS_PER_WORKER = 2
+
+_executor: ProcessPoolExecutor | None = None
+_executor_workers = 0
+
+
+def default_workers() -> int:
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def should_diff_in_parallel(row_count: int) -> bool:
+    """환경 변수 > 크기 기준 (코어가 하나뿐이면 직렬)"""
+    setting = os.environ.get(PARALLEL_DIFF_ENV)
+    if setting == "0":
+        return False
+    if setting == "1":
+        return True
+    return row_count >= PARALLEL_DIFF_MIN_ROWS and default_workers() > 1
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """
+    프로세스 풀은 한 번 만들어 재사용 (작업 프로세스 시작 비용은 첫 호출에만)
+    Qt 스레드가 도는 프로세스를 fork하면 멈출 수 있으므로 모든 플랫폼에서 spawn 사용
+    """
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        shutdown_executor()
+        _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _executor_workers = workers
+    return _executor
+
+
+@atexit.register
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+def _partition(data: list[IngredientRow], count: int) -> tuple[list[list[IngredientRow]], list[array]]:
+    """정규화 RM 키 해시로 행을 나눕니다. 파티션 안에서는 원래 행 순서를 유지합니다."""
+    parts = [[] for _ in range(count)]
+    indices = [array("I") for _ in range(count)]
+    bucket_of = {}
+
+    # 같은 RM 이름이 이어지는 구간(병합된 RM 그룹) 단위로 한 번에 옮김
+    start = 0
+    n = len(data)
+    while start < n:
+        rm_name = data[start].rm_name
+        end = start + 1
+        while end < n and data[end].rm_name == rm_name:
+            end += 1
+
+        bucket = bucket_of.get(rm_name)
+        if bucket is None:
+            bucket = crc32(normalize_key(rm_name).encode("utf-8")) % count
+            bucket_of[rm_name] = bucket
+        parts[bucket] += data[start:end]
+        indices[bucket].extend(range(start, end))
+        start = end
+    return parts, indices
+
+
+def _diff_partition(packed1: bytes, packed2: bytes, tolerance):
+    """
+    작업 프로세스: 같은 해시 파티션의 두 테이블 조각을 양방향 비교합니다.
+    결과는 파티션 안의 행 번호 기준 (Diff 버퍼, (RM 키, 행 번호, 해시) 그룹 목록)
+    """
+    from app.utils.diff_logic import _parse_structured_data_from_list, _diff_structs
+
+    struct1 = _parse_structured_data_from_list(unpack_rows(packed1))
+    struct2 = _parse_structured_data_from_list(unpack_rows(packed2))
+    groups1 = [(key, tuple(info["rows"]), info["hash"]) for key, info in struct1.items()]
+    groups2 = [(key, tuple(info["rows"]), info["hash"]) for key, info in struct2.items()]
+    return (
+        pack_diffs(_diff_structs(struct1, struct2, tolerance)),
+        pack_diffs(_diff_structs(struct2, struct1, tolerance)),
+        groups1,
+        groups2,
+    )
+
+
+def _merge(row_count: int, results: list[tuple[bytes, list]], indices: list[array]):
+    """
+    파티션 결과를 원래 행 번호로 되돌리고, 직렬 Diff와 같은 순서(RM 그룹이 처음 나온 순서)로 합칩니다.
+    Returns: (DiffItem 리스트, TableFingerprint)
+    """
+    group_first = array("I", bytes(4 * row_count))
+    groups = []
+    for (_, part_groups), index in zip(results, indices):
+        for key, local_rows, digest in part_groups:
+            rows = tuple(index[r] for r in local_rows)
+            for r in rows:
+                group_first[r] = rows[0]
+            groups.append(GroupFingerprint(key, rows, digest))
+
+    diffs = []
+    for (packed, _), index in zip(results, indices):
+        diffs += [DiffItem(index[d.row], d.col, d.diff_type) for d in unpack_diffs(packed)]
+    # 같은 그룹의 Diff는 한 파티션에서 순서대로 나오므로 안정 정렬로 그룹 순서만 맞춤
+    diffs.sort(key=lambda d: group_first[d.row])
+
+    groups.sort(key=lambda g: g.rows[0])
+    fingerprint = TableFingerprint(
+        root_hash((g.rm_key, g.digest) for g in groups),
+        {g.rm_key: g for g in groups},
+    )
+    return diffs, fingerprint
+
+
+def parallel_diff_tables(data1: list[IngredientRow], data2: list[IngredientRow], tolerance, workers: int | None = None):
+    """
+    diff_tables의 병렬 버전. 결과(Diff 순서, 행 번호, 지문)는 직렬 버전과 같습니다.
+
+    - 두 테이블을 정규화 RM 키 해시로 같은 규칙에 따라 나누므로 같은 RM은 항상 같은 파티션
+    - 파티션은 pack_rows 버퍼로, 결과는 pack_diffs 버퍼로 주고받음 (dataclass 리스트를 pickle하지 않음)
+    Returns: (diff1, diff2, fingerprint1, fingerprint2)
+    """
+    workers = workers or default_workers()
+    count = workers * PARTITIONS_PER_WORKER
+    parts1, indices1 = _partition(data1, count)
+    parts2, indices2 = _partition(data2, count)
+
+    executor = _get_executor(workers)
+    futures = [
+        executor.submit(_diff_partition, pack_rows(p1), pack_rows(p2), tolerance)
+        for p1, p2 in zip(parts1, parts2)
+    ]
+    results = [future.result() for future in futures]
+
+    diff1, fp1 = _merge(len(data1), [(r[0], r[2]) for r in results], indices1)
+    diff2, fp2 = _merge(len(data2), [(r[1], r[3]) for r in results], indices2)
+    if fp1.same_as(fp2):
+        return [], [], fp1, fp2
+    return diff1, diff2, fp1, fp2
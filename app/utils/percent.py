@@ -0,0 +1,49 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import lru_cache
+from app.utils.normalizer import normalize_text
+
+# 함량 비교 시 소수점 반올림 단위 및 기본 허용 오차 (%p)
+PERCENT_QUANTUM = Decimal("0.000001")
+DEFAULT_TOLERANCE = Decimal("0.0001")
+
+
+@lru_cache(maxsize=16384)
+def parse_percent(value: str) -> Decimal | None:
+    """
+    함량 문자열을 Decimal로 변환합니다.
+    - '5', '5.0', '5 %', '５' 모두 Decimal('5.000000')
+    - 빈 값이나 숫자가 아닌 값은 None
+    """
+    if not value:
+        return None
+    text = normalize_text(value).replace("%", "").replace(" ", "")
+    if not text:
+        return None
+    try:
+        number = Decimal(text)
+    except InvalidOperation:
+        return None
+    if not number.is_finite():
+        return None
+    return number.quantize(PERCENT_QUANTUM, rounding=ROUND_HALF_UP)
+
+
+def parse_percent_column(values) -> list[Decimal | None]:
+    """함량 컬럼 전체를 한 번에 Decimal 배열로 변환합니다."""
+    return [parse_percent(v) for v in values]
+
+
+def percent_values_equal(a: Decimal | None, b: Decimal | None, raw_a: str, raw_b: str,
+                         tolerance: Decimal = DEFAULT_TOLERANCE) -> bool:
+    """
+    파싱된 두 함량을 허용 오차 내에서 비교합니다.
+    둘 중 하나라도 숫자가 아니면 정규화된 원본 문자열로 비교합니다.
+    """
+    if a is not None and b is not None:
+        return abs(a - b) <= tolerance
+    return normalize_text(raw_a) == normalize_text(raw_b)
+
+
+def percents_equal(raw_a: str, raw_b: str, tolerance: Decimal = DEFAULT_TOLERANCE) -> bool:
+    """함량 문자열 두 개를 숫자 기준으로 비교합니다. ('5' == '5.0')"""
+    return percent_values_equal(parse_percent(raw_a), parse_percent(raw_b), raw_a, raw_b, tolerance)
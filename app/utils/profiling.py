@@ -0,0 +1,219 @@
+import functools
+import json
+import logging
+import os
+import threading
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from time import perf_counter
+
+PROFILE_ARG = "--profile"
+PROFILE_ENV = "CRMC_PROFILE"
+
+PROFILE_LOG_NAME = "profile.log"
+PROFILE_LOG_MAX_BYTES = 1024 * 1024
+PROFILE_LOG_BACKUPS = 3
+
+# 메모리에 보관하는 최근 구간 수 (Chrome trace 내보내기 대상)
+MAX_EVENTS = 20000
+
+
+class _NullSpan:
+    """프로파일링이 꺼져 있을 때 사용하는 공용 구간 (아무 것도 하지 않음)"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **fields):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "fields", "start", "memory")
+
+    def __init__(self, profiler: "Profiler", name: str, fields: dict):
+        self.profiler = profiler
+        self.name = name
+        self.fields = fields
+        self.start = 0.0
+        self.memory = None
+
+    def __enter__(self):
+        # 메모리 보고 모드: 메모리 측정을 켠 스레드의 구간만 (단계 중첩 순서 유지)
+        memory = self.profiler.memory
+        if memory is not None and threading.get_ident() == self.profiler.memory_thread:
+            self.memory = memory
+            memory.push()
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = perf_counter()
+        if self.memory is not None:
+            peak, retained = self.memory.pop()
+            self.fields["peak_kb"] = peak // 1024
+            self.fields["retained_kb"] = retained // 1024
+        if exc_type is not None:
+            self.fields["error"] = exc_type.__name__
+        self.profiler.record(self.name, self.start, end, self.fields)
+        return False
+
+    def set(self, **fields):
+        """구간 안에서 알게 된 정보(행 수 등)를 추가합니다."""
+        self.fields.update(fields)
+
+
+class Profiler:
+    """
+    단계별 구간(span) 기록기
+
+    - 기록된 구간은 최근 MAX_EVENTS개를 메모리에 보관 (Chrome trace 내보내기)
+    - 로그 파일(회전)에 한 줄씩 기록
+    - listener(상태 표시줄 HUD 등)에 즉시 전달
+    - 메모리 보고 모드에서는 구간마다 최대/잔여 메모리(peak_kb, retained_kb)도 기록
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.events: deque = deque(maxlen=MAX_EVENTS)
+        self.listeners = []
+        self.memory = None
+        self.memory_thread = None
+        self._origin = perf_counter()
+        self._logger = None
+
+    def enable(self, enabled: bool = True, log_dir: str | Path | None = None):
+        self.enabled = enabled
+        if enabled and self._logger is None:
+            self._logger = _make_logger(log_dir)
+
+    def enable_memory_tracking(self, enabled: bool = True):
+        """tracemalloc 기반 단계별 메모리 측정 (현재 스레드의 구간 대상, 실행 속도는 느려짐)"""
+        from app.utils.memory import MemoryTracker
+
+        if enabled and self.memory is None:
+            self.memory = MemoryTracker()
+            self.memory.start()
+            self.memory_thread = threading.get_ident()
+        elif not enabled and self.memory is not None:
+            self.memory.stop()
+            self.memory = None
+            self.memory_thread = None
+
+    def record(self, name: str, start: float, end: float, fields: dict):
+        event = (name, start, end, threading.get_ident(), fields)
+        self.events.append(event)
+
+        if self._logger is not None:
+            extra = " ".join(f"{k}={v}" for k, v in fields.items())
+            self._logger.info(f"{name} {(end - start) * 1000:.1f}ms {extra}".rstrip())
+        for listener in list(self.listeners):
+            try:
+                listener(name, end - start, fields)
+            except Exception as e:
+                print(f"Profiler Listener Error: {e}")
+
+    def clear(self):
+        self.events.clear()
+
+    def chrome_trace(self) -> dict:
+        """chrome://tracing / Perfetto에서 열 수 있는 Trace Event 형식"""
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": name,
+                    "cat": "crmc",
+                    "ph": "X",
+                    "ts": (start - self._origin) * 1e6,
+                    "dur": (end - start) * 1e6,
+                    "pid": pid,
+                    "tid": tid,
+                    "args": fields,
+                }
+                for name, start, end, tid, fields in self.events
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def export_chrome_trace(self, path: str | Path) -> Path:
+        output = Path(path)
+        output.write_text(json.dumps(self.chrome_trace(), ensure_ascii=False, default=str), encoding="utf-8")
+        return output
+
+
+def _make_logger(log_dir: str | Path | None) -> logging.Logger | None:
+    from app.utils.resources import user_data_dir
+
+    try:
+        directory = Path(log_dir) if log_dir else user_data_dir() / "logs"
+        directory.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(
+            directory / PROFILE_LOG_NAME, maxBytes=PROFILE_LOG_MAX_BYTES,
+            backupCount=PROFILE_LOG_BACKUPS, encoding="utf-8",
+        )
+    except OSError as e:
+        print(f"Profile Log Error: {e}")
+        return None
+
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    logger = logging.getLogger("crmc.profile")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(handler)
+    return logger
+
+
+# 앱 전체에서 공유하는 기록기
+profiler = Profiler()
+
+
+def span(name: str, **fields):
+    """
+    with span("diff", rows=len(data)) as s:
+        ...
+        s.set(diffs=len(result))
+
+    프로파일링이 꺼져 있으면 공용 no-op 객체를 반환합니다.
+    """
+    if not profiler.enabled:
+        return _NULL_SPAN
+    return _Span(profiler, name, fields)
+
+
+def profiled(name: str | None = None):
+    """함수 전체를 구간으로 기록하는 데코레이터 (꺼져 있으면 바로 호출)"""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            with _Span(profiler, span_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def enable_from_environment(argv: list[str]) -> bool:
+    """
+    --profile 인자 또는 CRMC_PROFILE=1 환경 변수로 프로파일링을 켭니다.
+    --memory-report / CRMC_MEMORY_REPORT=1이면 메모리 측정도 함께 켭니다.
+    """
+    from app.utils.memory import memory_report_requested
+
+    memory_report = memory_report_requested(argv)
+    if memory_report or PROFILE_ARG in argv or os.environ.get(PROFILE_ENV) == "1":
+        profiler.enable(True)
+    if memory_report:
+        profiler.enable_memory_tracking(True)
+    return profiler.enabled
@@ -0,0 +1,31 @@
+import os
+import sys
+from pathlib import Path
+
+
+def data_dir() -> Path:
+    """번들 데이터 폴더 경로 (PyInstaller onefile 실행 시 _MEIPASS 기준)"""
+    base = getattr(sys, "_MEIPASS", None)
+    if base:
+        return Path(base) / "app" / "data"
+    return Path(__file__).resolve().parent.parent / "data"
+
+
+def data_path(file_name: str) -> Path:
+    """번들 데이터 파일의 경로를 반환합니다."""
+    return data_dir() / file_name
+
+
+def user_data_dir() -> Path:
+    """
+    사용자별 데이터 폴더 (이력 DB, 캐시 등)
+    - Windows: %LOCALAPPDATA%/CosmeticRawMaterialChecker
+    - 그 외: ~/.local/share/cosmetic-raw-material-checker
+    """
+    local_app_data = os.environ.get("LOCALAPPDATA")
+    if sys.platform.startswith("win") and local_app_data:
+        path = Path(local_app_data) / "CosmeticRawMaterialChecker"
+    else:
+        path = Path.home() / ".local" / "share" / "cosmetic-raw-material-checker"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -0,0 +1,260 @@
+import json
+import sqlite3
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from hashlib import blake2b
+from pathlib import Path
+from app.models import IngredientRow
+from app.utils.normalizer import normalize_key
+from app.utils.resources import user_data_dir
+
+REVISION_DB_NAME = "revisions.sqlite3"
+
+# 이 간격마다 전체 스냅샷을 저장하여 복원 시 델타 체인 길이를 제한
+SNAPSHOT_INTERVAL = 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS groups (
+    hash    BLOB PRIMARY KEY,
+    payload BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS revisions (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    formula     TEXT NOT NULL,
+    table_name  TEXT NOT NULL,
+    parent_id   INTEGER REFERENCES revisions(id),
+    chain_depth INTEGER NOT NULL,
+    root_hash   BLOB NOT NULL,
+    row_count   INTEGER NOT NULL,
+    label       TEXT NOT NULL DEFAULT '',
+    source_path TEXT NOT NULL DEFAULT '',
+    created_at  TEXT NOT NULL,
+    delta       BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_revisions_formula ON revisions (formula, table_name, id);
+"""
+
+
+@dataclass
+class RevisionInfo:
+    id: int
+    formula: str
+    table_name: str
+    parent_id: int | None
+    row_count: int
+    label: str
+    source_path: str
+    created_at: str
+
+
+def _split_groups(rows: list[IngredientRow]) -> list[list[IngredientRow]]:
+    """연속된 같은 RM(정규화 키 기준) 행을 그룹으로 묶습니다."""
+    groups = []
+    prev_key = None
+    for row in rows:
+        key = normalize_key(row.rm_name)
+        if not groups or key != prev_key:
+            groups.append([])
+            prev_key = key
+        groups[-1].append(row)
+    return groups
+
+
+def _encode_group(group: list[IngredientRow]) -> tuple[bytes, bytes]:
+    """그룹 원본 행을 직렬화하고 내용 해시(저장 키)를 계산합니다."""
+    raw = json.dumps(
+        [[r.rm_name, r.rm_percent, r.inci_name, r.inci_percent] for r in group],
+        ensure_ascii=False, separators=(",", ":"),
+    ).encode("utf-8")
+    return blake2b(raw, digest_size=16).digest(), zlib.compress(raw)
+
+
+def _decode_group(payload: bytes) -> list[IngredientRow]:
+    return [IngredientRow(*values) for values in json.loads(zlib.decompress(payload))]
+
+
+def _root_of(hashes: list[bytes]) -> bytes:
+    h = blake2b(digest_size=16)
+    for digest in hashes:
+        h.update(digest)
+    return h.digest()
+
+
+def _make_delta(old: list[bytes], new: list[bytes]) -> dict | None:
+    """
+    이전 그룹 해시 목록 -> 새 목록 델타.
+    {"removed": [이전 목록 인덱스...], "added": [[새 목록 위치, 해시]...]}
+    유지된 그룹의 순서가 바뀐 경우 None (스냅샷으로 저장)
+    """
+    remaining: dict[bytes, int] = {}
+    for digest in new:
+        remaining[digest] = remaining.get(digest, 0) + 1
+
+    removed = []
+    kept = []
+    for idx, digest in enumerate(old):
+        if remaining.get(digest, 0) > 0:
+            remaining[digest] -= 1
+            kept.append(digest)
+        else:
+            removed.append(idx)
+
+    kept_count: dict[bytes, int] = {}
+    for digest in kept:
+        kept_count[digest] = kept_count.get(digest, 0) + 1
+
+    added = []
+    kept_in_new = []
+    for pos, digest in enumerate(new):
+        if kept_count.get(digest, 0) > 0:
+            kept_count[digest] -= 1
+            kept_in_new.append(digest)
+        else:
+            added.append([pos, digest.hex()])
+
+    if kept_in_new != kept:
+        return None
+    return {"removed": removed, "added": added}
+
+
+def _apply_delta(old: list[bytes], delta: dict) -> list[bytes]:
+    removed = set(delta["removed"])
+    result = [digest for idx, digest in enumerate(old) if idx not in removed]
+    for pos, digest_hex in delta["added"]:
+        result.insert(pos, bytes.fromhex(digest_hex))
+    return result
+
+
+class RevisionStore:
+    """
+    처방 테이블 리비전 저장소 (SQLite)
+
+    - RM 그룹은 내용 해시로 한 번만 저장 (리비전 간 중복 제거, zlib 압축)
+    - 리비전은 직전 리비전 대비 그룹 해시 델타(추가/삭제)로 저장
+    - SNAPSHOT_INTERVAL마다 전체 그룹 목록을 스냅샷으로 저장
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path else user_data_dir() / REVISION_DB_NAME
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # 저장
+    # ------------------------------------------------------------------
+    def add_revision(self, formula: str, table_name: str, rows: list[IngredientRow],
+                     label: str = "", source_path: str = "") -> int:
+        """
+        테이블을 새 리비전으로 기록하고 리비전 ID를 반환합니다.
+        직전 리비전과 내용이 같으면 새로 저장하지 않고 직전 ID를 반환합니다.
+        """
+        encoded = [_encode_group(g) for g in _split_groups(rows)]
+        hashes = [digest for digest, _ in encoded]
+        root = _root_of(hashes)
+
+        parent = self._conn.execute(
+            "SELECT id, root_hash, chain_depth FROM revisions "
+            "WHERE formula = ? AND table_name = ? ORDER BY id DESC LIMIT 1",
+            (formula, table_name),
+        ).fetchone()
+
+        if parent and parent[1] == root:
+            return parent[0]
+
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO groups (hash, payload) VALUES (?, ?)", encoded
+            )
+
+            delta = None
+            if parent and parent[2] + 1 < SNAPSHOT_INTERVAL:
+                delta = _make_delta(self._group_hashes(parent[0]), hashes)
+
+            if delta is None:
+                parent_id, depth = None, 0
+                payload = {"snapshot": [digest.hex() for digest in hashes]}
+            else:
+                parent_id, depth = parent[0], parent[2] + 1
+                payload = delta
+
+            cursor = self._conn.execute(
+                "INSERT INTO revisions (formula, table_name, parent_id, chain_depth, root_hash, "
+                "row_count, label, source_path, created_at, delta) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (formula, table_name, parent_id, depth, root, len(rows), label, source_path,
+                 datetime.now().isoformat(timespec="seconds"),
+                 zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))),
+            )
+            return cursor.lastrowid
+
+    # ------------------------------------------------------------------
+    # 조회 / 복원
+    # ------------------------------------------------------------------
+    def list_revisions(self, formula: str | None = None, table_name: str | None = None) -> list[RevisionInfo]:
+        query = ("SELECT id, formula, table_name, parent_id, row_count, label, source_path, created_at "
+                 "FROM revisions WHERE 1 = 1")
+        params = []
+        if formula is not None:
+            query += " AND formula = ?"
+            params.append(formula)
+        if table_name is not None:
+            query += " AND table_name = ?"
+            params.append(table_name)
+        query += " ORDER BY formula, table_name, id"
+        return [RevisionInfo(*row) for row in self._conn.execute(query, params)]
+
+    def load_revision(self, revision_id: int) -> list[IngredientRow]:
+        """리비전을 IngredientRow 리스트로 복원합니다. (xlsx 재파싱 없음)"""
+        hashes = self._group_hashes(revision_id)
+        payloads = self._group_payloads(set(hashes))
+        rows = []
+        for digest in hashes:
+            rows.extend(_decode_group(payloads[digest]))
+        return rows
+
+    def diff_revisions(self, old_id: int, new_id: int):
+        """두 리비전을 복원하여 generate_diff_report 경로로 비교합니다. Returns: (diff_old, diff_new)"""
+        from app.utils.diff_logic import diff_tables
+
+        diff_old, diff_new, _, _ = diff_tables(self.load_revision(old_id), self.load_revision(new_id))
+        return diff_old, diff_new
+
+    def _group_hashes(self, revision_id: int) -> list[bytes]:
+        """스냅샷까지 델타 체인을 거슬러 올라간 뒤 순서대로 적용합니다."""
+        chain = []
+        current = revision_id
+        while current is not None:
+            row = self._conn.execute(
+                "SELECT parent_id, delta FROM revisions WHERE id = ?", (current,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(f"Revision not found: {current}")
+            chain.append(json.loads(zlib.decompress(row[1])))
+            current = row[0]
+
+        hashes = [bytes.fromhex(h) for h in chain.pop()["snapshot"]]
+        for delta in reversed(chain):
+            hashes = _apply_delta(hashes, delta)
+        return hashes
+
+    def _group_payloads(self, hashes: set[bytes]) -> dict[bytes, bytes]:
+        result = {}
+        hash_list = list(hashes)
+        # SQLite 변수 개수 제한을 고려하여 나누어 조회
+        for i in range(0, len(hash_list), 500):
+            chunk = hash_list[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for digest, payload in self._conn.execute(
+                f"SELECT hash, payload FROM groups WHERE hash IN ({placeholders})", chunk
+            ):
+                result[digest] = payload
+        return result
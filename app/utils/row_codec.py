@@ -0,0 +1,96 @@
+import struct
+import sys
+from array import array
+from app.models import DiffItem, DiffType, IngredientRow
+
+# 모든 정수는 little-endian으로 저장
+_U32 = struct.Struct("<I")
+
+
+def _to_le_bytes(arr: array) -> bytes:
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _from_le_bytes(typecode: str, data: bytes) -> array:
+    arr = array(typecode)
+    arr.frombytes(data)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+def pack_rows(rows: list[IngredientRow]) -> bytes:
+    """
+    IngredientRow 리스트를 컴팩트한 바이너리로 변환합니다.
+
+    Layout:
+        u32 string_count | (u32 len + utf-8)* | u32 row_count | u32[row_count * 4] string indices
+    RM명/함량처럼 반복되는 문자열은 문자열 테이블에 한 번만 저장됩니다.
+    """
+    table: dict[str, int] = {}
+    indices = array("I")
+    for row in rows:
+        for value in (row.rm_name, row.rm_percent, row.inci_name, row.inci_percent):
+            idx = table.get(value)
+            if idx is None:
+                idx = len(table)
+                table[value] = idx
+            indices.append(idx)
+
+    parts = [_U32.pack(len(table))]
+    for value in table:
+        encoded = value.encode("utf-8")
+        parts.append(_U32.pack(len(encoded)))
+        parts.append(encoded)
+    parts.append(_U32.pack(len(rows)))
+    parts.append(_to_le_bytes(indices))
+    return b"".join(parts)
+
+
+def unpack_rows(data: bytes) -> list[IngredientRow]:
+    """pack_rows로 만든 바이너리를 IngredientRow 리스트로 복원합니다."""
+    view = memoryview(data)
+    offset = 0
+
+    (string_count,) = _U32.unpack_from(view, offset)
+    offset += 4
+    strings = []
+    for _ in range(string_count):
+        (length,) = _U32.unpack_from(view, offset)
+        offset += 4
+        strings.append(bytes(view[offset:offset + length]).decode("utf-8"))
+        offset += length
+
+    (row_count,) = _U32.unpack_from(view, offset)
+    offset += 4
+    indices = _from_le_bytes("I", bytes(view[offset:offset + row_count * 16]))
+
+    return [
+        IngredientRow(strings[indices[i]], strings[indices[i + 1]], strings[indices[i + 2]], strings[indices[i + 3]])
+        for i in range(0, row_count * 4, 4)
+    ]
+
+
+def pack_diffs(diffs: list[DiffItem]) -> bytes:
+    """
+    DiffItem 리스트를 바이너리로 변환합니다.
+    Layout: u32 count | u32[count] rows | u8[count] cols | u8[count] diff types
+    """
+    rows = array("I", (d.row for d in diffs))
+    cols = array("B", (d.col for d in diffs))
+    types = array("B", (d.diff_type.value for d in diffs))
+    return _U32.pack(len(diffs)) + _to_le_bytes(rows) + cols.tobytes() + types.tobytes()
+
+
+def unpack_diffs(data: bytes) -> list[DiffItem]:
+    (count,) = _U32.unpack_from(data, 0)
+    offset = 4
+    rows = _from_le_bytes("I", data[offset:offset + count * 4])
+    offset += count * 4
+    cols = data[offset:offset + count]
+    offset += count
+    types = data[offset:offset + count]
+    return [DiffItem(rows[i], cols[i], DiffType(types[i])) for i in range(count)]
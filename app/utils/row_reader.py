@@ -0,0 +1,64 @@
+import csv
+import io
+from typing import Iterable, Sequence
+from app.models import IngredientRow
+from app.utils.normalizer import normalize_key
+
+# 붙여넣은 블록의 첫 줄이 이 헤더면 건너뜀
+_HEADER_KEYS = ("rm", "% rm/fp", "inci", "% inci/rm")
+
+
+def _cell_text(row: Sequence, idx: int) -> str:
+    value = row[idx] if len(row) > idx else None
+    return "" if value is None else str(value)
+
+
+def rows_from_values(values: Iterable[Sequence]) -> list[IngredientRow]:
+    """
+    (RM, % RM/FP, INCI, % INCI/RM) 값 행들을 IngredientRow 리스트로 변환합니다.
+    병합된 RM 셀처럼 RM이 비어 있는 행은 직전 RM과 함량을 이어받습니다. (Fill-down)
+    첫 RM이 나오기 전의 행은 무시합니다.
+    """
+    raw_data = []
+
+    # Fill-down을 위한 변수
+    current_rm = ""
+    current_rm_pct = ""
+
+    for row in values:
+        rm_val = _cell_text(row, 0)
+        rm_pct = _cell_text(row, 1)
+        inci = _cell_text(row, 2)
+        inci_pct = _cell_text(row, 3)
+
+        # 새 RM이 나오면 업데이트, 없으면 이전 RM 사용 (Fill-down 로직)
+        if rm_val:
+            current_rm = rm_val
+            current_rm_pct = rm_pct
+
+        # 유효한 RM 그룹 내에 있다면 데이터 추가
+        if current_rm:
+            raw_data.append(IngredientRow(
+                rm_name=current_rm,
+                rm_percent=current_rm_pct,
+                inci_name=inci,
+                inci_percent=inci_pct
+            ))
+
+    return raw_data
+
+
+def parse_clipboard_rows(text: str) -> list[IngredientRow]:
+    """
+    엑셀에서 복사한 탭 구분(TSV) 텍스트를 IngredientRow 리스트로 변환합니다.
+    셀 안 줄바꿈(따옴표로 감싼 셀)을 지원하고, 헤더 행과 빈 행은 건너뜁니다.
+    """
+    values = []
+    for row in csv.reader(io.StringIO(text), delimiter="\t"):
+        cells = [cell.strip() for cell in row]
+        if not any(cells):
+            continue
+        if not values and tuple(normalize_key(c) for c in cells[:4]) == _HEADER_KEYS:
+            continue
+        values.append(cells)
+    return rows_from_values(values)
@@ -0,0 +1,99 @@
+import json
+import struct
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from app.models import DiffItem, IngredientRow
+from app.utils.row_codec import pack_rows, unpack_rows, pack_diffs, unpack_diffs
+
+SESSION_MAGIC = b"CRMS"
+SESSION_VERSION = 1
+SESSION_FILE_FILTER = "Checker Session (*.crms)"
+
+# Diff 규칙이 바뀌면 올려서, 이전 세션의 캐시된 Diff 대신 다시 계산하도록 함
+DIFF_SCHEMA_VERSION = 1
+
+# magic(4) | version(u16) | reserved(u16) | payload length(u32)
+_HEADER = struct.Struct("<4sHHI")
+# section tag(4) | length(u32)
+_SECTION = struct.Struct("<4sI")
+
+
+class SessionFormatError(ValueError):
+    """세션 파일 형식이 올바르지 않음"""
+
+
+@dataclass
+class SessionState:
+    """세션 파일에 저장되는 검토 상태"""
+    data1: list[IngredientRow]
+    data2: list[IngredientRow]
+    diff1: list[DiffItem] | None = None  # None이면 열 때 다시 계산
+    diff2: list[DiffItem] | None = None
+    meta: dict = field(default_factory=dict)  # 파일명, 스크롤 위치, 현재 셀, 요약 문구 등
+
+
+def encode_session(state: SessionState) -> bytes:
+    """SessionState를 세션 바이너리로 변환합니다."""
+    meta = dict(state.meta)
+    sections = [
+        (b"TBL1", pack_rows(state.data1)),
+        (b"TBL2", pack_rows(state.data2)),
+    ]
+    if state.diff1 is not None and state.diff2 is not None:
+        meta["diff_schema"] = DIFF_SCHEMA_VERSION
+        sections.append((b"DIF1", pack_diffs(state.diff1)))
+        sections.append((b"DIF2", pack_diffs(state.diff2)))
+    sections.insert(0, (b"META", json.dumps(meta, ensure_ascii=False).encode("utf-8")))
+
+    body = b"".join(_SECTION.pack(tag, len(data)) + data for tag, data in sections)
+    payload = zlib.compress(body)
+    return _HEADER.pack(SESSION_MAGIC, SESSION_VERSION, 0, len(payload)) + payload
+
+
+def decode_session(data: bytes) -> SessionState:
+    """세션 바이너리를 SessionState로 복원합니다."""
+    if len(data) < _HEADER.size:
+        raise SessionFormatError("세션 파일이 너무 짧습니다.")
+
+    magic, version, _, payload_len = _HEADER.unpack_from(data, 0)
+    if magic != SESSION_MAGIC:
+        raise SessionFormatError("세션 파일이 아닙니다.")
+    if version > SESSION_VERSION:
+        raise SessionFormatError(f"지원하지 않는 세션 버전입니다: {version}")
+
+    try:
+        body = zlib.decompress(data[_HEADER.size:_HEADER.size + payload_len])
+    except zlib.error as e:
+        raise SessionFormatError(f"세션 파일이 손상되었습니다: {e}") from e
+
+    sections = {}
+    offset = 0
+    while offset < len(body):
+        tag, length = _SECTION.unpack_from(body, offset)
+        offset += _SECTION.size
+        sections[tag] = body[offset:offset + length]
+        offset += length
+
+    meta = json.loads(sections.get(b"META", b"{}").decode("utf-8"))
+    state = SessionState(
+        data1=unpack_rows(sections[b"TBL1"]) if b"TBL1" in sections else [],
+        data2=unpack_rows(sections[b"TBL2"]) if b"TBL2" in sections else [],
+        meta=meta,
+    )
+
+    # 캐시된 Diff는 같은 규칙 버전일 때만 사용
+    if meta.get("diff_schema") == DIFF_SCHEMA_VERSION and b"DIF1" in sections and b"DIF2" in sections:
+        state.diff1 = unpack_diffs(sections[b"DIF1"])
+        state.diff2 = unpack_diffs(sections[b"DIF2"])
+    return state
+
+
+def save_session(path: str | Path, state: SessionState) -> Path:
+    output = Path(path)
+    output.write_bytes(encode_session(state))
+    return output
+
+
+def load_session(path: str | Path) -> SessionState:
+    return decode_session(Path(path).read_bytes())
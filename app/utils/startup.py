@@ -0,0 +1,139 @@
+import builtins
+import json
+import os
+import sys
+from time import perf_counter
+
+# 실행 후 첫 화면이 그려질 때까지의 목표 시간 (ms)
+DEFAULT_STARTUP_BUDGET_MS = 1500
+
+STARTUP_PROFILE_ARG = "--startup-profile"
+STARTUP_PROFILE_ENV = "CRMC_STARTUP_PROFILE"
+STARTUP_BUDGET_ENV = "CRMC_STARTUP_BUDGET_MS"
+# 지정하면 보고서를 JSON 파일로도 저장 (CI에서 추이 비교용)
+STARTUP_REPORT_ENV = "CRMC_STARTUP_REPORT"
+
+
+class ImportTimer:
+    """
+    builtins.__import__를 감싸 처음 import되는 모듈별 시간(누적/자체)을 기록합니다.
+    (python -X importtime과 같은 정보를 패키징된 exe에서도 얻기 위함)
+    """
+
+    def __init__(self):
+        self.records: dict[str, tuple[float, float]] = {}  # name -> (cumulative, self)
+        self._stack: list[float] = []
+        self._original = None
+
+    def install(self):
+        if self._original is None:
+            self._original = builtins.__import__
+            builtins.__import__ = self._timed_import
+
+    def uninstall(self):
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original
+        if level:
+            return original(name, globals, locals, fromlist, level)
+
+        # "from pkg import sub" 형태는 새로 import되는 하위 모듈 이름으로 기록
+        new_subs = [f"{name}.{f}" for f in fromlist or () if f != "*" and f"{name}.{f}" not in sys.modules]
+        if name in sys.modules and not new_subs:
+            return original(name, globals, locals, fromlist, level)
+        key = None if name in sys.modules else name
+
+        self._stack.append(0.0)
+        start = perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            if key is None:
+                # fromlist 중 실제로 import된 하위 모듈만 (속성 이름 제외)
+                key = ", ".join(sub for sub in new_subs if sub in sys.modules) or None
+            if key is not None and key not in self.records:
+                self.records[key] = (elapsed, elapsed - children)
+
+    def top(self, count: int = 15) -> list[tuple[str, float, float]]:
+        """누적 시간이 긴 순서로 (모듈, 누적 ms, 자체 ms)"""
+        items = sorted(self.records.items(), key=lambda kv: kv[1][0], reverse=True)
+        return [(name, cum * 1000, own * 1000) for name, (cum, own) in items[:count]]
+
+
+class StartupProfiler:
+    """
+    시작 시간 측정 모드
+
+    - 단계별 시각(mark)과 import 시간 내역을 기록
+    - 첫 화면이 그려진 시점(time-to-first-paint)을 예산과 비교하여 보고
+    """
+
+    def __init__(self, started_at: float, enabled: bool, budget_ms: float = DEFAULT_STARTUP_BUDGET_MS):
+        self.started_at = started_at
+        self.enabled = enabled
+        self.budget_ms = budget_ms
+        self.marks: list[tuple[str, float]] = []
+        self.imports = ImportTimer()
+        if enabled:
+            self.imports.install()
+
+    @classmethod
+    def from_environment(cls, argv: list[str], started_at: float) -> "StartupProfiler":
+        """--startup-profile 인자 또는 CRMC_STARTUP_PROFILE=1 환경 변수로 활성화합니다."""
+        enabled = STARTUP_PROFILE_ARG in argv or os.environ.get(STARTUP_PROFILE_ENV) == "1"
+        budget_ms = float(os.environ.get(STARTUP_BUDGET_ENV, DEFAULT_STARTUP_BUDGET_MS))
+        return cls(started_at, enabled, budget_ms)
+
+    def mark(self, name: str):
+        if self.enabled:
+            self.marks.append((name, (perf_counter() - self.started_at) * 1000))
+
+    def elapsed_ms(self, name: str) -> float | None:
+        for mark_name, ms in self.marks:
+            if mark_name == name:
+                return ms
+        return None
+
+    def within_budget(self) -> bool:
+        first_paint = self.elapsed_ms("first_paint")
+        return first_paint is not None and first_paint <= self.budget_ms
+
+    def finish(self):
+        self.imports.uninstall()
+
+    def report(self) -> dict:
+        return {
+            "marks_ms": {name: round(ms, 1) for name, ms in self.marks},
+            "budget_ms": self.budget_ms,
+            "within_budget": self.within_budget(),
+            "imports": [
+                {"module": name, "cumulative_ms": round(cum, 1), "self_ms": round(own, 1)}
+                for name, cum, own in self.imports.top()
+            ],
+        }
+
+    def format_report(self) -> str:
+        lines = ["[Startup Profile]"]
+        for name, ms in self.marks:
+            lines.append(f"  {name:<16} {ms:8.1f} ms")
+        first_paint = self.elapsed_ms("first_paint")
+        status = "OK" if self.within_budget() else "OVER BUDGET"
+        lines.append(f"  budget           {self.budget_ms:8.1f} ms  -> {status} ({first_paint or 0:.1f} ms)")
+        lines.append("  slowest imports (cumulative / self):")
+        for name, cum, own in self.imports.top():
+            lines.append(f"    {cum:8.1f} / {own:7.1f} ms  {name}")
+        return "\n".join(lines)
+
+    def dump_json(self, path=None) -> None:
+        path = path or os.environ.get(STARTUP_REPORT_ENV)
+        if not path:
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
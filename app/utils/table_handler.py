@@ -1,6 +1,9 @@
+from difflib import SequenceMatcher
 from PyQt5.QtWidgets import QTableWidgetItem, QHeaderView
 from app.models import IngredientRow
-from app.utils.excel_handler import load_data_from_excel
+from app.utils.workbook_cache import load_tables_cached
+from app.utils.normalizer import normalize_key
+from app.utils.profiling import span
 
 FIXED_HEADER = ("RM", "% RM/FP", "INCI", "% INCI/RM")
 
@@ -36,8 +39,14 @@ def render_table(table, data_list: list[IngredientRow]):
     """데이터 리스트를 테이블에 그리고, 자동 병합을 수행합니다."""
     # 1. 정렬 (RM 이름 -> INCI 이름 순)
     if data_list:
-        data_list.sort(key=lambda x: (x.rm_name.lower(), x.inci_name.lower()))
+        with span("sort", rows=len(data_list)):
+            data_list.sort(key=lambda x: (normalize_key(x.rm_name), normalize_key(x.inci_name)))
 
+    with span("render", rows=len(data_list)):
+        _render_sorted(table, data_list)
+
+def _render_sorted(table, data_list: list[IngredientRow]):
+    """정렬된 데이터를 테이블에 씁니다."""
     # 2. 초기화
     table.clearContents()
     table.clearSpans()  # [신규] 기존 병합 정보 초기화 (필수)
@@ -47,8 +56,9 @@ def render_table(table, data_list: list[IngredientRow]):
         return
 
     # 3. 데이터 쓰기 및 병합
+    # 병합 기준은 Diff/검증과 같은 정규화 키 ("Foo"와 "foo "는 한 그룹)
     merge_start_idx = 0
-    prev_rm = data_list[0].rm_name
+    prev_key = normalize_key(data_list[0].rm_name)
 
     for i, item in enumerate(data_list):
         # 아이템 생성 및 삽입
@@ -58,11 +68,12 @@ def render_table(table, data_list: list[IngredientRow]):
         table.setItem(i, 3, QTableWidgetItem(item.inci_percent))
 
         # RM이 바뀌면 직전 그룹 병합 처리
-        if item.rm_name != prev_rm:
+        key = normalize_key(item.rm_name)
+        if key != prev_key:
             _apply_merge(table, merge_start_idx, i - merge_start_idx)
             
             # 상태 업데이트
-            prev_rm = item.rm_name
+            prev_key = key
             merge_start_idx = i
 
     # 마지막 그룹 병합 처리
@@ -74,6 +85,65 @@ def _apply_merge(table, start_row, span_count):
         table.setSpan(start_row, 0, span_count, 1) # RM 컬럼
         table.setSpan(start_row, 1, span_count, 1) # % RM/FP 컬럼
 
+def _group_rows(data_list: list[IngredientRow]) -> list[tuple]:
+    """render_table과 같은 기준(연속된 같은 RM 정규화 키)으로 행을 그룹으로 묶습니다. 각 그룹은 해시 가능한 튜플입니다."""
+    groups = []
+    prev_key = None
+    for row in data_list:
+        values = (row.rm_name, row.rm_percent, row.inci_name, row.inci_percent)
+        key = normalize_key(row.rm_name)
+        if groups and key == prev_key:
+            groups[-1].append(values)
+        else:
+            groups.append([values])
+            prev_key = key
+    return [tuple(g) for g in groups]
+
+def patch_table(table, data_list: list[IngredientRow]) -> int:
+    """
+    테이블을 다시 그리지 않고 바뀐 RM 그룹만 교체합니다. (변경 감시 리로드용)
+    Returns: 교체/추가/삭제된 그룹 수
+    """
+    if data_list:
+        with span("sort", rows=len(data_list)):
+            data_list.sort(key=lambda x: (normalize_key(x.rm_name), normalize_key(x.inci_name)))
+
+    with span("patch", rows=len(data_list)) as s:
+        changed = _patch_sorted(table, data_list)
+        s.set(groups_changed=changed)
+    return changed
+
+def _patch_sorted(table, data_list: list[IngredientRow]) -> int:
+    old_groups = _group_rows(extract_data_from_table(table))
+    new_groups = _group_rows(data_list)
+
+    old_starts = [0]
+    for g in old_groups:
+        old_starts.append(old_starts[-1] + len(g))
+
+    opcodes = SequenceMatcher(None, old_groups, new_groups, autojunk=False).get_opcodes()
+    changed = 0
+
+    # 아래쪽부터 적용하여 위쪽 행 번호가 바뀌지 않도록 함
+    for tag, i1, i2, j1, j2 in reversed(opcodes):
+        if tag == "equal":
+            continue
+        changed += max(i2 - i1, j2 - j1)
+
+        row = old_starts[i1]
+        for _ in range(old_starts[i2] - row):
+            table.removeRow(row)
+
+        for group in new_groups[j1:j2]:
+            for offset, values in enumerate(group):
+                table.insertRow(row + offset)
+                for col, text in enumerate(values):
+                    table.setItem(row + offset, col, QTableWidgetItem(text))
+            _apply_merge(table, row, len(group))
+            row += len(group)
+
+    return changed
+
 def re_sort_table(table):
     """현재 테이블 내용을 읽어서 다시 정렬하고 그립니다."""
     current_data = extract_data_from_table(table)
@@ -82,5 +152,5 @@ def re_sort_table(table):
 def make_table(table, file_path, sheet_name):
     """엑셀 파일을 읽어 테이블을 구성합니다."""
     setup_table_header(table)
-    data = load_data_from_excel(file_path, sheet_name)
+    data = load_tables_cached(file_path, [sheet_name])[sheet_name]
     render_table(table, data)
@@ -1,4 +1,6 @@
 import re
+import unicodedata
+from decimal import Decimal
 
 def parse_ingredients(text: str) -> list[str]:
     """
@@ -38,3 +40,55 @@ def parse_ingredients(text: str) -> list[str]:
     ]
     
     return ingredients
+
+
+# 함량이 표기된 성분 한 항목: "Water 68.5%", "Glycerin (5%)", "Niacinamide [<1 %]", "Butylene Glycol 2,5%"
+# - 함량 앞의 비교 기호(<, >, ≤, ≥, ~)도 함께 잡음
+# - 성분명은 가장 짧게 잡고, 뒤따르는 함량 표기(괄호 선택)와 구분자까지 한 번에 매칭
+# - 구분자: 숫자가 뒤따르지 않는 쉼표(1,2-Hexanediol 보호), 세미콜론, 줄바꿈, 또는 함량 표기 뒤의 공백
+_PERCENT_ENTRY_RE = re.compile(
+    r"""
+    [\s,;]*
+    (?P<name>[^\n;]*?)
+    (?:
+        \s*[(\[]?\s*(?P<cmp><=|>=|[<>≤≥~])?\s*
+        (?P<pct>\d+(?:[.,]\d+)?|[.,]\d+)
+        \s*%\s*[)\]]?
+    )?
+    (?:\s*(?:,(?![0-9])|;|\n)|\s*$|(?(pct)\s+|(?!)))
+    """,
+    re.VERBOSE,
+)
+
+
+# 비교 기호 표기 통일 ("<=" -> "≤")
+_COMPARATOR_ALIASES = {"<=": "≤", ">=": "≥"}
+
+
+def parse_ingredient_percents(text: str) -> list[tuple[str, Decimal | None, str]]:
+    """
+    함량이 표기된 전성분 텍스트를 한 번 훑어 (성분명, 함량, 비교 기호) 목록으로 변환합니다.
+
+    예: "Water 68.5%, Niacinamide <1%, 1,2-Hexanediol 2%"
+        -> [("Water", Decimal("68.5"), ""), ("Niacinamide", Decimal("1"), "<"),
+            ("1,2-Hexanediol", Decimal("2"), "")]
+
+    - 함량이 없는 항목은 None
+    - 비교 기호: "" (표기값), "<", ">", "≤", "≥", "~" ("<=", ">="는 "≤", "≥"로)
+    - 함량은 표기된 자릿수를 유지합니다. (비교 시 반올림 허용 범위 계산에 사용)
+    - 쉼표 소수점(2,5%)과 전각 숫자/기호도 인식합니다.
+    """
+    if not text:
+        return []
+
+    text = unicodedata.normalize("NFKC", text)
+    entries = []
+    for match in _PERCENT_ENTRY_RE.finditer(text):
+        name = match.group("name").strip()
+        if not name:
+            continue
+        pct = match.group("pct")
+        percent = Decimal(pct.replace(",", ".")) if pct else None
+        comparator = match.group("cmp") or ""
+        entries.append((name, percent, _COMPARATOR_ALIASES.get(comparator, comparator)))
+    return entries
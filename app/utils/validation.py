@@ -0,0 +1,59 @@
+from decimal import Decimal
+from app.models import DiffType, DiffItem, IngredientRow
+from app.utils.normalizer import normalize_key
+from app.utils.percent import DEFAULT_TOLERANCE, parse_percent_column
+
+# 합계 기준값 (%)
+MASS_BALANCE_TARGET = Decimal(100)
+
+
+def validate_mass_balance(data_list: list[IngredientRow],
+                          tolerance: Decimal = DEFAULT_TOLERANCE) -> list[DiffItem]:
+    """
+    테이블 한 개의 함량 합계를 검증하여 스타일링(Diff) 정보를 생성합니다.
+
+    Logic:
+    1. % RM/FP, % INCI/RM 컬럼을 한 번에 Decimal 배열로 변환
+    2. RM 그룹별로 % RM/FP(첫 행 기준)와 % INCI/RM 합계를 한 번의 순회로 집계
+    3. Σ % RM/FP ≠ 100 이면 모든 RM 그룹 첫 행의 % 컬럼에 RM_TOTAL_MISMATCH
+       (테이블 전체 오류이므로 DiffIndex의 차이 행에는 넣지 않음)
+    4. RM 그룹의 Σ % INCI/RM ≠ 100 이면 해당 그룹 INCI % 컬럼에 INCI_TOTAL_MISMATCH
+    (숫자로 읽을 수 없는 값은 합계에서 제외합니다.)
+    """
+    if not data_list:
+        return []
+
+    rm_values = parse_percent_column(row.rm_percent for row in data_list)
+    inci_values = parse_percent_column(row.inci_percent for row in data_list)
+
+    # 그룹 집계: key -> [first_row, rm_percent, inci_sum, inci_rows]
+    groups: dict[str, list] = {}
+    for i, row in enumerate(data_list):
+        key = normalize_key(row.rm_name)
+        group = groups.get(key)
+        if group is None:
+            group = [i, rm_values[i], Decimal(0), []]
+            groups[key] = group
+
+        if row.inci_name:
+            group[3].append(i)
+            if inci_values[i] is not None:
+                group[2] += inci_values[i]
+
+    diffs = []
+
+    # Σ % RM/FP
+    rm_total = sum((g[1] for g in groups.values() if g[1] is not None), Decimal(0))
+    if abs(rm_total - MASS_BALANCE_TARGET) > tolerance:
+        for first_row, _, _, _ in groups.values():
+            diffs.append(DiffItem(first_row, 1, DiffType.RM_TOTAL_MISMATCH))
+
+    # RM별 Σ % INCI/RM
+    for _, _, inci_sum, inci_rows in groups.values():
+        if not inci_rows:
+            continue
+        if abs(inci_sum - MASS_BALANCE_TARGET) > tolerance:
+            for r in inci_rows:
+                diffs.append(DiffItem(r, 3, DiffType.INCI_TOTAL_MISMATCH))
+
+    return diffs
@@ -0,0 +1,278 @@
+import json
+import os
+import struct
+from dataclasses import dataclass
+from hashlib import blake2b
+from pathlib import Path
+from app.models import IngredientRow
+from app.utils.resources import user_data_dir
+from app.utils.row_codec import pack_rows, unpack_rows
+from app.utils.profiling import span
+
+CACHE_DIR_NAME = "workbook_cache"
+INDEX_FILE_NAME = "index.json"
+
+# 캐시 전체 최대 크기 (초과 시 오래 사용하지 않은 항목부터 삭제)
+DEFAULT_MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+# 파서(읽기 규칙)가 바뀌면 올려서 기존 캐시를 무효화
+CACHE_FORMAT_VERSION = 3
+
+_HASH_CHUNK = 1024 * 1024
+_U32 = struct.Struct("<I")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+def _content_hash(path: Path) -> str:
+    h = blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class WorkbookCache:
+    """
+    파싱된 시트(IngredientRow 리스트)를 디스크에 저장하는 캐시
+
+    - 1차 키: 파일 경로 + 크기 + 수정 시각 (파일을 읽지 않고 바로 조회)
+    - 2차 키: 파일 내용 해시 (복사/이동된 같은 파일도 재사용)
+    - 총 크기가 max_bytes를 넘으면 LRU 순서로 삭제
+    - stats: 현재 프로세스의 적중/실패/삭제 횟수, totals(): 누적 횟수
+    """
+
+    def __init__(self, cache_dir: str | Path | None = None, max_bytes: int = DEFAULT_MAX_CACHE_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else user_data_dir() / CACHE_DIR_NAME
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._index = self._read_index()
+
+    # ------------------------------------------------------------------
+    # 인덱스 (content hash -> {size, last_used}, stat key -> content hash)
+    # ------------------------------------------------------------------
+    def _read_index(self) -> dict:
+        try:
+            index = json.loads((self.cache_dir / INDEX_FILE_NAME).read_text(encoding="utf-8"))
+            if index.get("version") == CACHE_FORMAT_VERSION:
+                return index
+        except (OSError, ValueError, AttributeError):
+            pass
+        # 형식이 바뀌었거나 인덱스를 읽을 수 없으면 이전 항목은 추적되지 않으므로 모두 삭제
+        self._remove_payloads()
+        return {
+            "version": CACHE_FORMAT_VERSION, "entries": {}, "stat_keys": {}, "clock": 0,
+            "totals": CacheStats().as_dict(),
+        }
+
+    def _remove_payloads(self):
+        for path in self.cache_dir.glob("*.bin"):
+            try:
+                path.unlink()
+            except OSError as e:
+                print(f"Workbook Cache Error: {e}")
+
+    def _write_index(self):
+        tmp = self.cache_dir / (INDEX_FILE_NAME + ".tmp")
+        tmp.write_text(json.dumps(self._index), encoding="utf-8")
+        os.replace(tmp, self.cache_dir / INDEX_FILE_NAME)
+
+    def _entry_path(self, content_hash: str) -> Path:
+        return self.cache_dir / f"{content_hash}.bin"
+
+    @staticmethod
+    def _stat_key(path: Path) -> str:
+        stat = path.stat()
+        return f"{path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}"
+
+    def _count(self, name: str):
+        setattr(self.stats, name, getattr(self.stats, name) + 1)
+        totals = self._index.setdefault("totals", CacheStats().as_dict())
+        totals[name] = totals.get(name, 0) + 1
+
+    def totals(self) -> CacheStats:
+        """캐시 폴더에 누적된 적중/실패/삭제 횟수"""
+        return CacheStats(**self._index.get("totals", {}))
+
+    def _touch(self, content_hash: str):
+        self._index["clock"] += 1
+        self._index["entries"][content_hash]["last_used"] = self._index["clock"]
+
+    # ------------------------------------------------------------------
+    # 조회 / 저장
+    # ------------------------------------------------------------------
+    def load(self, file_path: str | Path, sheet_names: list[str] | None, loader) -> dict[str, list[IngredientRow]]:
+        """
+        캐시에서 시트들을 읽습니다. 없으면 loader(file_path, sheet_names)로 파싱 후 저장합니다.
+        loader는 {시트명: IngredientRow 리스트}를 반환해야 합니다.
+        sheet_names가 None이면 loader가 찾은 TableN 시트 전체를 의미합니다.
+        """
+        path = Path(file_path)
+        stat_key = self._stat_key(path)
+
+        content_hash = self._index["stat_keys"].get(stat_key)
+        if content_hash is None or content_hash not in self._index["entries"]:
+            content_hash = _content_hash(path)
+
+        requested = sheet_names
+        if requested is None:
+            requested = self._index["entries"].get(content_hash, {}).get("table_sheets")
+
+        tables = self._read_entry(content_hash, requested) if requested is not None else None
+        if tables is not None:
+            self._count("hits")
+            self._set_stat_key(stat_key, content_hash)
+            self._touch(content_hash)
+            self._save_index()
+            return tables
+
+        self._count("misses")
+        tables = loader(str(path), sheet_names)
+        # 캐시 저장 실패(디스크 부족, 읽기 전용 폴더 등)는 불러오기 실패가 아님
+        try:
+            self._write_entry(content_hash, tables)
+        except OSError as e:
+            print(f"Workbook Cache Error: {e}")
+        else:
+            if sheet_names is None:
+                self._index["entries"][content_hash]["table_sheets"] = list(tables)
+            self._set_stat_key(stat_key, content_hash)
+            self._evict()
+        self._save_index()
+        return tables
+
+    def _set_stat_key(self, stat_key: str, content_hash: str):
+        """같은 경로의 이전 stat 키(크기/수정 시각이 바뀌기 전)는 지우고 새 키만 남깁니다."""
+        path = stat_key.rsplit("|", 2)[0]
+        stat_keys = self._index["stat_keys"]
+        for key in [k for k in stat_keys if k.rsplit("|", 2)[0] == path]:
+            del stat_keys[key]
+        stat_keys[stat_key] = content_hash
+
+    def _save_index(self):
+        try:
+            self._write_index()
+        except OSError as e:
+            print(f"Workbook Cache Error: {e}")
+
+    def _read_entry(self, content_hash: str, sheet_names: list[str]) -> dict[str, list[IngredientRow]] | None:
+        if content_hash not in self._index["entries"]:
+            return None
+        try:
+            data = self._entry_path(content_hash).read_bytes()
+        except OSError:
+            self._drop(content_hash)
+            self._prune_stat_keys()
+            return None
+
+        # Layout: (u32 name len + name + u32 data len + packed rows)*
+        sections = {}
+        offset = 0
+        while offset < len(data):
+            (name_len,) = _U32.unpack_from(data, offset)
+            offset += 4
+            name = data[offset:offset + name_len].decode("utf-8")
+            offset += name_len
+            (data_len,) = _U32.unpack_from(data, offset)
+            offset += 4
+            sections[name] = data[offset:offset + data_len]
+            offset += data_len
+
+        if any(name not in sections for name in sheet_names):
+            return None
+        return {name: unpack_rows(sections[name]) for name in sheet_names}
+
+    def _write_entry(self, content_hash: str, tables: dict[str, list[IngredientRow]]):
+        # 같은 파일의 다른 시트가 이미 캐시되어 있으면 합쳐서 저장
+        existing = {}
+        if content_hash in self._index["entries"]:
+            try:
+                existing = self._read_entry(content_hash, list(self._index["entries"][content_hash]["sheets"])) or {}
+            except (OSError, ValueError, struct.error):
+                existing = {}
+        table_sheets = self._index["entries"].get(content_hash, {}).get("table_sheets")
+        existing.update(tables)
+
+        parts = []
+        for name, rows in existing.items():
+            encoded_name = name.encode("utf-8")
+            packed = pack_rows(rows)
+            parts += [_U32.pack(len(encoded_name)), encoded_name, _U32.pack(len(packed)), packed]
+        data = b"".join(parts)
+
+        self._entry_path(content_hash).write_bytes(data)
+        self._index["entries"][content_hash] = {"size": len(data), "sheets": list(existing), "last_used": 0}
+        if table_sheets is not None:
+            self._index["entries"][content_hash]["table_sheets"] = table_sheets
+        self._touch(content_hash)
+
+    def _drop(self, content_hash: str):
+        """항목 삭제 (가리키던 stat 키는 _prune_stat_keys에서 정리)"""
+        self._index["entries"].pop(content_hash, None)
+        try:
+            self._entry_path(content_hash).unlink()
+        except OSError:
+            pass
+
+    def _evict(self):
+        entries = self._index["entries"]
+        total = sum(e["size"] for e in entries.values())
+        for content_hash in sorted(entries, key=lambda h: entries[h]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            total -= entries[content_hash]["size"]
+            self._drop(content_hash)
+            self._count("evictions")
+        self._prune_stat_keys()
+
+    def clear(self):
+        for content_hash in list(self._index["entries"]):
+            self._drop(content_hash)
+        self._prune_stat_keys()
+        self._write_index()
+
+    def _prune_stat_keys(self):
+        """삭제된 항목을 가리키는 stat 키 정리"""
+        entries = self._index["entries"]
+        self._index["stat_keys"] = {k: v for k, v in self._index["stat_keys"].items() if v in entries}
+
+    def total_bytes(self) -> int:
+        return sum(e["size"] for e in self._index["entries"].values())
+
+
+# 앱 전체에서 공유하는 기본 캐시 (최초 사용 시 생성)
+_default_cache: WorkbookCache | None = None
+
+
+def get_workbook_cache() -> WorkbookCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = WorkbookCache()
+    return _default_cache
+
+
+def load_tables_cached(file_path: str, sheet_names: list[str] | None = None) -> dict[str, list[IngredientRow]]:
+    """load_tables(파일 형식별 백엔드)의 캐시 버전. 캐시를 사용할 수 없으면 바로 파싱합니다."""
+    from app.utils.loaders import load_tables
+
+    with span("load", file=Path(file_path).name) as s:
+        try:
+            cache = get_workbook_cache()
+        except OSError as e:
+            print(f"Workbook Cache Error: {e}")
+            tables = load_tables(file_path, sheet_names)
+        else:
+            hits = cache.stats.hits
+            tables = cache.load(file_path, sheet_names, load_tables)
+            s.set(cache="hit" if cache.stats.hits > hits else "miss")
+        s.set(rows=sum(len(rows) for rows in tables.values()))
+    return tables
@@ -0,0 +1,7 @@
+"""
+성능 측정용 벤치마크 패키지
+
+    python -m benchmarks.run --sizes 1000 10000 100000 --output results.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json
+    python -m benchmarks.equivalence --iterations 500
+"""
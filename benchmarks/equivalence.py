@@ -0,0 +1,584 @@
+"""
+최적화 구현과 기준 구현(benchmarks.oracles)의 동등성 검사 (차분 퍼징)
+
+    python -m benchmarks.equivalence                       # 기본 200회
+    python -m benchmarks.equivalence --iterations 1000 --rows 80
+    python -m benchmarks.equivalence --checks diff text --seed 7
+    python -m benchmarks.equivalence --keep-failures failures/
+
+무작위 워크북(빈 셀, 병합/Fill-down, 중복 INCI, 대소문자·공백 변형, 숫자/문자 함량)과
+전성분 텍스트를 만들어 불러오기 / Diff / 텍스트 비교 / 내보내기 결과를 비교합니다.
+불러오기는 같은 워크북을 CSV/JSON/ODS로 옮겨 저장한 파일의 결과도 비교합니다.
+내보내기는 저장된 xlsx를 셀 단위(값, 서식, 스타일, 병합, 열 너비)로 비교합니다.
+불일치가 있으면 재현용 seed와 함께 출력하고 종료 코드 1을 반환합니다.
+"""
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+from contextlib import contextmanager
+from copy import copy
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.models import IngredientRow
+from benchmarks import oracles
+from benchmarks.generator import ENGLISH_INCI, KOREAN_INCI, RM_WORDS_EN, RM_WORDS_KO
+
+CHECKS = ("load", "diff", "text", "export")
+DEFAULT_ITERATIONS = 200
+DEFAULT_ROWS = 40
+DEFAULT_SEED = 20240601
+
+# 내보내기는 워크북 3개를 쓰고 다시 읽으므로 N회마다 한 번만 검사
+EXPORT_EVERY = 5
+
+# 불일치 내용 출력 개수 (검사 항목별)
+MAX_DETAILS = 5
+
+
+@dataclass
+class Mismatch:
+    check: str
+    candidate: str
+    seed: int
+    detail: str
+
+
+# ----------------------------------------------------------------------
+# 검사 대상 (최적화 구현). 새 엔진/백엔드를 추가하면 여기에 등록합니다.
+# ----------------------------------------------------------------------
+@contextmanager
+def _memory_budget(megabytes):
+    from app.utils.memory import set_memory_budget_mb
+
+    set_memory_budget_mb(megabytes)
+    try:
+        yield
+    finally:
+        set_memory_budget_mb(None)
+
+
+def _load_excel(path, sheet_name):
+    from app.utils.excel_handler import load_data_from_excel
+
+    with _memory_budget(1 << 20):
+        return load_data_from_excel(path, sheet_name)
+
+
+def _load_excel_streaming(path, sheet_name):
+    from app.utils.excel_handler import load_data_from_excel
+
+    with _memory_budget(0):
+        return load_data_from_excel(path, sheet_name)
+
+
+def _load_cached(path, sheet_name):
+    """캐시 미스(파싱 후 저장) 다음 캐시 적중 결과"""
+    from app.utils.excel_handler import load_tables_from_excel
+    from app.utils.workbook_cache import WorkbookCache
+
+    with tempfile.TemporaryDirectory(prefix="crm_eq_cache_") as tmp:
+        cache = WorkbookCache(tmp)
+        cache.load(path, [sheet_name], load_tables_from_excel)
+        tables = cache.load(path, [sheet_name], load_tables_from_excel)
+        assert cache.stats.hits == 1, "cache did not hit"
+        return tables[sheet_name]
+
+
+def _sheet_values(path) -> dict[str, tuple[list[tuple], set]]:
+    """xlsx의 시트별 (값 행(1행부터), 병합으로 가려진 셀 위치) - 기준 불러오기와 같은 일반 모드"""
+    from openpyxl import load_workbook
+
+    sheets = {}
+    for ws in load_workbook(path, data_only=True).worksheets:
+        covered = set()
+        for merged in ws.merged_cells.ranges:
+            covered.update(
+                (row, col) for row, col in merged.cells if (row, col) != (merged.min_row, merged.min_col)
+            )
+        sheets[ws.title] = (list(ws.iter_rows(values_only=True)), covered)
+    return sheets
+
+
+def _load_csv(path, sheet_name):
+    """시트를 CSV(UTF-8 BOM)로 저장한 뒤 CSV 백엔드로 읽음 (없는 시트는 빈 파일)"""
+    import csv
+    from app.utils.loaders import load_tables
+
+    target = Path(path).with_name(f"{Path(path).stem}.{sheet_name}.csv")
+    values, _ = _sheet_values(path).get(sheet_name, ([], set()))
+    with open(target, "w", newline="", encoding="utf-8-sig") as f:
+        csv.writer(f).writerows(values)
+    return load_tables(str(target), ["Table1"])["Table1"]
+
+
+def _load_json(path, sheet_name):
+    import json
+    from app.utils.loaders import load_tables
+
+    target = Path(path).with_suffix(".json")
+    sheets = {name: [list(row) for row in values] for name, (values, _) in _sheet_values(path).items()}
+    target.write_text(json.dumps(sheets, ensure_ascii=False), encoding="utf-8")
+    return load_tables(str(target), [sheet_name])[sheet_name]
+
+
+def _load_ods(path, sheet_name):
+    from app.utils.loaders import load_tables
+
+    target = write_ods(Path(path).with_suffix(".ods"), _sheet_values(path))
+    return load_tables(str(target), [sheet_name])[sheet_name]
+
+
+def _diff_report(source, ref):
+    from app.utils.diff_logic import generate_diff_report
+
+    return generate_diff_report(source, ref)
+
+
+def _diff_tables(source, ref):
+    from app.utils.diff_logic import diff_tables
+
+    return diff_tables(source, ref)[0]
+
+
+def _diff_parallel(source, ref):
+    """파티션 병렬 Diff (크기 기준과 무관하게 2개 프로세스로 실행)"""
+    from app.utils.parallel_diff import parallel_diff_tables
+    from app.utils.percent import DEFAULT_TOLERANCE
+
+    return parallel_diff_tables(source, ref, DEFAULT_TOLERANCE, workers=2)[0]
+
+
+def _text_compare(text1, text2):
+    from app.utils.text_parser import parse_ingredients
+    from app.utils.comparator import compare_ingredients
+
+    return compare_ingredients(parse_ingredients(text1), parse_ingredients(text2))
+
+
+def _export(path, data1, data2):
+    from app.utils.excel_handler import export_to_excel
+
+    with _memory_budget(1 << 20):
+        export_to_excel(path, data1, data2)
+
+
+def _export_streaming(path, data1, data2):
+    from app.utils.excel_handler import export_to_excel
+
+    with _memory_budget(0):
+        export_to_excel(path, data1, data2)
+
+
+CANDIDATES = {
+    "load": {
+        "excel": _load_excel, "excel-streaming": _load_excel_streaming, "cached": _load_cached,
+        "csv": _load_csv, "json": _load_json, "ods": _load_ods,
+    },
+    "diff": {"generate_diff_report": _diff_report, "diff_tables": _diff_tables, "parallel": _diff_parallel},
+    "text": {"parse+compare": _text_compare},
+    "export": {"export": _export, "export-streaming": _export_streaming},
+}
+
+
+# ----------------------------------------------------------------------
+# 무작위 입력 생성
+# ----------------------------------------------------------------------
+_SPACES = (" ", "  ", "　", "\t")
+_DASHES = ("-", "‐", "–", "－")
+
+
+def _variant(rng: random.Random, text: str) -> str:
+    """비교 시 같게 취급되어야 하는 표기 변형 (대소문자, 공백, 대시)"""
+    kind = rng.randrange(6)
+    if kind == 0:
+        return text.upper()
+    if kind == 1:
+        return text.lower()
+    if kind == 2:
+        return rng.choice(_SPACES) + text + rng.choice(_SPACES)
+    if kind == 3:
+        return text.replace(" ", rng.choice(_SPACES))
+    if kind == 4:
+        return text.replace("-", rng.choice(_DASHES))
+    return text
+
+
+def _percent(rng: random.Random):
+    """함량 셀 값: 숫자, 다양한 문자열 표기, 빈 값, 숫자가 아닌 값"""
+    number = round(rng.uniform(0, 100), rng.choice((0, 1, 2, 4, 6, 7)))
+    kind = rng.randrange(10)
+    if kind < 4:
+        return number
+    if kind == 4:
+        return int(number)
+    if kind == 5:
+        return f"{number} %"
+    if kind == 6:
+        return f"{number:.4f}"
+    if kind == 7:
+        return None
+    if kind == 8:
+        return rng.choice(("", "N/A", "trace", "<0.1", "１０"))
+    return str(number)
+
+
+def _cell_text(value) -> str:
+    return "" if value is None else str(value)
+
+
+def fuzz_table(rng: random.Random, rows: int) -> list[tuple]:
+    """워크북에 쓸 값 행 (RM, % RM, INCI, % INCI) - RM이 비어 있는 행은 Fill-down 대상"""
+    values = []
+    rm_idx = 0
+    while len(values) < rows:
+        korean = rng.random() < 0.4
+        pool = KOREAN_INCI if korean else ENGLISH_INCI
+        words = RM_WORDS_KO if korean else RM_WORDS_EN
+        if values and rng.random() < 0.1:
+            # 앞에 나온 RM을 표기만 바꿔 다시 사용 (같은 RM 그룹으로 합쳐짐)
+            rm_name = _variant(rng, rng.choice([v[0] for v in values if v[0]]).strip() or "RM")
+        else:
+            rm_name = f"RM-{rm_idx:03d} {rng.choice(words)}"
+            rm_idx += 1
+        rm_pct = _percent(rng)
+
+        incis = rng.sample(pool, rng.randint(1, 5))
+        if rng.random() < 0.15:
+            incis.append(_variant(rng, incis[0]))  # 같은 RM 안의 중복 INCI
+        for j, inci in enumerate(incis):
+            first = j == 0
+            fill_down = not first and rng.random() < 0.7
+            inci_value = None if rng.random() < 0.05 else _variant(rng, inci) if rng.random() < 0.3 else inci
+            values.append((
+                rm_name if not fill_down else None,
+                rm_pct if not fill_down else None,
+                inci_value,
+                _percent(rng),
+            ))
+            if rng.random() < 0.03:
+                values.append((None, None, None, None))  # 빈 행 (직전 RM 안의 빈 INCI)
+    return values[:rows]
+
+
+def mutate_table(rng: random.Random, values: list[tuple]) -> list[tuple]:
+    """두 번째 테이블: 함량 변경, 표기 변형, 행 누락/추가, 그룹 순서 변경"""
+    # RM이 기입된 행에서 그룹을 나눔
+    groups = []
+    for row in values:
+        if row[0] or not groups:
+            groups.append([row])
+        else:
+            groups[-1].append(row)
+    if rng.random() < 0.3:
+        rng.shuffle(groups)
+
+    mutated = []
+    for group in groups:
+        if rng.random() < 0.05:
+            continue  # RM 그룹 누락
+        for row in group:
+            rm_name, rm_pct, inci, inci_pct = row
+            roll = rng.random()
+            if roll < 0.05 and row is not group[0]:
+                continue  # 행 누락
+            if roll < 0.15:
+                inci_pct = _percent(rng)
+            elif roll < 0.25 and inci:
+                inci = _variant(rng, str(inci))
+            elif roll < 0.3 and rm_pct is not None:
+                rm_pct = _percent(rng)
+            elif roll < 0.33:
+                inci = rng.choice(ENGLISH_INCI + KOREAN_INCI)
+            mutated.append((rm_name, rm_pct, inci, inci_pct))
+    if rng.random() < 0.2:
+        mutated.append((f"RM-NEW {rng.randrange(1000)}", _percent(rng), rng.choice(ENGLISH_INCI), _percent(rng)))
+    return mutated
+
+
+def write_fuzz_workbook(path: Path, rng: random.Random, tables: dict[str, list[tuple]]) -> Path:
+    """일반 모드 워크북으로 저장 (RM 병합, 헤더 앞 잡음, 여분 열 포함)"""
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    wb.remove(wb.active)
+    for sheet_name, values in tables.items():
+        ws = wb.create_sheet(sheet_name)
+        ws.append(list(oracles.FIXED_HEADER))
+        if rng.random() < 0.2:
+            ws.append([None, None, "RM 앞의 행 (무시됨)", 1])
+        start = ws.max_row + 1
+        for row in values:
+            extra = [rng.choice(("메모", 1, None))] if rng.random() < 0.05 else []
+            ws.append(list(row) + extra)
+
+        # Fill-down 구간 일부를 실제 병합 셀로 (템플릿 사용자 입력과 같은 형태)
+        group_start = None
+        for offset in range(len(values) + 1):
+            row_idx = start + offset
+            starts_group = offset == len(values) or values[offset][0]
+            if starts_group:
+                if group_start is not None and row_idx - 1 > group_start and rng.random() < 0.5:
+                    ws.merge_cells(start_row=group_start, start_column=1, end_row=row_idx - 1, end_column=1)
+                group_start = row_idx
+        if rng.random() < 0.2:
+            ws.cell(row=ws.max_row + 3, column=5, value="끝")  # 데이터 아래 여분 셀
+    wb.save(path)
+    return path
+
+
+_ODS_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+    'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" '
+    'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" office:version="1.2">'
+    '<office:body><office:spreadsheet>'
+)
+_ODS_FOOTER = "</office:spreadsheet></office:body></office:document-content>"
+_ODS_MANIFEST = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0" manifest:version="1.2">'
+    '<manifest:file-entry manifest:full-path="/" manifest:media-type="application/vnd.oasis.opendocument.spreadsheet"/>'
+    '<manifest:file-entry manifest:full-path="content.xml" manifest:media-type="text/xml"/>'
+    '</manifest:manifest>'
+)
+
+
+def write_ods(path: Path, sheets: dict[str, tuple[list[tuple], set]]) -> Path:
+    """
+    최소 ODS 파일 (시트별 값 행, 병합으로 가려진 셀 위치)
+    LibreOffice처럼 빈 셀/빈 행은 반복 속성으로 압축하고 시트 끝을 큰 빈 행 반복으로 채웁니다.
+    """
+    from xml.sax.saxutils import escape, quoteattr
+    from zipfile import ZipFile, ZIP_STORED
+
+    parts = [_ODS_HEADER]
+    for name, (values, covered) in sheets.items():
+        parts.append(f"<table:table table:name={quoteattr(name)}>")
+        blank = 0
+        for row_idx, row in enumerate(values, start=1):
+            if all(v is None for v in row) and not any((row_idx, c) in covered for c in range(1, len(row) + 1)):
+                blank += 1
+                continue
+            if blank:
+                parts.append(f'<table:table-row table:number-rows-repeated="{blank}">'
+                             f'<table:table-cell table:number-columns-repeated="1024"/></table:table-row>')
+                blank = 0
+            parts.append("<table:table-row>")
+            empty = 0
+            for col_idx, value in enumerate(row, start=1):
+                if (row_idx, col_idx) in covered or value is None:
+                    if empty:
+                        parts.append(f'<table:table-cell table:number-columns-repeated="{empty}"/>')
+                        empty = 0
+                    if (row_idx, col_idx) in covered:
+                        parts.append("<table:covered-table-cell/>")
+                    else:
+                        empty += 1
+                    continue
+                if empty:
+                    parts.append(f'<table:table-cell table:number-columns-repeated="{empty}"/>')
+                    empty = 0
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    parts.append(f'<table:table-cell office:value-type="float" office:value="{value!r}">'
+                                 f"<text:p>{value}</text:p></table:table-cell>")
+                else:
+                    parts.append(f'<table:table-cell office:value-type="string"><text:p>{escape(str(value))}</text:p></table:table-cell>')
+            parts.append('<table:table-cell table:number-columns-repeated="1000"/></table:table-row>')
+        parts.append('<table:table-row table:number-rows-repeated="1048000">'
+                     '<table:table-cell table:number-columns-repeated="1024"/></table:table-row></table:table>')
+    parts.append(_ODS_FOOTER)
+
+    with ZipFile(path, "w") as archive:
+        archive.writestr("mimetype", "application/vnd.oasis.opendocument.spreadsheet", compress_type=ZIP_STORED)
+        archive.writestr("META-INF/manifest.xml", _ODS_MANIFEST)
+        archive.writestr("content.xml", "".join(parts))
+    return path
+
+
+def rows_from_fuzz(values: list[tuple]) -> list[IngredientRow]:
+    """기준 불러오기와 같은 규칙으로 값 행을 IngredientRow로 변환 (Diff/내보내기 입력용)"""
+    rows = []
+    current_rm = current_pct = ""
+    for rm, rm_pct, inci, inci_pct in values:
+        if rm:
+            current_rm, current_pct = str(rm), _cell_text(rm_pct)
+        if current_rm:
+            rows.append(IngredientRow(current_rm, current_pct, _cell_text(inci), _cell_text(inci_pct)))
+    return rows
+
+
+def fuzz_ingredient_text(rng: random.Random, count: int) -> str:
+    pool = ENGLISH_INCI + KOREAN_INCI + ("1,2-Hexanediol", "Peptide-1", "CI 77891", "Water/Aqua/Eau")
+    items = [_variant(rng, rng.choice(pool)) for _ in range(count)]
+    parts = []
+    for item in items:
+        parts.append(item)
+        parts.append(rng.choice((", ", ",", ",\n", " ,  ", ",, ", "\n, ")))
+    if parts and rng.random() < 0.5:
+        parts.pop()  # 마지막 구분자 없음
+    return "".join(parts)
+
+
+def mutate_ingredient_text(rng: random.Random, text: str) -> str:
+    items = oracles.parse_ingredients(text)
+    out = []
+    for item in items:
+        roll = rng.random()
+        if roll < 0.05:
+            continue
+        out.append(_variant(rng, item) if roll < 0.4 else item)
+        if roll > 0.95:
+            out.append(rng.choice(ENGLISH_INCI))
+    return rng.choice((", ", ",\n")).join(out)
+
+
+# ----------------------------------------------------------------------
+# 비교
+# ----------------------------------------------------------------------
+def _first_difference(expected: list, actual: list) -> str | None:
+    for i, (a, b) in enumerate(zip(expected, actual)):
+        if a != b:
+            return f"item {i}: expected {a!r}, got {b!r}"
+    if len(expected) != len(actual):
+        return f"length: expected {len(expected)}, got {len(actual)}"
+    return None
+
+
+def _style_key(cell) -> tuple:
+    return (copy(cell.font), copy(cell.fill), copy(cell.alignment), copy(cell.border), cell.number_format)
+
+
+def compare_workbooks(expected_path, actual_path, limit: int = MAX_DETAILS) -> list[str]:
+    """두 xlsx 파일을 시트/병합/열 너비/셀 값·스타일 단위로 비교합니다."""
+    from openpyxl import load_workbook
+
+    expected = load_workbook(expected_path)
+    actual = load_workbook(actual_path)
+    problems = []
+    if expected.sheetnames != actual.sheetnames:
+        return [f"sheets: expected {expected.sheetnames}, got {actual.sheetnames}"]
+
+    for name in expected.sheetnames:
+        ws_e, ws_a = expected[name], actual[name]
+        merged_e = sorted(str(r) for r in ws_e.merged_cells.ranges)
+        merged_a = sorted(str(r) for r in ws_a.merged_cells.ranges)
+        if merged_e != merged_a:
+            problems.append(f"{name} merged cells: {sorted(set(merged_e) ^ set(merged_a))[:10]}")
+
+        for key in set(ws_e.column_dimensions) | set(ws_a.column_dimensions):
+            if ws_e.column_dimensions[key].width != ws_a.column_dimensions[key].width:
+                problems.append(f"{name} column {key} width")
+
+        max_row = max(ws_e.max_row, ws_a.max_row)
+        max_col = max(ws_e.max_column, ws_a.max_column)
+        for row in range(1, max_row + 1):
+            for col in range(1, max_col + 1):
+                cell_e, cell_a = ws_e.cell(row, col), ws_a.cell(row, col)
+                if cell_e.value != cell_a.value:
+                    problems.append(f"{name}!{cell_e.coordinate} value: expected {cell_e.value!r}, got {cell_a.value!r}")
+                elif _style_key(cell_e) != _style_key(cell_a):
+                    problems.append(f"{name}!{cell_e.coordinate} style")
+                if len(problems) >= limit:
+                    return problems
+    return problems
+
+
+# ----------------------------------------------------------------------
+# 실행
+# ----------------------------------------------------------------------
+def run_iteration(seed: int, rows: int, checks, work_dir: Path, export: bool) -> list[Mismatch]:
+    rng = random.Random(seed)
+    mismatches = []
+
+    values1 = fuzz_table(rng, rows)
+    values2 = mutate_table(rng, values1)
+
+    if "load" in checks:
+        path = write_fuzz_workbook(work_dir / f"fuzz_{seed}.xlsx", rng, {"Table1": values1, "Table2": values2})
+        for sheet_name in ("Table1", "Table2", "Missing"):
+            expected = oracles.load_data_from_excel(str(path), sheet_name)
+            for name, loader in CANDIDATES["load"].items():
+                detail = _first_difference(expected, loader(str(path), sheet_name))
+                if detail:
+                    mismatches.append(Mismatch("load", name, seed, f"{sheet_name}: {detail}"))
+
+    data1, data2 = rows_from_fuzz(values1), rows_from_fuzz(values2)
+
+    if "diff" in checks:
+        for source, ref, label in ((data1, data2, "1->2"), (data2, data1, "2->1"), (data1, data1, "1->1")):
+            expected = oracles.generate_diff_report(source, ref)
+            for name, differ in CANDIDATES["diff"].items():
+                detail = _first_difference(expected, differ(source, ref))
+                if detail:
+                    mismatches.append(Mismatch("diff", name, seed, f"{label}: {detail}"))
+
+    if "text" in checks:
+        text1 = fuzz_ingredient_text(rng, rng.randint(0, rows))
+        text2 = mutate_ingredient_text(rng, text1)
+        expected = oracles.compare_ingredients(oracles.parse_ingredients(text1), oracles.parse_ingredients(text2))
+        for name, comparer in CANDIDATES["text"].items():
+            detail = _first_difference(expected, comparer(text1, text2))
+            if detail:
+                mismatches.append(Mismatch("text", name, seed, detail))
+
+    if "export" in checks and export:
+        expected_path = work_dir / f"expected_{seed}.xlsx"
+        oracles.export_to_excel(str(expected_path), data1, data2)
+        for name, exporter in CANDIDATES["export"].items():
+            actual_path = work_dir / f"{name}_{seed}.xlsx"
+            exporter(str(actual_path), data1, data2)
+            for problem in compare_workbooks(expected_path, actual_path):
+                mismatches.append(Mismatch("export", name, seed, problem))
+
+    return mismatches
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.equivalence", description="기준 구현과의 동등성 검사")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="테이블당 최대 행 수")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="첫 반복의 seed (반복마다 1씩 증가)")
+    parser.add_argument("--checks", nargs="+", choices=CHECKS, default=list(CHECKS))
+    parser.add_argument("--keep-failures", default=None, help="불일치가 난 입력/출력 파일을 복사할 폴더")
+    args = parser.parse_args(argv)
+
+    counts = {check: 0 for check in args.checks}
+    mismatches = []
+    with tempfile.TemporaryDirectory(prefix="crm_equivalence_") as tmp:
+        work_dir = Path(tmp)
+        for i in range(args.iterations):
+            seed = args.seed + i
+            rows = random.Random(seed).randint(0, args.rows)
+            export = i % EXPORT_EVERY == 0
+            found = run_iteration(seed, rows, args.checks, work_dir, export)
+            for check in args.checks:
+                counts[check] += check != "export" or export
+            if found and args.keep_failures:
+                target = Path(args.keep_failures)
+                target.mkdir(parents=True, exist_ok=True)
+                for path in work_dir.glob(f"*_{seed}.*"):
+                    shutil.copy(path, target / path.name)
+            mismatches += found
+            for path in work_dir.iterdir():
+                path.unlink()
+
+    print("  ".join(f"{check}: {count}회" for check, count in counts.items()))
+    if not mismatches:
+        print("모든 결과가 기준 구현과 같습니다.")
+        return 0
+
+    print(f"\n불일치 {len(mismatches)}건 (재현: --seed SEED --iterations 1)")
+    shown = {}
+    for m in mismatches:
+        key = (m.check, m.candidate)
+        shown[key] = shown.get(key, 0) + 1
+        if shown[key] <= MAX_DETAILS:
+            print(f"  [{m.check}/{m.candidate}] seed={m.seed} {m.detail}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
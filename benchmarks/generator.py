@@ -0,0 +1,138 @@
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from app.models import IngredientRow
+
+# 실제 처방에서 자주 쓰이는 성분명 (영문 INCI / 국문 전성분)
+ENGLISH_INCI = (
+    "Water", "Glycerin", "Butylene Glycol", "Propanediol", "1,2-Hexanediol", "Niacinamide",
+    "Sodium Hyaluronate", "Panthenol", "Allantoin", "Dipropylene Glycol", "Caprylic/Capric Triglyceride",
+    "Cetearyl Alcohol", "Glyceryl Stearate", "PEG-100 Stearate", "Dimethicone", "Cyclopentasiloxane",
+    "Squalane", "Tocopherol", "Xanthan Gum", "Carbomer", "Tromethamine", "Disodium EDTA",
+    "Phenoxyethanol", "Ethylhexylglycerin", "Citric Acid", "Sodium Citrate", "Betaine", "Trehalose",
+    "Centella Asiatica Extract", "Camellia Sinensis Leaf Extract", "Madecassoside", "Adenosine",
+    "Ceramide NP", "Cholesterol", "Hydrogenated Lecithin", "Polysorbate 60", "Sorbitan Isostearate",
+    "Titanium Dioxide", "Zinc Oxide", "Fragrance", "Salicylic Acid", "Retinol", "Ascorbic Acid",
+)
+KOREAN_INCI = (
+    "정제수", "글리세린", "부틸렌글라이콜", "프로판다이올", "1,2-헥산다이올", "나이아신아마이드",
+    "소듐하이알루로네이트", "판테놀", "알란토인", "다이프로필렌글라이콜", "카프릴릭/카프릭트라이글리세라이드",
+    "세테아릴알코올", "글리세릴스테아레이트", "피이지-100스테아레이트", "다이메티콘", "사이클로펜타실록세인",
+    "스쿠알란", "토코페롤", "잔탄검", "카보머", "트로메타민", "다이소듐이디티에이",
+    "페녹시에탄올", "에틸헥실글리세린", "시트릭애씨드", "소듐시트레이트", "베타인", "트레할로스",
+    "병풀추출물", "녹차추출물", "마데카소사이드", "아데노신",
+    "세라마이드엔피", "콜레스테롤", "하이드로제네이티드레시틴", "폴리소르베이트60", "솔비탄아이소스테아레이트",
+    "티타늄디옥사이드", "징크옥사이드", "향료", "살리실릭애씨드", "레티놀", "아스코빅애씨드",
+)
+RM_WORDS_EN = ("Base", "Humectant", "Emulsifier", "Thickener", "Preservative", "Extract", "Active", "Oil", "Powder")
+RM_WORDS_KO = ("베이스", "보습제", "유화제", "증점제", "방부제", "추출물", "유효성분", "오일", "파우더")
+
+
+@dataclass
+class GeneratorConfig:
+    """합성 처방 생성 설정"""
+    rows: int = 1000                  # 목표 행 수 (테이블당)
+    inci_per_rm: tuple = (1, 2, 3, 4, 6)  # RM당 INCI 수 후보
+    inci_weights: tuple = (40, 25, 15, 12, 8)
+    mismatch_rate: float = 0.02       # 테이블 2에서 변형되는 행 비율
+    korean_ratio: float = 0.5         # 국문 성분명 비율
+    seed: int = 20240101
+
+
+def _split_percent(rng: random.Random, total: float, count: int) -> list[str]:
+    """total을 count개로 나눈 함량 문자열 (합계 유지, 소수 4자리)"""
+    if count == 1:
+        return [f"{total:.4f}"]
+    weights = [rng.random() + 0.05 for _ in range(count)]
+    scale = total / sum(weights)
+    values = [round(w * scale, 4) for w in weights]
+    values[0] = round(total - sum(values[1:]), 4)
+    return [f"{v:.4f}" for v in values]
+
+
+def generate_formula_pair(config: GeneratorConfig) -> tuple[list[IngredientRow], list[IngredientRow]]:
+    """
+    같은 seed면 항상 같은 결과를 내는 두 테이블(원본 / 변형본)을 생성합니다.
+    변형: INCI 함량 변경, INCI명 변경, 행 누락, RM 함량 변경
+    """
+    rng = random.Random(config.seed)
+
+    groups = []
+    row_count = 0
+    rm_idx = 0
+    while row_count < config.rows:
+        korean = rng.random() < config.korean_ratio
+        words = RM_WORDS_KO if korean else RM_WORDS_EN
+        pool = KOREAN_INCI if korean else ENGLISH_INCI
+        inci_count = min(rng.choices(config.inci_per_rm, config.inci_weights)[0], config.rows - row_count)
+        rm_name = f"RM-{rm_idx:06d} {rng.choice(words)}"
+        incis = rng.sample(pool, inci_count)
+        groups.append((rm_name, incis))
+        row_count += inci_count
+        rm_idx += 1
+
+    rm_percents = _split_percent(rng, 100.0, len(groups))
+    rows1 = []
+    for (rm_name, incis), rm_pct in zip(groups, rm_percents):
+        for inci, inci_pct in zip(incis, _split_percent(rng, 100.0, len(incis))):
+            rows1.append(IngredientRow(rm_name, rm_pct, inci, inci_pct))
+
+    rows2 = []
+    rm_changed = {}
+    for row in rows1:
+        if rng.random() >= config.mismatch_rate:
+            rows2.append(row)
+            continue
+        kind = rng.randrange(4)
+        if kind == 0:
+            rows2.append(IngredientRow(row.rm_name, row.rm_percent, row.inci_name, f"{float(row.inci_percent) * 1.1:.4f}"))
+        elif kind == 1:
+            rows2.append(IngredientRow(row.rm_name, row.rm_percent, row.inci_name + " (변경)", row.inci_percent))
+        elif kind == 2:
+            continue  # 행 누락
+        else:
+            rm_changed.setdefault(row.rm_name, f"{float(row.rm_percent) + 0.01:.4f}")
+            rows2.append(row)
+
+    # 같은 RM 그룹 안에서는 RM 함량이 같아야 하므로 변경분을 그룹 전체에 반영
+    rows2 = [IngredientRow(r.rm_name, rm_changed.get(r.rm_name, r.rm_percent), r.inci_name, r.inci_percent) for r in rows2]
+    return rows1, rows2
+
+
+def write_workbook(path: str | Path, rows1: list[IngredientRow], rows2: list[IngredientRow]) -> Path:
+    """템플릿과 같은 형태(Table1/Table2, RM은 그룹 첫 행에만 기입)로 저장합니다."""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    for sheet_name, rows in (("Table1", rows1), ("Table2", rows2)):
+        ws = wb.create_sheet(sheet_name)
+        ws.append(["RM", "% RM/FP", "INCI", "% INCI/RM"])
+        prev_rm = None
+        for row in rows:
+            if row.rm_name != prev_rm:
+                ws.append([row.rm_name, float(row.rm_percent), row.inci_name, float(row.inci_percent)])
+                prev_rm = row.rm_name
+            else:
+                ws.append([None, None, row.inci_name, float(row.inci_percent)])
+
+    output = Path(path)
+    wb.save(output)
+    return output
+
+
+def write_csv(path: str | Path, rows: list[IngredientRow]) -> Path:
+    """테이블 하나를 템플릿과 같은 형태의 CSV(UTF-8 BOM)로 저장합니다."""
+    import csv
+
+    output = Path(path)
+    with open(output, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(["RM", "% RM/FP", "INCI", "% INCI/RM"])
+        prev_rm = None
+        for row in rows:
+            if row.rm_name != prev_rm:
+                writer.writerow([row.rm_name, float(row.rm_percent), row.inci_name, float(row.inci_percent)])
+                prev_rm = row.rm_name
+            else:
+                writer.writerow(["", "", row.inci_name, float(row.inci_percent)])
+    return output
@@ -0,0 +1,263 @@
+"""
+동등성 검사용 기준 구현 (Reference Oracles)
+
+최적화 이전의 단순한 구현을 그대로 보관합니다. 이 모듈은 수정하지 않습니다.
+(불러오기/Diff/텍스트 비교/내보내기의 최적화 결과는 이 구현과 같아야 함)
+예외: 동작 자체가 바뀐 경우만 반영합니다. (내보내기 RM 병합 기준: RM 이름 -> 정규화 키)
+
+정규화·함량 파싱·표준 INCI 변환·합계 검증·사용한도·조성 계산은 최적화 대상이 아니므로
+앱의 구현을 그대로 사용합니다.
+"""
+import re
+from itertools import zip_longest
+from pathlib import Path
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font, PatternFill, Alignment
+from app.models import IngredientRow, DiffType, DiffItem
+from app.ui.styles import AppColors
+from app.utils.composition import roll_up_composition, compare_compositions
+from app.utils.inci_dictionary import canonical_inci_key
+from app.utils.limits import find_limit_violations, limit_diff_report
+from app.utils.normalizer import normalize_key
+from app.utils.percent import DEFAULT_TOLERANCE, parse_percent, percent_values_equal
+from app.utils.validation import validate_mass_balance
+
+FIXED_HEADER = ("RM", "% RM/FP", "INCI", "% INCI/RM")
+
+
+# ----------------------------------------------------------------------
+# 불러오기
+# ----------------------------------------------------------------------
+def load_data_from_excel(file_path: str, sheet_name: str) -> list[IngredientRow]:
+    """openpyxl 일반 모드로 시트 전체를 읽고 RM을 Fill-down합니다."""
+    wb = load_workbook(file_path, data_only=True)
+    if sheet_name not in wb.sheetnames:
+        return []
+
+    raw_data = []
+    current_rm = ""
+    current_rm_pct = ""
+    for row in wb[sheet_name].iter_rows(min_row=2, values_only=True):
+        rm_val = str(row[0]) if len(row) > 0 and row[0] is not None else None
+        rm_pct = str(row[1]) if len(row) > 1 and row[1] is not None else ""
+        inci = str(row[2]) if len(row) > 2 and row[2] is not None else ""
+        inci_pct = str(row[3]) if len(row) > 3 and row[3] is not None else ""
+
+        if rm_val:
+            current_rm = rm_val
+            current_rm_pct = rm_pct
+        if current_rm:
+            raw_data.append(IngredientRow(current_rm, current_rm_pct, inci, inci_pct))
+    return raw_data
+
+
+# ----------------------------------------------------------------------
+# Diff (해시/지문 없이 모든 그룹을 직접 비교)
+# ----------------------------------------------------------------------
+def _structure(data_list: list[IngredientRow]) -> dict:
+    data = {}
+    for i, row in enumerate(data_list):
+        rm_name = normalize_key(row.rm_name)
+        if rm_name not in data:
+            data[rm_name] = {
+                "percent": row.rm_percent,
+                "percent_value": parse_percent(row.rm_percent),
+                "rows": [],
+                "incis": {},
+            }
+        data[rm_name]["rows"].append(i)
+        if row.inci_name:
+            data[rm_name]["incis"][canonical_inci_key(row.inci_name)] = {
+                "percent": row.inci_percent,
+                "percent_value": parse_percent(row.inci_percent),
+                "row": i,
+            }
+    return data
+
+
+def generate_diff_report(source_data: list[IngredientRow], ref_data: list[IngredientRow],
+                         tolerance=DEFAULT_TOLERANCE) -> list[DiffItem]:
+    struct_source = _structure(source_data)
+    struct_ref = _structure(ref_data)
+
+    diffs = []
+    for rm_name, rm_info in struct_source.items():
+        if rm_name not in struct_ref:
+            for r in rm_info["rows"]:
+                for c in range(4):
+                    diffs.append(DiffItem(r, c, DiffType.MISSING_ROW))
+            continue
+
+        ref_rm = struct_ref[rm_name]
+        if not percent_values_equal(rm_info["percent_value"], ref_rm["percent_value"],
+                                    rm_info["percent"], ref_rm["percent"], tolerance):
+            diffs.append(DiffItem(rm_info["rows"][0], 1, DiffType.CONTENT_MISMATCH))
+
+        for inci_name, inci_info in rm_info["incis"].items():
+            if inci_name not in ref_rm["incis"]:
+                diffs.append(DiffItem(inci_info["row"], 2, DiffType.MISSING_INCI))
+                diffs.append(DiffItem(inci_info["row"], 3, DiffType.MISSING_INCI))
+                continue
+            ref_inci = ref_rm["incis"][inci_name]
+            if not percent_values_equal(inci_info["percent_value"], ref_inci["percent_value"],
+                                        inci_info["percent"], ref_inci["percent"], tolerance):
+                diffs.append(DiffItem(inci_info["row"], 3, DiffType.CONTENT_MISMATCH))
+    return diffs
+
+
+# ----------------------------------------------------------------------
+# 전성분 텍스트 비교
+# ----------------------------------------------------------------------
+def parse_ingredients(text: str) -> list[str]:
+    if not text:
+        return []
+    raw_ingredients = re.split(r',(?![0-9])', text.replace('\n', ' '))
+    return [item.strip() for item in raw_ingredients if item.strip()]
+
+
+def compare_ingredients(list1: list[str], list2: list[str]) -> list[tuple[str, str, str]]:
+    rows = []
+    for item1, item2 in zip_longest(list1, list2, fillvalue=""):
+        val1 = item1 if item1 else ""
+        val2 = item2 if item2 else ""
+        status = "MATCH" if canonical_inci_key(val1) == canonical_inci_key(val2) else "DIFF"
+        rows.append((val1, val2, status))
+    return rows
+
+
+# ----------------------------------------------------------------------
+# 내보내기 (openpyxl 일반 모드, 셀 단위 쓰기 + merge_cells)
+# ----------------------------------------------------------------------
+def _try_float(value: str):
+    if not value:
+        return ""
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def export_to_excel(output_path: str, data1: list[IngredientRow], data2: list[IngredientRow]) -> Path:
+    RED_FONT = Font(color="FF0000")
+    RED_BG_FILL = PatternFill(start_color="FFC8C8", end_color="FFC8C8", fill_type="solid")
+    ORANGE_BG_FILL = PatternFill(start_color=AppColors.BG_ORANGE_HEX, end_color=AppColors.BG_ORANGE_HEX, fill_type="solid")
+    PURPLE_BOLD_FONT = Font(color=AppColors.TEXT_PURPLE_HEX, bold=True)
+    CENTER_ALIGN = Alignment(horizontal='center', vertical='center')
+
+    wb = Workbook()
+
+    diff1 = validate_mass_balance(data1) + generate_diff_report(data1, data2)
+    diff2 = validate_mass_balance(data2) + generate_diff_report(data2, data1)
+    violations1 = find_limit_violations(data1)
+    violations2 = find_limit_violations(data2)
+    diff1 += limit_diff_report(data1, violations1)
+    diff2 += limit_diff_report(data2, violations2)
+
+    def _write_sheet(ws, dataset_list, diff_reports_list, start_col_list):
+        from openpyxl.utils import get_column_letter
+
+        headers = []
+        for _ in dataset_list:
+            headers.extend(FIXED_HEADER)
+        for col_idx, header in enumerate(headers, start=1):
+            cell = ws.cell(row=1, column=col_idx, value=header)
+            cell.alignment = CENTER_ALIGN
+            cell.font = Font(bold=True)
+
+        for start_col in start_col_list:
+            for offset, width in enumerate((50, 15, 50, 15)):
+                ws.column_dimensions[get_column_letter(start_col + offset)].width = width
+
+        for dataset_idx, data in enumerate(dataset_list):
+            start_col = start_col_list[dataset_idx]
+            if not data:
+                continue
+            merge_start_row = 2
+            prev_rm = normalize_key(data[0].rm_name)
+
+            for i, item in enumerate(data):
+                row_idx = i + 2
+                ws.cell(row=row_idx, column=start_col + 0, value=item.rm_name).alignment = CENTER_ALIGN
+                ws.cell(row=row_idx, column=start_col + 1, value=_try_float(item.rm_percent)).alignment = CENTER_ALIGN
+                ws.cell(row=row_idx, column=start_col + 2, value=item.inci_name).alignment = CENTER_ALIGN
+                ws.cell(row=row_idx, column=start_col + 3, value=_try_float(item.inci_percent)).alignment = CENTER_ALIGN
+
+                if normalize_key(item.rm_name) != prev_rm:
+                    if row_idx - 1 > merge_start_row:
+                        ws.merge_cells(start_row=merge_start_row, start_column=start_col, end_row=row_idx - 1, end_column=start_col)
+                        ws.merge_cells(start_row=merge_start_row, start_column=start_col + 1, end_row=row_idx - 1, end_column=start_col + 1)
+                    prev_rm = normalize_key(item.rm_name)
+                    merge_start_row = row_idx
+
+            if (len(data) + 1) > merge_start_row:
+                end_row = len(data) + 1
+                ws.merge_cells(start_row=merge_start_row, start_column=start_col, end_row=end_row, end_column=start_col)
+                ws.merge_cells(start_row=merge_start_row, start_column=start_col + 1, end_row=end_row, end_column=start_col + 1)
+
+        for dataset_idx, diffs in enumerate(diff_reports_list):
+            start_col = start_col_list[dataset_idx]
+            for diff in diffs:
+                cell = ws.cell(row=diff.row + 2, column=diff.col + start_col)
+                if diff.diff_type == DiffType.CONTENT_MISMATCH:
+                    cell.font = RED_FONT
+                elif diff.diff_type in (DiffType.MISSING_ROW, DiffType.MISSING_INCI):
+                    cell.fill = RED_BG_FILL
+                elif diff.diff_type in (DiffType.RM_TOTAL_MISMATCH, DiffType.INCI_TOTAL_MISMATCH):
+                    cell.fill = ORANGE_BG_FILL
+                elif diff.diff_type == DiffType.LIMIT_EXCEEDED:
+                    cell.font = PURPLE_BOLD_FONT
+
+    def _write_composition_sheet(ws, comp_diffs):
+        headers = ("INCI", "% INCI/FP (Table1)", "% INCI/FP (Table2)", "Status")
+        for col_idx, header in enumerate(headers, start=1):
+            cell = ws.cell(row=1, column=col_idx, value=header)
+            cell.alignment = CENTER_ALIGN
+            cell.font = Font(bold=True)
+        for col_letter, width in zip("ABCD", (50, 20, 20, 12)):
+            ws.column_dimensions[col_letter].width = width
+
+        for i, diff in enumerate(comp_diffs):
+            values = (
+                diff.inci_name,
+                round(diff.percent1, 6) if diff.percent1 is not None else "",
+                round(diff.percent2, 6) if diff.percent2 is not None else "",
+                diff.status,
+            )
+            for col_idx, value in enumerate(values, start=1):
+                cell = ws.cell(row=i + 2, column=col_idx, value=value)
+                cell.alignment = CENTER_ALIGN
+                if diff.status == "DIFF" and col_idx in (2, 3):
+                    cell.font = RED_FONT
+                elif diff.status == "MISSING":
+                    cell.fill = RED_BG_FILL
+
+    def _write_limit_sheet(ws, violations_by_table):
+        headers = ("Table", "INCI", "% INCI/FP", "Limit %", "Category", "Note")
+        for col_idx, header in enumerate(headers, start=1):
+            cell = ws.cell(row=1, column=col_idx, value=header)
+            cell.alignment = CENTER_ALIGN
+            cell.font = Font(bold=True)
+        for col_letter, width in zip("ABCDEF", (10, 50, 15, 15, 15, 50)):
+            ws.column_dimensions[col_letter].width = width
+
+        row_idx = 2
+        for table_name, violations in violations_by_table:
+            for v in violations:
+                values = (table_name, v.inci_name, round(v.percent, 6), v.max_percent, v.category, v.note)
+                for col_idx, value in enumerate(values, start=1):
+                    ws.cell(row=row_idx, column=col_idx, value=value).alignment = CENTER_ALIGN
+                ws.cell(row=row_idx, column=3).font = PURPLE_BOLD_FONT
+                row_idx += 1
+
+    ws_combined = wb.active
+    ws_combined.title = "Result"
+    _write_sheet(ws_combined, [data1, data2], [diff1, diff2], [1, 5])
+    _write_sheet(wb.create_sheet(title="Table1"), [data1], [diff1], [1])
+    _write_sheet(wb.create_sheet(title="Table2"), [data2], [diff2], [1])
+
+    comp_diffs = compare_compositions(roll_up_composition(data1), roll_up_composition(data2))
+    _write_composition_sheet(wb.create_sheet(title="Composition"), comp_diffs)
+    _write_limit_sheet(wb.create_sheet(title="Limit Check"), [("Table1", violations1), ("Table2", violations2)])
+
+    wb.save(output_path)
+    return Path(output_path)
@@ -0,0 +1,186 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.generator import GeneratorConfig, generate_formula_pair, write_workbook, write_csv
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+# 기준 대비 이 비율 이상 느려지면 회귀로 판단
+DEFAULT_THRESHOLD = 0.20
+STAGES = ("load", "csv", "diff", "pdiff", "render", "restyle", "export")
+
+_qt_application = None
+
+
+def _timed(func, repeat: int) -> tuple[list[float], object]:
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return times, result
+
+
+def _qt_app():
+    """오프스크린 Qt (화면 없이 render_table / 스타일링 측정)"""
+    global _qt_application
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5 import QtWidgets
+
+    if _qt_application is None:
+        _qt_application = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    return _qt_application
+
+
+def run_size(rows: int, repeat: int, config: GeneratorConfig, work_dir: Path, stages=STAGES) -> dict:
+    """한 크기에 대해 단계별 시간을 측정합니다. (각 단계 repeat회, 초 단위)"""
+    from app.utils.excel_handler import load_tables_from_excel, export_to_excel
+    from app.utils.diff_logic import diff_tables
+    from app.utils.table_handler import setup_table_header, render_table
+    from app.ui.widgets import MaterialTableWidget
+
+    cfg = GeneratorConfig(**{**config.__dict__, "rows": rows})
+    rows1, rows2 = generate_formula_pair(cfg)
+    xlsx_path = write_workbook(work_dir / f"bench_{rows}.xlsx", rows1, rows2)
+
+    timings = {}
+
+    # 1. 엑셀 로드 (openpyxl 파싱 + Fill-down), 캐시 미사용
+    if "load" in stages:
+        timings["load"], tables = _timed(lambda: load_tables_from_excel(str(xlsx_path), ["Table1", "Table2"]), repeat)
+        data1, data2 = tables["Table1"], tables["Table2"]
+    else:
+        data1, data2 = rows1, rows2
+
+    # 1-1. 같은 내용의 CSV 두 개 로드 (csv 모듈 백엔드, 캐시 미사용)
+    if "csv" in stages:
+        from app.utils.loaders import load_tables
+
+        csv_paths = [write_csv(work_dir / f"bench_{rows}_{i}.csv", r) for i, r in enumerate((rows1, rows2), start=1)]
+        timings["csv"], _ = _timed(lambda: [load_tables(str(path))["Table1"] for path in csv_paths], repeat)
+
+    # 2. 양방향 Diff (스타일링 단계에서도 사용)
+    diff_times, (diff1, diff2, _, _) = _timed(lambda: diff_tables(data1, data2, parallel=False), repeat if "diff" in stages else 1)
+    if "diff" in stages:
+        timings["diff"] = diff_times
+
+    # 2-1. 파티션 병렬 Diff (크기 기준과 무관하게 강제, 프로세스 풀 시작 비용 제외)
+    if "pdiff" in stages:
+        diff_tables(data1[:10], data2[:10], parallel=True)
+        timings["pdiff"], _ = _timed(lambda: diff_tables(data1, data2, parallel=True), repeat)
+
+    if "render" in stages or "restyle" in stages:
+        # 3. 테이블 렌더링 (정렬 + 셀 생성 + 병합)
+        _qt_app()
+        table = MaterialTableWidget()
+        table.blockSignals(True)
+        setup_table_header(table)
+        render_times, _ = _timed(lambda: render_table(table, list(data1)), repeat)
+        if "render" in stages:
+            timings["render"] = render_times
+
+        # 4. Diff 스타일링 (전체 리셋 후 적용)
+        if "restyle" in stages:
+            timings["restyle"], _ = _timed(lambda: table.apply_diff_report(diff1), repeat)
+        table.deleteLater()
+
+    # 5. 결과 엑셀 저장
+    if "export" in stages:
+        out_path = work_dir / f"bench_{rows}_result.xlsx"
+        timings["export"], _ = _timed(lambda: export_to_excel(str(out_path), data1, data2), repeat)
+
+    return {
+        "rows": rows,
+        "diffs": len(diff1) + len(diff2),
+        "stages": {
+            stage: {"min": min(values), "median": statistics.median(values), "runs": values}
+            for stage, values in timings.items()
+        },
+    }
+
+
+def environment_info() -> dict:
+    info = {"python": sys.version.split()[0], "platform": platform.platform(), "machine": platform.machine()}
+    try:
+        import openpyxl
+        from PyQt5.QtCore import QT_VERSION_STR, PYQT_VERSION_STR
+
+        info.update(openpyxl=openpyxl.__version__, qt=QT_VERSION_STR, pyqt=PYQT_VERSION_STR)
+    except ImportError:
+        pass
+    return info
+
+
+def compare_to_baseline(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """단계별 최소 시간을 기준과 비교하여 회귀 항목 설명 목록을 반환합니다."""
+    regressions = []
+    base_by_rows = {entry["rows"]: entry for entry in baseline.get("results", [])}
+    for entry in results["results"]:
+        base = base_by_rows.get(entry["rows"])
+        if base is None:
+            continue
+        for stage, stats in entry["stages"].items():
+            base_stats = base["stages"].get(stage)
+            if not base_stats or base_stats["min"] <= 0:
+                continue
+            ratio = stats["min"] / base_stats["min"]
+            line = f"{entry['rows']:>7} rows  {stage:<8} {base_stats['min']:8.3f}s -> {stats['min']:8.3f}s ({ratio:5.2f}x)"
+            print(line)
+            if ratio > 1 + threshold:
+                regressions.append(line)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="단계별 성능 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="테이블당 행 수")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES), help="측정할 단계")
+    parser.add_argument("--repeat", type=int, default=3, help="단계별 반복 횟수 (최소값으로 비교)")
+    parser.add_argument("--seed", type=int, default=GeneratorConfig.seed)
+    parser.add_argument("--mismatch-rate", type=float, default=GeneratorConfig.mismatch_rate)
+    parser.add_argument("--korean-ratio", type=float, default=GeneratorConfig.korean_ratio)
+    parser.add_argument("--output", "-o", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="회귀 판단 비율 (기본 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    config = GeneratorConfig(seed=args.seed, mismatch_rate=args.mismatch_rate, korean_ratio=args.korean_ratio)
+    results = {
+        "environment": environment_info(),
+        "config": {"seed": config.seed, "mismatch_rate": config.mismatch_rate, "korean_ratio": config.korean_ratio,
+                   "repeat": args.repeat, "stages": args.stages},
+        "results": [],
+    }
+
+    with tempfile.TemporaryDirectory(prefix="crm_bench_") as tmp:
+        for rows in args.sizes:
+            entry = run_size(rows, args.repeat, config, Path(tmp), args.stages)
+            results["results"].append(entry)
+            summary = "  ".join(f"{stage} {stats['min']:.3f}s" for stage, stats in entry["stages"].items())
+            print(f"{rows:>7} rows ({entry['diffs']} diffs)  {summary}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"결과 저장: {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n성능 회귀 {len(regressions)}건 (기준 대비 {args.threshold:.0%} 이상 느림):")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\n성능 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
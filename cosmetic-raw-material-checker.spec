@@ -5,7 +5,7 @@ a = Analysis(
     ['app\\main.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('app\\data', 'app\\data')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},